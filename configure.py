@@ -14,8 +14,9 @@ SETTINGS_FILE = "modules/settings.py"
 USER_CONFIG_FILE = "modules/user_config.py"
 EDITABLE_SETTINGS = {
     'PLAYER_NAME', 'HP_MAX', 'HP_CURRENT', 'AP_MAX', 'AP_CURRENT', 'LEVEL',
-    'PIP_BOY_LIGHT', 'PIP_BOY_MID', 'PIP_BOY_DARKER',
-    'SCREEN_WIDTH', 'SCREEN_HEIGHT', 'FPS', 'SOUND_ON', 'SHOW_CRT', 'BLOOM_EFFECT'
+    'THEME_COLOR',
+    'SCREEN_WIDTH', 'SCREEN_HEIGHT', 'FPS', 'SOUND_ON', 'SHOW_CRT', 'BLOOM_EFFECT',
+    'BLOOM_QUALITY'
 }
 
 DEFAULT_SETTINGS = {
@@ -25,15 +26,14 @@ DEFAULT_SETTINGS = {
     'AP_MAX': 100,
     'AP_CURRENT': 100,
     'LEVEL': 1,
-    'PIP_BOY_LIGHT': (0, 255, 0),
-    'PIP_BOY_MID': (0, 127, 0),
-    'PIP_BOY_DARKER': (0, 63, 0),
+    'THEME_COLOR': (0, 255, 0),
     'SCREEN_WIDTH': 320,
     'SCREEN_HEIGHT': 240,
     'FPS': 30,
     'SOUND_ON': True,
     'SHOW_CRT': True,
-    'BLOOM_EFFECT': True
+    'BLOOM_EFFECT': True,
+    'BLOOM_QUALITY': 'MEDIUM'
 }
 
 class PipBoyTheme:
@@ -279,7 +279,7 @@ def player_settings_menu(settings):
 
 def color_settings_menu(settings):
     selected = 0
-    color = settings['PIP_BOY_LIGHT']
+    color = settings['THEME_COLOR']
     while True:
         options = [
             ("Classic Green", "VAULT-TEC STANDARD"),
@@ -314,9 +314,8 @@ def color_settings_menu(settings):
                 b = validate_int_input("BLUE VALUE (0-255)", 0, 255)
                 color = (r, g, b)
             elif selected == 5:
-                settings['PIP_BOY_LIGHT'] = color
-                settings['PIP_BOY_MID'] = tuple(x//2 for x in color)
-                settings['PIP_BOY_DARKER'] = tuple(x//4 for x in color)
+                # Only the theme, the PIP_BOY_* ink stays so no asset has to be rasterised again
+                settings['THEME_COLOR'] = color
                 return
         elif key == 'esc':
             return
@@ -331,6 +330,7 @@ def system_settings_menu(settings):
             (f"Sound: {'ENABLED' if settings['SOUND_ON'] else 'DISABLED'}", "AUDIO OUTPUT"),
             (f"CRT Effect: {'ACTIVE' if settings['SHOW_CRT'] else 'OFFLINE'}", "RETRO FILTER"),
             (f"Bloom Effect: {'ACTIVE' if settings['BLOOM_EFFECT'] else 'OFFLINE'}", "LIGHTING SYSTEM"),
+            (f"Bloom Quality: {settings['BLOOM_QUALITY']}", "GLOW RESOLUTION"),
             ("Return to Main Menu", "BACK")
         ]
         
@@ -355,6 +355,10 @@ def system_settings_menu(settings):
             elif selected == 4:
                 settings['BLOOM_EFFECT'] = not settings['BLOOM_EFFECT']
             elif selected == 5:
+                qualities = ['LOW', 'MEDIUM', 'HIGH']
+                current = qualities.index(settings['BLOOM_QUALITY']) if settings['BLOOM_QUALITY'] in qualities else 1
+                settings['BLOOM_QUALITY'] = qualities[(current + 1) % len(qualities)]
+            elif selected == 6:
                 return
         elif key == 'esc':
             return
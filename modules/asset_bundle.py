@@ -0,0 +1,239 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import subprocess
+from threading import Lock
+import pygame
+import settings
+from asset_cache import RasterCache
+
+
+class AssetBundle:
+    """
+    Every baked raster in one memory-mapped file.
+
+    The bake runs all asset loaders headless (tabs, boot screens, overlays and
+    the turntable of every item folder under images/, carried or not) and packs the raster cache entries they used
+    into a single file: a JSON index of cache keys, followed by the raw pixels
+    in the display's alpha format. At runtime RasterCache serves its entries
+    straight from the mapping with pygame.image.frombuffer, so a cold boot
+    does one file open and no PNG or SVG decoding, and pages are only read
+    from the SD card when a surface is actually drawn.
+
+    Cache keys cover the source files and the render parameters, so a changed
+    image or setting simply misses the bundle. The loader then falls back to
+    the raster cache files, and once the Pip-Boy is interactive the bundle is
+    baked again in a background process.
+    """
+
+    HEADER = struct.Struct("<4sIII")  # Magic, version, index length, start of the pixel data
+    MAGIC = b"PBAB"
+    VERSION = 1
+    ALIGNMENT = 64
+
+    # Byte order of each supported alpha format, by the RGBA masks it has in memory
+    FORMATS = {
+        (0xff0000, 0xff00, 0xff, 0xff000000): "BGRA",
+        (0xff, 0xff00, 0xff0000, 0xff000000): "RGBA",
+        (0xff00, 0xff0000, 0xff000000, 0xff): "ARGB",
+    }
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures the file is mapped once and shared by every loader."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.path = settings.ASSET_BUNDLE_FILE
+            cls._instance.file = None
+            cls._instance.map = None
+            cls._instance.view = None
+            cls._instance.format = None
+            cls._instance.native = False  # The stored format is what convert_alpha would produce
+            cls._instance.entries = {}  # Cache key -> [offset, width, height]
+            cls._instance.atlases = {}  # Cache key -> frame rects
+            cls._instance.misses = 0
+            cls._instance.rebake_ready = False
+            cls._instance.rebake_process = None
+            cls._instance.lock = Lock()
+        return cls._instance
+
+    @classmethod
+    def display_format(cls) -> str:
+        """Format name of convert_alpha surfaces, needs the display mode to be set."""
+        probe = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+        return cls.FORMATS.get(probe.get_masks(), "RGBA")
+
+    def open(self):
+        """Map the bundle and register it with the raster cache, call on the main thread once the display is set."""
+        if not settings.ASSET_BUNDLE or not RasterCache().enabled or self.map is not None:
+            return
+        try:
+            self.file = open(self.path, "rb")
+            # Copy on write: surfaces can be drawn on without touching the file
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_COPY)
+            magic, version, index_length, data_start = self.HEADER.unpack_from(self.map)
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError("unknown bundle format")
+            index = json.loads(self.map[self.HEADER.size:self.HEADER.size + index_length])
+        except (OSError, ValueError, struct.error) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Could not open asset bundle {self.path}: {e}")
+            self.close()
+            # Nothing to serve from, bake one once the Pip-Boy is up
+            self.misses += 1
+            return
+
+        self.view = memoryview(self.map)[data_start:]
+        self.format = index["format"]
+        self.native = self.format == self.display_format()
+        self.entries = index["entries"]
+        self.atlases = index["atlases"]
+        RasterCache().bundle = self
+
+    def close(self):
+        if RasterCache().bundle is self:
+            RasterCache().bundle = None
+        if self.view is not None:
+            self.view.release()
+        if self.map is not None:
+            try:
+                self.map.close()
+            except BufferError:
+                # Surfaces still point into the mapping, it goes away with them
+                pass
+        if self.file is not None:
+            self.file.close()
+        self.file = self.map = self.view = None
+        self.entries = {}
+        self.atlases = {}
+
+    def surface(self, key: str):
+        """The baked surface for a raster cache key, None if it is not in the bundle."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.miss()
+            return None
+        offset, width, height = entry
+        surface = pygame.image.frombuffer(self.view[offset:offset + width * height * 4], (width, height), self.format)
+        return surface if self.native else RasterCache().convert(surface)
+
+    def rects(self, key: str):
+        """Frame rects of a baked atlas, None if it is not in the bundle."""
+        return self.atlases.get(key)
+
+    def miss(self):
+        self.misses += 1
+        if self.rebake_ready:
+            self.rebake()
+
+    def start_rebaking(self):
+        """Allow baking in the background from now on, bakes right away if the bundle is stale."""
+        if not settings.ASSET_BUNDLE or not RasterCache().enabled:
+            return
+        self.rebake_ready = True
+        if self.misses:
+            self.rebake()
+
+    def rebake(self):
+        """Bake a new bundle in a low priority process, at most once per run."""
+        with self.lock:
+            if self.rebake_process is None:
+                self.rebake_process = self._spawn_bake()
+
+    def _spawn_bake(self):
+        print("Asset bundle is out of date, baking a new one in the background")
+        env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+        return subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--format", self.display_format()],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            preexec_fn=(lambda: os.nice(10)) if hasattr(os, "nice") else None,
+        )
+
+    @classmethod
+    def write(cls, path: str, keys: list, surface_format: str) -> int:
+        """Pack the raster cache entries for keys into a bundle at path, returns the number packed."""
+        cache = RasterCache()
+        # Sizes come from the entry headers, the pixels are streamed in one at a time below
+        entries = {}
+        atlases = {}
+        offset = 0
+        for key in sorted(keys):
+            try:
+                with open(cache.entry_path(key), "rb") as f:
+                    magic, width, height = cache.HEADER.unpack(f.read(cache.HEADER.size))
+            except (OSError, struct.error):
+                continue
+            if magic != cache.MAGIC:
+                continue
+            entries[key] = [offset, width, height]
+            offset += -(-width * height * 4 // cls.ALIGNMENT) * cls.ALIGNMENT
+            try:
+                with open(cache.entry_path(key, ".json"), "r") as f:
+                    atlases[key] = json.load(f)["frames"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+        index = json.dumps({"format": surface_format, "entries": entries, "atlases": atlases}, separators=(",", ":")).encode()
+        # Pixels start on a page boundary after the index, entry offsets are relative to it
+        data_start = -(-(cls.HEADER.size + len(index)) // mmap.PAGESIZE) * mmap.PAGESIZE
+
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(index), data_start))
+                f.write(index)
+                for key, (offset, width, height) in entries.items():
+                    f.write(bytes(data_start + offset - f.tell()))
+                    f.write(pygame.image.tobytes(cache.read(key), surface_format))
+            # A running Pip-Boy keeps its mapping of the old file
+            os.replace(temp_path, path)
+        except (OSError, TypeError):
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return len(entries)
+
+
+def bake(surface_format: str = None):
+    """Run every asset loader headless and pack what they loaded into the bundle."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    settings.BOOT_SCREEN = False  # Preload synchronously, the boot screens are loaded below
+    settings.SOUND_ON = False
+    settings.ASSET_BUNDLE = False  # Everything has to come from the raster cache files
+    pygame.init()
+    screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+    cache = RasterCache()
+    cache.enabled = True
+
+    # Imported here, they load assets as soon as they are constructed
+    from pipboy import PipBoy
+    from boot import Boot
+    from input_manager import InputManager
+    from util_functs import Utils
+
+    pipboy = PipBoy(screen, pygame.time.Clock(), InputManager())
+    Boot(screen)
+    # Every turntable on disk or named by an item definition, not only the items carried
+    # now: items added at runtime must not fall back to decoding PNGs
+    height = pipboy.tab_manager.inv_tab.weapons_tab.turntable_draw_space.height
+    folders = {entry.name for entry in os.scandir(settings.ITEMS_BASE_FOLDER) if entry.is_dir()}
+    folders.update(item.icons for item in settings.items.values() if item.icons)
+    for icons in sorted(folders):
+        folder = f"{settings.ITEMS_BASE_FOLDER}/{icons}"
+        if os.path.isdir(folder):
+            Utils.load_images(folder, height=height)
+
+    path = settings.ASSET_BUNDLE_FILE
+    count = AssetBundle.write(path, cache.used, surface_format or AssetBundle.display_format())
+    print(f"Baked {count} assets into {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == "__main__":
+    bake(sys.argv[sys.argv.index("--format") + 1] if "--format" in sys.argv else None)
@@ -0,0 +1,129 @@
+import os
+import struct
+import hashlib
+from contextlib import contextmanager
+from threading import Lock, get_ident, local
+from typing import Callable
+import pygame
+import settings
+
+
+class RasterCache:
+    """
+    Content-addressed disk cache for rasterised assets. Rendering an SVG,
+    tinting and scaling it gives the same pixels on every boot, so the final
+    pixels are stored as raw RGBA and loaded straight back next time.
+
+    Entries are keyed by the source path, its mtime and size, and whatever
+    render parameters the caller passes (target size, tint). Editing a source
+    file or changing the theme simply misses the cache and writes a new entry.
+    """
+
+    VERSION = 2  # Bump when the rendering of cached assets changes
+    HEADER = struct.Struct("<4sII")
+    MAGIC = b"PBRC"
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures the hit/miss counters cover every loader."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.folder = settings.RASTER_CACHE_FOLDER
+            cls._instance.enabled = settings.RASTER_CACHE
+            cls._instance.hits = 0
+            cls._instance.misses = 0
+            cls._instance.lock = Lock()
+            # Per thread flag, set while a preload worker defers conversion to the main thread
+            cls._instance.local = local()
+            cls._instance.bundle = None  # The AssetBundle serving entries without opening their files
+            cls._instance.used = set()  # Every key looked up this run, what a bundle bake packs
+        return cls._instance
+
+    def convert(self, surface: pygame.Surface) -> pygame.Surface:
+        """convert_alpha the surface, unless the calling thread defers that to the main thread."""
+        if getattr(self.local, "defer_conversion", False):
+            return surface
+        return surface.convert_alpha()
+
+    @contextmanager
+    def deferred_conversion(self):
+        """Leave loaded surfaces in their file format, the caller converts them on the main thread."""
+        self.local.defer_conversion = True
+        try:
+            yield
+        finally:
+            self.local.defer_conversion = False
+
+    def key(self, path: str, params: tuple) -> str:
+        """Cache key for path rendered with params."""
+        stat = os.stat(path)
+        parts = (self.VERSION, os.path.abspath(path), stat.st_mtime_ns, stat.st_size) + params
+        return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+    def entry_path(self, key: str, extension: str = ".rgba") -> str:
+        return os.path.join(self.folder, f"{key}{extension}")
+
+    def read(self, key: str):
+        """The cached surface for key, None when missing or unreadable."""
+        self.used.add(key)
+        if self.bundle is not None:
+            surface = self.bundle.surface(key)
+            if surface is not None:
+                return surface
+        try:
+            with open(self.entry_path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < self.HEADER.size:
+            return None
+        magic, width, height = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC or len(data) != self.HEADER.size + width * height * 4:
+            return None
+        surface = pygame.image.frombytes(data[self.HEADER.size:], (width, height), "RGBA")
+        return self.convert(surface)
+
+    def write(self, key: str, surface: pygame.Surface):
+        path = self.entry_path(key)
+        # Write to a temporary file first so a crash never leaves a torn entry behind
+        temp_path = f"{path}.{os.getpid()}.{get_ident()}.tmp"
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, *surface.get_size()))
+                f.write(pygame.image.tobytes(surface, "RGBA"))
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Could not write raster cache entry {path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def load(self, path: str, render: Callable[[], pygame.Surface], *params) -> pygame.Surface:
+        """
+        Return the cached raster for path and params, or call render() and cache its result.
+        params must cover everything render() depends on besides the source file.
+        """
+        if not self.enabled:
+            return render()
+
+        key = self.key(path, params)
+        surface = self.read(key)
+        if surface is not None:
+            with self.lock:
+                self.hits += 1
+            return surface
+
+        surface = render()
+        with self.lock:
+            self.misses += 1
+        self.write(key, surface)
+        return surface
+
+    def clear(self):
+        """Delete every cached raster."""
+        if not os.path.isdir(self.folder):
+            return
+        for filename in os.listdir(self.folder):
+            if filename.endswith((".rgba", ".json")):
+                os.remove(os.path.join(self.folder, filename))
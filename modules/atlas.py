@@ -0,0 +1,119 @@
+import os
+import json
+import math
+from typing import Callable
+import pygame
+from asset_cache import RasterCache
+
+
+class Atlas:
+    """
+    Animation frames packed into one surface. Each frame is a subsurface view
+    into the sheet, and the atlas behaves like a list of frames, so it can be
+    handed to anything that expects one (AnimatedImage, indexing, len).
+
+    Packed sheets are stored in the raster cache with a JSON sidecar holding
+    the frame rects, so a cached animation loads with a single file read.
+    """
+
+    MAX_WIDTH = 2048
+    PADDING = 1  # Keeps smoothscaled neighbours from bleeding into each other
+
+    def __init__(self, surface: pygame.Surface, rects: list):
+        self.surface = surface
+        self.rects = [pygame.Rect(rect) for rect in rects]
+        self.frames = [surface.subsurface(rect) for rect in self.rects]
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+    def __iter__(self):
+        return iter(self.frames)
+
+    @property
+    def byte_size(self) -> int:
+        """Memory held by the sheet."""
+        return self.surface.get_pitch() * self.surface.get_height()
+
+    @classmethod
+    def layout(cls, sizes: list) -> tuple:
+        """Shelf-pack frame sizes in order, returns the frame rects and the sheet size."""
+        # Spread the frames evenly over as many shelves as MAX_WIDTH needs, so the last one is not mostly empty
+        total_width = sum(width + cls.PADDING for width, _ in sizes)
+        shelves = max(1, math.ceil(total_width / cls.MAX_WIDTH))
+        widest = max((width for width, _ in sizes), default=0)
+        max_width = min(cls.MAX_WIDTH, max(widest, math.ceil(total_width / shelves)))
+
+        rects = []
+        x = y = shelf_height = sheet_width = 0
+        for width, height in sizes:
+            if x > 0 and x + width > max_width:
+                x = 0
+                y += shelf_height + cls.PADDING
+                shelf_height = 0
+            rects.append(pygame.Rect(x, y, width, height))
+            x += width + cls.PADDING
+            shelf_height = max(shelf_height, height)
+            sheet_width = max(sheet_width, x - cls.PADDING)
+        return rects, (sheet_width, y + shelf_height)
+
+    @classmethod
+    def pack(cls, images: list) -> "Atlas":
+        """Build an atlas from separate frame surfaces."""
+        rects, size = cls.layout([image.get_size() for image in images])
+        surface = RasterCache().convert(pygame.Surface(size, pygame.SRCALPHA))
+        surface.fill((0, 0, 0, 0))
+        for image, rect in zip(images, rects):
+            # Max against the cleared sheet copies the pixels and alpha unchanged
+            surface.blit(image, rect, special_flags=pygame.BLEND_RGBA_MAX)
+        return cls(surface, rects)
+
+    @classmethod
+    def load_folder(cls, folder: str, extension: str, render: Callable[[list], list], *params) -> "Atlas":
+        """
+        Atlas of every file in folder with the given extension, in name order.
+        render(paths) produces the frames, or an already packed Atlas, on a cache
+        miss. params must cover everything it depends on besides the files themselves.
+        """
+        try:
+            paths = [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.endswith(extension)]
+        except FileNotFoundError:
+            return cls.pack([])
+
+        def build():
+            frames = render(paths)
+            return frames if isinstance(frames, Atlas) else cls.pack(frames)
+
+        cache = RasterCache()
+        if not cache.enabled:
+            return build()
+
+        files = tuple((os.path.basename(path), os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in paths)
+        key = cache.key(folder, (files,) + params)
+        index_path = cache.entry_path(key, ".json")
+
+        surface = cache.read(key)
+        if surface is not None:
+            rects = cache.bundle.rects(key) if cache.bundle is not None else None
+            if rects is not None:
+                return cls(surface, rects)
+            try:
+                with open(index_path, "r") as f:
+                    return cls(surface, json.load(f)["frames"])
+            except (OSError, ValueError, KeyError):
+                pass
+
+        atlas = build()
+        # Index first, a sheet on disk then always has its rects next to it
+        try:
+            os.makedirs(cache.folder, exist_ok=True)
+            with open(index_path, "w") as f:
+                json.dump({"folder": folder, "frames": [list(rect) for rect in atlas.rects]}, f)
+        except OSError as e:
+            print(f"Could not write atlas index {index_path}: {e}")
+            return atlas
+        cache.write(key, atlas.surface)
+        return atlas
@@ -0,0 +1,275 @@
+"""
+Headless frame benchmark.
+
+Renders N frames on every tab and sub-tab and reports min/median/p95/p99
+frame times per tab as JSON. CRT, bloom, glitches and the boot sequence
+can be switched on to compare their cost.
+
+    python benchmark.py --frames 200 --crt --bloom
+
+--tint adds a comparison of the tinting paths on the SPECIAL and boot frames.
+--palette renders in the 8-bit palette mode, compare against a run without it.
+--crt also checks the baked CRT layers against the original layer stack and
+exits with status 1 if they are off by more than CRT_COMPOSITE_MAX_ERROR.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+import platform
+
+# Asset paths are relative to the modules folder
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import pygame
+import settings
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Headless per-tab frame benchmark")
+    parser.add_argument("--frames", type=int, default=120, help="Frames rendered per tab")
+    parser.add_argument("--warmup", type=int, default=10, help="Frames rendered per tab before measuring")
+    parser.add_argument("--crt", action="store_true", help="Enable the CRT overlay")
+    parser.add_argument("--crt-layers", action="store_true", help="Render the CRT overlay with the original layer stack")
+    parser.add_argument("--bloom", action="store_true", help="Enable the bloom effect")
+    parser.add_argument("--bloom-quality", choices=("LOW", "MEDIUM", "HIGH"), help="Bloom quality level")
+    parser.add_argument("--glitches", action="store_true", help="Enable random and tab switch glitches")
+    parser.add_argument("--boot", action="store_true", help="Also benchmark the boot sequence")
+    parser.add_argument("--tint", action="store_true", help="Also benchmark per-surface against batch tinting")
+    parser.add_argument("--palette", action="store_true", help="Render in the 8-bit palette mode")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    return parser.parse_args()
+
+
+def apply_factors(args):
+    settings.SOUND_ON = False
+    settings.SHOW_CRT = args.crt
+    settings.CRT_PRECOMPOSITED = not args.crt_layers
+    settings.BLOOM_EFFECT = args.bloom
+    if args.bloom_quality:
+        settings.BLOOM_QUALITY = args.bloom_quality
+    settings.RANDOM_GLITCHES = args.glitches
+    if not args.glitches:
+        settings.GLITCH_MOVE_CHANCE = 0
+    settings.BOOT_SCREEN = args.boot
+    settings.PALETTE_MODE = args.palette
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(frame_times):
+    values = sorted(frame_times)
+    count = len(values)
+    if count == 0:
+        median = 0.0
+    elif count % 2:
+        median = values[count // 2]
+    else:
+        median = (values[count // 2 - 1] + values[count // 2]) / 2
+    return {
+        "frames": count,
+        "min_ms": round(values[0], 3) if values else 0.0,
+        "median_ms": round(median, 3),
+        "p95_ms": round(percentile(values, 0.95), 3),
+        "p99_ms": round(percentile(values, 0.99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+
+class Benchmark:
+    def __init__(self, frames: int, warmup: int):
+        from pipboy import PipBoy
+        from input_manager import InputManager
+        from scheduler import Scheduler
+        from command_queue import CommandQueue
+        from palette import Palette
+
+        pygame.init()
+        try:
+            pygame.mixer.init(frequency=44100, size=-16, channels=5)
+        except pygame.error:
+            pass
+        pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+        # Drawn off screen and presented like main.py does, so both render modes pay for the copy to the window
+        self.screen = Palette().framebuffer((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+
+        self.frames = frames
+        self.warmup = warmup
+        # Animations advance by a fixed frame time so every run does the same work
+        self.frame_ms = 1000 / settings.FPS
+        self.scheduler = Scheduler()
+        self.commands = CommandQueue()
+
+        start = time.perf_counter()
+        self.pipboy = PipBoy(self.screen, pygame.time.Clock(), InputManager())
+        self.init_ms = (time.perf_counter() - start) * 1000
+        self.tab_manager = self.pipboy.tab_manager
+
+    def render_frame(self) -> float:
+        """Advance the clock by one frame and return the render time in ms."""
+        pygame.event.pump()
+        self.commands.apply()
+        self.scheduler.tick(self.frame_ms)
+        start = time.perf_counter()
+        self.pipboy.render()
+        return (time.perf_counter() - start) * 1000
+
+    def run_boot(self):
+        frame_times = []
+        # Bound the run in case the boot sequence never finishes
+        max_frames = int(120 * 1000 / self.frame_ms)
+        while not self.pipboy.boot_instance.done and len(frame_times) < max_frames:
+            frame_times.append(self.render_frame())
+        self.pipboy.current_sequence = "main"
+        self.pipboy.boot_instance = None
+        self.pipboy.dirty_rects.mark_full()
+        return frame_times
+
+    def go_to(self, tab_index: int, sub_tab_index: int):
+        """Navigate the same way the rotary encoders do."""
+        while self.tab_manager.current_tab_index != tab_index:
+            self.tab_manager.switch_tab(True)
+        while self.tab_manager.current_sub_tab_index[tab_index] < sub_tab_index:
+            self.tab_manager.switch_sub_tab(True)
+        while self.tab_manager.current_sub_tab_index[tab_index] > sub_tab_index:
+            self.tab_manager.switch_sub_tab(False)
+
+    def targets(self):
+        for tab_index, tab in enumerate(settings.TABS):
+            sub_tabs = settings.SUBTABS.get(tab)
+            if sub_tabs:
+                for sub_tab_index, sub_tab in enumerate(sub_tabs):
+                    yield f"{tab}/{sub_tab}", tab_index, sub_tab_index
+            else:
+                yield tab, tab_index, 0
+
+    def run(self) -> dict:
+        results = {}
+        if settings.BOOT_SCREEN:
+            results["BOOT"] = summarize(self.run_boot())
+
+        all_frames = []
+        for name, tab_index, sub_tab_index in self.targets():
+            self.go_to(tab_index, sub_tab_index)
+            for _ in range(self.warmup):
+                self.render_frame()
+            frame_times = [self.render_frame() for _ in range(self.frames)]
+            all_frames.extend(frame_times)
+            results[name] = summarize(frame_times)
+
+        results["ALL"] = summarize(all_frames)
+        return results
+
+    def animation_bytes(self) -> int:
+        """Memory held by the SPECIAL animations and the turntable frames loaded during the run."""
+        from turntable_cache import TurntableCache
+        special_tab = self.tab_manager.stat_tab.special_tab
+        return sum(atlas.byte_size for atlas in special_tab.special_images.values()) + TurntableCache().used_bytes
+
+
+def benchmark_tint(repeats: int = 20) -> dict:
+    """Time the tinting paths on the untinted SPECIAL and boot frames, best of repeats in ms."""
+    import numpy as np
+    from util_functs import Utils
+    from atlas import Atlas
+
+    folders = [os.path.join(settings.SPECIAL_BASE_FOLDER, name) for name in sorted(os.listdir(settings.SPECIAL_BASE_FOLDER))]
+    folders.append(settings.BOOT_THUMBS)
+    animations = []
+    for folder in folders:
+        if os.path.isdir(folder):
+            paths = [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.endswith(".png")]
+            animations.append([Utils.render_image(path, tint=None) for path in paths])
+    atlases = [Atlas.pack(frames) for frames in animations]
+    color = settings.PIP_BOY_LIGHT
+
+    def numpy_multiply(atlas):
+        # The same multiply through surfarray, for reference
+        sheet = atlas.surface.copy()
+        pixels = pygame.surfarray.pixels3d(sheet)
+        pixels[...] = (pixels.astype(np.uint16) * np.array(color[:3], dtype=np.uint16) + 255) >> 8
+        del pixels
+
+    cases = {
+        "per_surface_ms": lambda: [[Utils.tint_image(frame, color) for frame in frames] for frames in animations],
+        "batch_ms": lambda: [Utils.tint_images(atlas, color) for atlas in atlases],
+        "batch_in_place_ms": lambda: [Utils.tint_images(atlas, color, in_place=True) for atlas in atlases],
+        "numpy_multiply_ms": lambda: [numpy_multiply(atlas) for atlas in atlases],
+        "palette_ms": lambda: [Utils.palette_images(atlas, [settings.BACKGROUND, color]) for atlas in atlases],
+    }
+    results = {"frames": sum(len(frames) for frames in animations)}
+    for name, case in cases.items():
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            case()
+            best = min(best, (time.perf_counter() - start) * 1000)
+        results[name] = round(best, 3)
+    return results
+
+
+def main():
+    args = parse_args()
+    apply_factors(args)
+
+    # Keep stray prints from the tabs out of the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        benchmark = Benchmark(args.frames, args.warmup)
+        tabs = benchmark.run()
+    from memory_accounting import SurfaceMemory
+
+    report = {
+        "factors": {
+            "crt": args.crt,
+            "crt_layers": args.crt_layers,
+            "bloom": args.bloom,
+            "bloom_quality": settings.BLOOM_QUALITY,
+            "glitches": args.glitches,
+            "boot": args.boot,
+            "palette": args.palette,
+        },
+        "frames_per_tab": args.frames,
+        "frame_budget_ms": round(1000 / settings.FPS, 3),
+        "screen": [settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT],
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "init_ms": round(benchmark.init_ms, 3),
+        "preload_ms": round(benchmark.pipboy.preloader.elapsed_ms or 0, 3),
+        "animation_bytes": benchmark.animation_bytes(),
+        "surface_memory": SurfaceMemory().totals(),
+        "tabs": tabs,
+    }
+    if args.tint:
+        report["tint"] = benchmark_tint()
+    crt_error = None
+    if args.crt and not args.crt_layers:
+        crt_error = benchmark.pipboy.overlay_instance.verify()
+        report["crt_composite"] = crt_error
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    pygame.quit()
+    if crt_error is not None and crt_error["max_error"] > settings.CRT_COMPOSITE_MAX_ERROR:
+        print(f"Baked CRT layers are off by up to {crt_error['max_error']}, more than CRT_COMPOSITE_MAX_ERROR = {settings.CRT_COMPOSITE_MAX_ERROR}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
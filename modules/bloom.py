@@ -0,0 +1,68 @@
+import pygame
+import settings
+from theme import Theme
+from memory_accounting import SurfaceMemory
+
+
+class Bloom:
+    """
+    Bloom post-process: extracts the bright parts of the screen at reduced
+    resolution, blurs them and adds them back on top. All buffers are
+    allocated once and reused every frame.
+    """
+
+    # Quality: (downscale factor, blur, blur radius)
+    QUALITY_LEVELS = {
+        "LOW": (8, "box", 1),
+        "MEDIUM": (4, "box", 2),
+        "HIGH": (4, "gaussian", 3),
+    }
+
+    def __init__(self, screen: pygame.Surface, quality: str = None):
+        self.screen = screen
+        self.set_quality(quality or settings.BLOOM_QUALITY)
+
+    def set_quality(self, quality: str):
+        """Switch quality level and reallocate the buffers."""
+        self.quality = quality if quality in self.QUALITY_LEVELS else "MEDIUM"
+        self.scale, self.blur, self.radius = self.QUALITY_LEVELS[self.quality]
+
+        width, height = self.screen.get_size()
+        small_size = (max(1, width // self.scale), max(1, height // self.scale))
+        self.small = pygame.Surface(small_size, 0, self.screen)
+        self.blurred = pygame.Surface(small_size, 0, self.screen)
+        self.glow = pygame.Surface((width, height), 0, self.screen)
+        SurfaceMemory().track((self.small, self.blurred, self.glow), "effects")
+
+        self.threshold = (settings.BLOOM_THRESHOLD,) * 3
+        intensity = max(0, min(255, int(settings.BLOOM_INTENSITY * 255)))
+        self.intensity = (intensity,) * 3
+
+        # Faint phosphor tint that used to be the whole bloom effect
+        self.tint = SurfaceMemory().track(pygame.Surface((width, height)), "effects")
+        self.tint.set_alpha(10)
+        self.retint()
+
+    def retint(self):
+        """Fill the phosphor tint with the theme colour, call whenever the theme changes."""
+        self.tint.fill(Theme().shade(settings.PIP_BOY_LIGHT))
+
+    @property
+    def reach(self) -> int:
+        """How far in pixels a changed pixel can spread its glow."""
+        return self.scale * (self.radius + 1)
+
+    def render(self):
+        # Downsample first, the bright pass is much cheaper at low resolution
+        pygame.transform.smoothscale(self.screen, self.small.get_size(), self.small)
+        self.small.fill(self.threshold, special_flags=pygame.BLEND_RGB_SUB)
+        self.small.fill(self.intensity, special_flags=pygame.BLEND_RGB_MULT)
+
+        if self.blur == "gaussian":
+            pygame.transform.gaussian_blur(self.small, self.radius, dest_surface=self.blurred)
+        else:
+            pygame.transform.box_blur(self.small, self.radius, dest_surface=self.blurred)
+
+        pygame.transform.smoothscale(self.blurred, self.glow.get_size(), self.glow)
+        self.screen.blit(self.glow, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+        self.screen.blit(self.tint, (0, 0))
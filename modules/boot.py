@@ -2,12 +2,16 @@ import os
 import pygame
 import settings
 from util_functs import Utils
+from text_cache import TextCache
+from palette import Palette
 from ui import AnimatedImage
+from scheduler import Scheduler
+from sound_bank import SoundBank
 
 
 class BootText():
     def __init__(self, screen):
-        self.font = pygame.font.Font(settings.TECH_MONO_FONT_PATH, 8)
+        self.font = TextCache().font(settings.TECH_MONO_FONT_PATH, 8)
         self.font_height = self.font.get_height()
         self.boot_text_start = ("* 1 0 0x0000A4 0x00000000000000000 start memory discovery 0 0x0000A4 \n"
                                 "0x00000000000000000 1 0 0x000014 0x00000000000000000 CPUO starting cell \n"
@@ -129,20 +133,20 @@ class BootText():
         for i, line in enumerate(self.boot_text_lines):
             line_surface = self.font.render(line, True, settings.PIP_BOY_LIGHT)
             self.full_text_surface.blit(line_surface, (0, i * self.font_height))
+        self.full_text_surface = Palette().indexed(self.full_text_surface)
             
 
 
     def display_text_sequence(self):
-        """Display text sequence with scrolling effect"""
+        """Display text sequence with scrolling effect. Returns the delay in ms until the next step, None when done."""
         if self.first_iteration:
-            Utils.play_sfx(settings.BOOT_SOUND_A)
+            Utils.play_sfx(settings.BOOT_SOUND_A, priority=SoundBank.HIGH)
             self.first_iteration = False
         
-        pygame.time.wait(settings.SPEED * 30)
         self.y_offset -= self.font_height  # Scroll the text upward
         if self.y_offset < -len(self.boot_text_lines) * self.font_height:
-            return True  # Stop the sequence if the text has scrolled off the screen
-        return False  
+            return None  # Stop the sequence if the text has scrolled off the screen
+        return settings.SPEED * 30
 
     def render(self):
         self.screen.blit(self.full_text_surface, (0, self.y_offset))  # Draw the text at the current y_offset
@@ -150,7 +154,7 @@ class BootText():
 
 class BootCopyright():
     def __init__(self, screen):
-        self.font = pygame.font.Font(settings.TECH_MONO_FONT_PATH, 12)
+        self.font = TextCache().font(settings.TECH_MONO_FONT_PATH, 12)
         self.font_height = self.font.get_height()
         self.copyright_text = ("*************** PIP-05 (R) V7 .1.0.8 **************\n"
                             "\n"
@@ -166,7 +170,7 @@ class BootCopyright():
         self.copyright_text_rendered = []
         self.states = iter(["cursor_initial", "lines", "cursor_bottom", "scroll"])
         self.current_state = next(self.states)
-        self.cursor_surface = self.font.render("▮", True, settings.PIP_BOY_LIGHT)
+        self.cursor_surface = Palette().indexed(self.font.render("▮", True, settings.PIP_BOY_LIGHT))
         self.cursor_position = [0, 0]
         self.cur_cursor_position = 0
         self.current_line = 0
@@ -181,8 +185,9 @@ class BootCopyright():
 
 
     def render(self): 
+        text_cache = TextCache()
         for line in range(len(self.copyright_text_rendered)):
-            self.text_surface = self.font.render(self.copyright_text_rendered[line], True, settings.PIP_BOY_LIGHT)
+            self.text_surface = text_cache.render(self.font, self.copyright_text_rendered[line], settings.PIP_BOY_LIGHT)
             self.screen.blit(self.text_surface, (0, (line * self.font_height) + self.text_scroll_y))
         if self.cursor_blink_state and "cursor" in self.current_state:
             self.screen.blit(self.cursor_surface, (self.cursor_position))
@@ -190,29 +195,29 @@ class BootCopyright():
             self.screen.blit(self.cursor_surface, (self.cursor_position))
 
     def blink_cursor(self):
-        pygame.time.wait(settings.SPEED * 150)
         self.cursor_blink_state = not self.cursor_blink_state
         self.cursor_blink_count += 1 
+        return settings.SPEED * 150
                 
                        
     def display_copyright_text(self):
+        """Advance the copyright sequence. Returns the delay in ms until the next step, None when done."""
 
         match self.current_state:
             case "cursor_initial":
                 if self.cursor_blink_count > 7:
-                    Utils.play_sfx(settings.BOOT_SOUND_B)
+                    Utils.play_sfx(settings.BOOT_SOUND_B, priority=SoundBank.HIGH)
                     self.current_state = next(self.states)
                     self.cursor_blink_count = 0
                     self.cur_cursor_position = 1
-                    return False
+                    return 0
                 
-                self.blink_cursor()
+                return self.blink_cursor()
                 
             case "lines":
-                pygame.time.wait(settings.SPEED * 17)
                 if self.current_line >= len(self.copyright_text):
                     self.current_state = next(self.states)
-                    return False
+                    return 0
                 line = self.copyright_text[self.current_line]
 
                 # Ensure the current line exists in the rendered list
@@ -229,41 +234,42 @@ class BootCopyright():
                 else:
                     self.current_line += 1
                     self.current_char = 0
+                return settings.SPEED * 17
                     
             case "cursor_bottom":
                 if not self.cursor_pause:
-                    pygame.time.wait(settings.SPEED * 50)
                     self.cursor_position = self.text_surface.get_width(), (self.current_line * self.font_height) - self.font_height
                     self.cursor_pause = True
+                    return settings.SPEED * 50
                 
                 if self.cursor_blink_count > 7:
                     self.current_state = next(self.states)
-                    return False
+                    return 0
                 
-                self.blink_cursor()
+                return self.blink_cursor()
                                                
                
             case "scroll":
                 
                 if not self.scroll_pause:
-                    pygame.time.wait(settings.SPEED * 200)
                     self.scroll_pause = True
+                    return settings.SPEED * 200
                 
-                pygame.time.wait(settings.SPEED * 20)
                 self.text_scroll_y -= 5
                 if self.text_scroll_y < -len(self.copyright_text) * self.font_height:
-                    return True
+                    return None
+                return settings.SPEED * 20
                     
 
 class BootThumbs():
-    def __init__(self, screen):
+    def __init__(self, screen, preloader=None):
         self.screen = screen
-        self.font = pygame.font.Font(settings.TECH_MONO_FONT_PATH, 10)
+        self.preloader = preloader
+        self.font = TextCache().font(settings.TECH_MONO_FONT_PATH, 10)
 
         self.current_frame = 0
         self.real_frame = 0
-        images = Utils.load_images(settings.BOOT_THUMBS)
-        self.images = [Utils.scale_image(image, 0.5) for image in images]
+        self.images = Utils.load_images(settings.BOOT_THUMBS, scale=0.5)
         self.image_center = self.images[0].get_rect().center
         self.init_surface = self.font.render("INITIATING...", True, settings.PIP_BOY_LIGHT)
         self.init_surface_center = self.init_surface.get_rect().center
@@ -271,6 +277,7 @@ class BootThumbs():
         self.blink = 255
         self.blink_direction = 1
         self.first_iteration = True
+        self.thumbs_started = False
         
         frameorder = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 2, 0, 0, 0, 0, 0, 0, 0, 0, 3, 4, 5, 6, 7, 7, 7, 7, 7, 7, 7, 7,
                       7,
@@ -279,15 +286,21 @@ class BootThumbs():
         self.animated_thumbs = AnimatedImage(self.screen, self.images, image_position, settings.SPEED * 116, frame_order=frameorder, loop=False)
         
     def display_thumbs(self):
+        """Advance the thumbs sequence. Returns the delay in ms until the next step, None when done."""
         if self.first_iteration:
-            Utils.play_sfx(settings.BOOT_SOUND_C)
-            pygame.time.wait(settings.SPEED * 600)
-            self.animated_thumbs.start()
+            Utils.play_sfx(settings.BOOT_SOUND_C, priority=SoundBank.HIGH)
             self.first_iteration = False
+            return settings.SPEED * 600
+        
+        if not self.thumbs_started:
+            self.animated_thumbs.start()
+            self.thumbs_started = True
         
         if self.animated_thumbs.current_frame_index  >= len(self.animated_thumbs.frame_order) - 1:
-            self.animated_thumbs.stop()
-            return True
+            # Keep blinking on the last thumb until all assets are loaded
+            if self.preloader is None or self.preloader.done:
+                self.animated_thumbs.stop()
+                return None
 
         self.blink += self.blink_direction
         if self.blink >= 255:
@@ -296,60 +309,71 @@ class BootThumbs():
             self.blink_direction = 6
         self.init_surface.set_alpha(self.blink)
 
-        pygame.time.wait(settings.SPEED * 20)
+        return settings.SPEED * 20
         
         
     def render(self):
         
-        self.screen.blit(self.init_surface, (self.screen_center[0] - self.init_surface_center[0], self.screen_center[1] + (self.screen_center[1] // 2)))
+        init_position = (self.screen_center[0] - self.init_surface_center[0], self.screen_center[1] + (self.screen_center[1] // 2))
+        self.screen.blit(self.init_surface, init_position)
+
+        if self.preloader and not self.preloader.done:
+            # Loading progress under the text
+            bar = pygame.Rect(init_position[0], init_position[1] + self.init_surface.get_height() + 2, self.init_surface.get_width(), 2)
+            pygame.draw.rect(self.screen, settings.PIP_BOY_DARK, bar)
+            bar.width = int(bar.width * self.preloader.progress)
+            pygame.draw.rect(self.screen, settings.PIP_BOY_LIGHT, bar)
         
         self.animated_thumbs.render()        
             
                
 
 class Boot:
-    def __init__(self, screen):
+    def __init__(self, screen, preloader=None):
+        """preloader, if given, holds the boot sequence on its last step until all assets are loaded."""
         self.screen = screen
         self.states = iter(["text", "copyright", "thumbs", "done"])
         self.current_sequence = next(self.states)        
         self.boot_text = BootText(self.screen)
         self.copyright_text = BootCopyright(self.screen)
-        self.boot_thumbs = BootThumbs(self.screen)   
-        self.copyright_pause = False
-        self.text_pause = False
-        self.thumbs_pause = False
+        self.boot_thumbs = BootThumbs(self.screen, preloader)   
+        self.scheduler = Scheduler()
+        
+        # Pause before each sequence starts
+        self.pauses = {
+            "text": settings.SPEED * 100,
+            "copyright": settings.SPEED * 100,
+            "thumbs": settings.SPEED * 500,
+            "done": settings.SPEED * 10,
+        }
+        self.steps = {
+            "text": self.boot_text.display_text_sequence,
+            "copyright": self.copyright_text.display_copyright_text,
+            "thumbs": self.boot_thumbs.display_thumbs,
+        }
         self.running = False
+        self.done = False
 
     def start(self):
         self.running = True
+        self.scheduler.after(self.pauses[self.current_sequence], self.run, animating=True)
         
         
         
     def run(self):
-        while True:
-            match self.current_sequence:
-                case "text":
-                    if not self.text_pause:
-                        pygame.time.wait(settings.SPEED * 100)
-                        self.text_pause = True
-                    if self.boot_text.display_text_sequence():
-                        self.current_sequence = next(self.states)
-                case "copyright":
-                    if not self.copyright_pause:
-                        pygame.time.wait(settings.SPEED * 100)
-                        self.copyright_pause = True
-                    if self.copyright_text.display_copyright_text():
-                        self.current_sequence = next(self.states)
-                        
-                case "thumbs":
-                    if not self.thumbs_pause:
-                        pygame.time.wait(settings.SPEED * 500)
-                        self.thumbs_pause = True
-                    if self.boot_thumbs.display_thumbs():
-                        self.current_sequence = next(self.states)
-                case "done":
-                    pygame.time.wait(settings.SPEED * 10)
-                    break
+        """Advance the boot state machine by one step and schedule the next one."""
+        delay = self.steps[self.current_sequence]()
+        if delay is None:
+            self.current_sequence = next(self.states)
+            delay = self.pauses[self.current_sequence]
+            if self.current_sequence == "done":
+                self.scheduler.after(delay, self.finish, animating=True)
+                return
+        self.scheduler.after(delay, self.run, animating=True)
+
+    def finish(self):
+        self.running = False
+        self.done = True
                     
     def render(self):
         match self.current_sequence:
@@ -0,0 +1,43 @@
+from queue import SimpleQueue, Empty
+from typing import Callable
+from scheduler import Scheduler
+
+
+class CommandQueue:
+    """
+    The single point where UI state changes. Input handling and background
+    workers post commands here, and the main loop applies all of them once per
+    frame before rendering, so nothing is mutated while it is being drawn.
+
+    Background work should do the slow part (disk, network, decoding) on its own
+    thread and only post the finished result.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures every producer posts into the same queue."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.commands = SimpleQueue()
+        return cls._instance
+
+    def post(self, command: Callable, *args):
+        """Queue command(*args) to run on the main thread before the next frame. Safe from any thread."""
+        self.commands.put((command, args))
+        # Results from background threads should not wait for an idle frame
+        Scheduler().wake()
+
+    def apply(self) -> int:
+        """Run every queued command, returns how many ran."""
+        count = 0
+        while True:
+            try:
+                command, args = self.commands.get_nowait()
+            except Empty:
+                return count
+            command(*args)
+            count += 1
+
+    def pending(self) -> bool:
+        return not self.commands.empty()
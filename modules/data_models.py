@@ -61,3 +61,10 @@ class JunkItem(ItemBase):
 @dataclass
 class MiscItem(ItemBase):
     type: str = "Misc"
+
+class InventoryEvent(NamedTuple):
+    kind: str  # Inventory.ADDED, REMOVED, QUANTITY_CHANGED, EQUIPPED or UNEQUIPPED
+    item: ItemBase
+    quantity: int  # Stack size after the change
+    previous: int  # Stack size before it
+    index: int  # Position of the stack in its category
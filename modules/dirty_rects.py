@@ -0,0 +1,88 @@
+import pygame
+from threading import Lock
+import settings
+
+
+class DirtyRects:
+    """
+    Collects the screen regions that changed since the last presented frame.
+    Tabs, widgets and overlays mark the rects they touch; PipBoy pushes only
+    those rects to the display, or falls back to a full flip.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures only one damage tracker is shared by all components."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.rects = []
+            cls._instance.full = True  # First frame is always a full flip
+            cls._instance.previous = None
+            cls._instance.lock = Lock()
+            cls._instance.screen_rect = pygame.Rect(0, 0, settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+        return cls._instance
+
+    def mark(self, rect):
+        """Mark a region (Rect or (x, y, w, h)) as changed."""
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        with self.lock:
+            if not self.full:
+                self.rects.append(rect)
+
+    def mark_surface(self, surface: pygame.Surface, position):
+        """Mark the area covered by a surface blitted at position (point or Rect)."""
+        if surface is not None:
+            self.mark(surface.get_rect(topleft=(position[0], position[1])))
+
+    def mark_full(self):
+        """Mark the whole screen as changed."""
+        with self.lock:
+            self.full = True
+            self.rects.clear()
+
+    def pending(self) -> bool:
+        """True if the next frame would push anything to the display."""
+        with self.lock:
+            return self.full or bool(self.rects) or self.previous is None or bool(self.previous)
+
+    def collect(self, margin: int = 0):
+        """
+        Return the rects changed since the last call and reset the tracker.
+        Returns None if the whole screen has to be pushed.
+        Each rect is grown by margin, for effects that spread past the changed pixels.
+        
+        The previous frame's rects are pushed again, so one-frame effects get
+        cleared and changes marked by other threads mid-render are never lost.
+        """
+        with self.lock:
+            full = self.full
+            rects = self.rects
+            self.full = False
+            self.rects = []
+
+        previous = self.previous
+        if full:
+            self.previous = None
+            return None
+        if previous is None:
+            self.previous = rects
+            return None
+        self.previous = rects
+
+        if margin:
+            rects = [rect.inflate(margin * 2, margin * 2).clip(self.screen_rect) for rect in rects]
+            previous = [rect.inflate(margin * 2, margin * 2).clip(self.screen_rect) for rect in previous]
+
+        # Merge overlapping rects so the display driver gets as few regions as possible
+        merged = []
+        for rect in rects + previous:
+            for i, other in enumerate(merged):
+                if rect.colliderect(other):
+                    merged[i] = other.union(rect)
+                    break
+            else:
+                merged.append(rect)
+        return merged
@@ -1,18 +1,30 @@
 import pygame
-from queue import Queue
-from threading import Lock
+from profiler import FrameProfiler
+from theme import Theme
+from memory_accounting import SurfaceMemory
+from command_queue import CommandQueue
 
 
 
 class InputManager:
     def __init__(self):
-        self.key_queue = Queue()
-        self.get_key_lock = Lock()
+        self.commands = CommandQueue()
+        self.tab_manager = None
+        self.last_input_ms = pygame.time.get_ticks()
         
+    def bind(self, tab_manager):
+        """Set the TabManager that key commands act on."""
+        self.tab_manager = tab_manager
     
     def handle_keyboard(self, event: pygame.event.Event):
         if event.type == pygame.KEYDOWN:
-            self.key_queue.put(event.key)
+            # Applied with all other state changes before the next frame is drawn
+            self.commands.post(self.handle_key, event.key)
+            self.last_input_ms = pygame.time.get_ticks()
+
+    def idle_ms(self) -> int:
+        """Time since the last key press."""
+        return pygame.time.get_ticks() - self.last_input_ms
             
 
     def handle_quit(self, event: pygame.event.Event):
@@ -21,39 +33,52 @@ class InputManager:
             quit()
 
 
-    def handle_input(self, tab_manager):
-        with self.get_key_lock:
-            while not self.key_queue.empty():
-                key = self.key_queue.get()
-                match key:
-                    case pygame.K_LEFT:
-                        tab_manager.switch_tab(False)
-                    case pygame.K_RIGHT:
-                        tab_manager.switch_tab(True)
-                    case pygame.K_DOWN:
-                        tab_manager.scroll_tab(False)
-                    case pygame.K_UP:
-                        tab_manager.scroll_tab(True)
-                    case pygame.K_RETURN:
-                        tab_manager.select_item()
-                    case pygame.K_a:
-                        tab_manager.switch_sub_tab(False)
-                    case pygame.K_d:
-                        tab_manager.switch_sub_tab(True)
-                    case pygame.K_j:
-                        tab_manager.navigate(0)
-                    case pygame.K_i:
-                        tab_manager.navigate(1)
-                    case pygame.K_k:
-                        tab_manager.navigate(2)
-                    case pygame.K_l:
-                        tab_manager.navigate(3)
-                    case _:
-                        pass
-                
-        
-    
+    def handle_key(self, key: int):
+        tab_manager = self.tab_manager
+        if tab_manager is None:
+            return
+        match key:
+            case pygame.K_LEFT:
+                tab_manager.switch_tab(False)
+            case pygame.K_RIGHT:
+                tab_manager.switch_tab(True)
+            case pygame.K_DOWN:
+                tab_manager.scroll_tab(False)
+            case pygame.K_UP:
+                tab_manager.scroll_tab(True)
+            case pygame.K_RETURN:
+                tab_manager.select_item()
+            case pygame.K_a:
+                tab_manager.switch_sub_tab(False)
+            case pygame.K_d:
+                tab_manager.switch_sub_tab(True)
+            case pygame.K_j:
+                tab_manager.navigate(0)
+            case pygame.K_i:
+                tab_manager.navigate(1)
+            case pygame.K_k:
+                tab_manager.navigate(2)
+            case pygame.K_l:
+                tab_manager.navigate(3)
+            case pygame.K_p:
+                FrameProfiler().toggle()
+            case pygame.K_t:
+                Theme().cycle()
+            case pygame.K_m:
+                print(SurfaceMemory().dump())
+            case _:
+                pass
+
+    def handle_event(self, event: pygame.event.Event):
+        self.handle_keyboard(event)
+        self.handle_quit(event)
+
     def run(self):
         for event in pygame.event.get():
-            self.handle_keyboard(event)
-            self.handle_quit(event)
+            self.handle_event(event)
+
+    def wait(self, timeout: int):
+        """Sleep until any event arrives or timeout ms have passed."""
+        event = pygame.event.wait(max(1, int(timeout)))
+        if event.type != pygame.NOEVENT:
+            self.handle_event(event)
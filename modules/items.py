@@ -1,10 +1,28 @@
-from data_models import WeaponItem, ApparelItem, AidItem, MiscItem, IconConfig, AmmoItem, JunkItem
+from data_models import WeaponItem, ApparelItem, AidItem, MiscItem, IconConfig, AmmoItem, JunkItem, InventoryEvent
 from configparser import ConfigParser
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Callable
+from startup_trace import traced
 
 
 
 class Inventory:
+    """
+    The items the player carries, as stacks of (item, quantity) keyed by name
+    and indexed by category. Totals are updated on every add and remove, so
+    reading them is O(1) and listing a category is O(stacks in it), however
+    many items a stack holds.
+
+    Every change is reported to the listeners as an InventoryEvent, so views
+    can patch the one row it touched instead of listing the category again.
+    Listeners run on the thread making the change, so change the inventory on
+    the main thread and post changes from other threads through the CommandQueue.
+    """
+
+    ADDED = "added"
+    REMOVED = "removed"
+    QUANTITY_CHANGED = "quantity_changed"
+    EQUIPPED = "equipped"
+    UNEQUIPPED = "unequipped"
     
     _instance = None
     
@@ -12,47 +30,125 @@ class Inventory:
         """Ensures only one instance of Inventory is created."""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance.items = {}  # Initialize the inventory
+            cls._instance.items = {}  # Name -> (item, quantity), in the order they were added
+            cls._instance.categories = {}  # Category -> name -> (item, quantity)
+            cls._instance.weight = 0.0
+            cls._instance.value = 0
+            cls._instance.ammo = {}  # Ammo name -> rounds carried
+            cls._instance.special_bonuses = {}  # SPECIAL abbreviation, e.g. STR -> bonus of every item carried
+            cls._instance.equipped = set()  # Names of the equipped items
+            cls._instance.listeners = []
         return cls._instance
 
+    def listen(self, callback: Callable):
+        """Call callback(event) with an InventoryEvent after every change."""
+        self.listeners.append(callback)
+
+    def _emit(self, kind: str, item, quantity: int, previous: int, index: int):
+        event = InventoryEvent(kind, item, quantity, previous, index)
+        for callback in self.listeners:
+            callback(event)
+
+    def _index(self, item) -> int:
+        """Position of a stack in its category."""
+        return list(self.categories[item.category]).index(item.name)
+
     def add_item(self, item, quantity=1):
         """Add an item to the inventory, incrementing quantity if it exists."""
+        if quantity <= 0:
+            return
         if item.name in self.items:
-            self.items[item.name] = (item, self.items[item.name][1] + quantity)
+            item = self.items[item.name][0]
+            quantity += self.items[item.name][1]
+        self._set_quantity(item, quantity)
+
+    def remove_item(self, name: str, quantity=1) -> int:
+        """Take up to quantity of the named item out of the inventory, returns how many were removed."""
+        if name not in self.items:
+            return 0
+        item, held = self.items[name]
+        removed = min(quantity, held)
+        self._set_quantity(item, held - removed)
+        return removed
+
+    def _set_quantity(self, item, quantity: int):
+        """Store the new stack size and move every total by the difference."""
+        previous = self.items[item.name][1] if item.name in self.items else 0
+        if quantity == previous:
+            return
+        category = self.categories.setdefault(item.category, {})
+        if not previous:
+            kind = self.ADDED
+            self.items[item.name] = category[item.name] = (item, quantity)
+            index = len(category) - 1
+        elif quantity > 0:
+            kind = self.QUANTITY_CHANGED
+            self.items[item.name] = category[item.name] = (item, quantity)
+            index = self._index(item)
         else:
-            self.items[item.name] = (item, quantity)
-
-    def get_all_items(self, category=None):
-        """Returns a list of item instances, expanded by quantity for existing logic."""
-        expanded_list = []
-        for item, quantity in self.items.values():
-            if category and item.category != category:
-                continue
-            expanded_list.extend([item] * quantity)
-        return expanded_list
-    
-    
+            kind = self.REMOVED
+            index = self._index(item)
+            del self.items[item.name]
+            del category[item.name]
+            self.equipped.discard(item.name)
+
+        change = quantity - previous
+        self.weight += item.weight * change
+        self.value += item.value * change
+        if item.category == 'Ammo':
+            self.ammo[item.name] = self.ammo.get(item.name, 0) + change
+            if not self.ammo[item.name]:
+                del self.ammo[item.name]
+        for stat, bonus in (getattr(item, 'special_bonuses', None) or {}).items():
+            self.special_bonuses[stat] = self.special_bonuses.get(stat, 0) + bonus * change
+        self._emit(kind, item, quantity, previous, index)
+
+    def equip(self, name: str, equipped: bool = True):
+        """Mark a carried item as equipped or take it off."""
+        if name not in self.items or (name in self.equipped) == equipped:
+            return
+        if equipped:
+            self.equipped.add(name)
+        else:
+            self.equipped.discard(name)
+        item, quantity = self.items[name]
+        self._emit(self.EQUIPPED if equipped else self.UNEQUIPPED, item, quantity, quantity, self._index(item))
+
+    def is_equipped(self, name: str) -> bool:
+        return name in self.equipped
+
+    @property
+    def total_weight(self) -> float:
+        """Weight of everything carried, rounded against float drift from adding and removing."""
+        return round(self.weight, 2)
+
+    def quantity(self, name: str) -> int:
+        """How many of the named item are carried."""
+        return self.items[name][1] if name in self.items else 0
+
+    def count(self, category=None) -> int:
+        """Number of stacks, in a category or overall."""
+        if category:
+            return len(self.categories.get(category, {}))
+        return len(self.items)
+
+    def get_stacks(self, category=None):
+        """Returns (item, quantity) of every stack, in the order they were added."""
+        stacks = self.categories.get(category, {}) if category else self.items
+        return list(stacks.values())
+
     def get_unique_items(self, category=None):
         """Returns a list of unique item instances."""
-        unique_list = []
-        for item, _ in self.items.values():
-            if category and item.category != category:
-                continue
-            if item not in unique_list:
-                unique_list.append(item)
-        return unique_list
+        return [item for item, _ in self.get_stacks(category)]
 
     def get_item_names(self, category=None):
         """Returns item names with quantities (e.g., 'RadAway (2)')."""
-        item_names = []
-        for name, (item, quantity) in self.items.items():
-            if category and item.category != category:
-                continue
-            if quantity > 1:
-                item_names.append(f"{name} ({quantity})")
-            else:
-                item_names.append(name)
-        return item_names  # List of formatted names
+        return [self.item_name(item, quantity) for item, quantity in self.get_stacks(category)]
+
+    @staticmethod
+    def item_name(item, quantity: int) -> str:
+        """List label of a stack."""
+        return f"{item.name} ({quantity})" if quantity > 1 else item.name
 
 
 
@@ -78,6 +174,7 @@ class ItemLoader:
             for part in value.split(',')
         )
 
+    @traced("ItemLoader.load_items", count=len)
     def load_items(self):
         for section in self.config.sections():
             data = dict(self.config[section])
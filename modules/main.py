@@ -1,52 +1,81 @@
 
 import os
 import sys
+from startup_trace import StartupTrace
+# Before any other import, so the imports are part of the trace
+StartupTrace().configure(sys.argv)
 import pygame
 import pygame.freetype
 import traceback
 import settings
 from pipboy import PipBoy
-import threading
 from input_manager import InputManager
+from scheduler import Scheduler
+from command_queue import CommandQueue
+from presenter import Presenter
+from palette import Palette
 
 
 
 def main():
     """Main entry point for the Pip-Boy application."""
+    trace = StartupTrace()
     if settings.RASPI:
         os.environ["SDL_VIDEODRIVER"] = "x11"
         os.environ["DISPLAY"] = ":0"
         os.environ["SDL_AUDIODRIVER"] = "alsa"
 
         
-    pygame.init()
-    pygame.mixer.init(frequency=44100, size=-16, channels=5)
+    with trace.span("pygame.init"):
+        pygame.init()
+    with trace.span("pygame.mixer.init"):
+        pygame.mixer.init(frequency=44100, size=-16, channels=5)
 
     
-    screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT), pygame.RESIZABLE, pygame.DOUBLEBUF, pygame.FULLSCREEN if settings.RASPI else False)
+    with trace.span("pygame.display.set_mode"):
+        if settings.FULLSCREEN:
+            pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            pygame.display.set_mode((settings.DISPLAY_WIDTH, settings.DISPLAY_HEIGHT), pygame.RESIZABLE)
     pygame.mouse.set_visible(True)
     
+    # Everything is drawn at the logical resolution and scaled up when presented
+    screen = Palette().framebuffer((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+    presenter = Presenter(screen)
+    
     pygame.display.set_caption("Pip-Boy")
     clock = pygame.time.Clock()
     
     input_manager = InputManager()
 
-    pipboy = PipBoy(screen, clock, input_manager)
-    pipboy_thread = threading.Thread(target=pipboy.run)
-    pipboy_thread.daemon = True
-    pipboy_thread.start()
-    pipboy_thread_lock = threading.Lock()
+    with trace.span("PipBoy"):
+        pipboy = PipBoy(screen, clock, input_manager, presenter)
+    scheduler = Scheduler()
+    commands = CommandQueue()
     
     
 
     running = True
+    elapsed = 0
+    idle_frame_ms = 1000 / settings.IDLE_FPS
     while running:
         
         input_manager.run()
+        # All state changes of this frame, from input and background work, happen here
+        commands.apply()
+        pipboy.update()
         
-        with pipboy_thread_lock:
+        idle = pipboy.is_idle()
+        # Advance every animation by the real time the last frame took
+        scheduler.tick(elapsed)
+        if not idle or pipboy.needs_render():
             pipboy.render()
-        clock.tick(settings.FPS)
+
+        if idle:
+            # Sleep until input, an animation starts or the next scheduled task is due
+            next_task = scheduler.time_until_next()
+            input_manager.wait(idle_frame_ms if next_task is None else min(next_task, idle_frame_ms))
+        elapsed = clock.tick(settings.FPS)
 
     pygame.quit()
     sys.exit()
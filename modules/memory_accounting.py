@@ -0,0 +1,152 @@
+import functools
+import threading
+import weakref
+from collections import defaultdict
+from contextlib import contextmanager
+import pygame
+import settings
+from atlas import Atlas
+
+
+class SurfaceMemory:
+    """
+    Bytes of pixel data held by surfaces, grouped by the part of the UI that owns them.
+
+    Surfaces are tracked through weak references, so a group shrinks as soon as
+    its surfaces are freed and tracking never keeps one alive. Subsurfaces and
+    atlas frames count towards the surface they are cut from, and a surface
+    counts once, in the first group it was tracked in unless a later call names
+    its group explicitly. Loader results without an explicit group go to the
+    group of the enclosing owner() block on the same thread, or to "other".
+
+    A warning is printed once when a group grows past its SURFACE_MEMORY_BUDGETS
+    entry, and again only after it dropped back under it.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures every loader and tab reports into the same totals."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.entries = {}  # id of the surface -> (weak reference, group, bytes)
+            cls._instance.group_bytes = defaultdict(int)
+            cls._instance.budgets = settings.SURFACE_MEMORY_BUDGETS
+            cls._instance.over_budget = set()
+            cls._instance.local = threading.local()
+            # Reentrant, weak reference callbacks can run while it is held
+            cls._instance.lock = threading.RLock()
+        return cls._instance
+
+    @contextmanager
+    def owner(self, group: str):
+        """Track loader results in the enclosed block on this thread under group."""
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        stack.append(group)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    @property
+    def current_owner(self) -> str:
+        stack = getattr(self.local, "stack", None)
+        return stack[-1] if stack else "other"
+
+    def track(self, images, group: str = None):
+        """
+        Count a surface, an Atlas, or a list, tuple or dict of them towards group,
+        or towards the current owner without one. Returns images.
+        """
+        if images is None:
+            return images
+        if isinstance(images, pygame.Surface):
+            self._add(images, group or self.current_owner, group is not None)
+        elif isinstance(images, Atlas):
+            self.track(images.surface, group)
+        elif isinstance(images, dict):
+            for image in images.values():
+                self.track(image, group)
+        elif isinstance(images, (list, tuple)):
+            for image in images:
+                self.track(image, group)
+        return images
+
+    def _add(self, surface: pygame.Surface, group: str, explicit: bool):
+        # Subsurfaces share their parent's pixels
+        surface = surface.get_abs_parent()
+        key = id(surface)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0]() is surface:
+                if not explicit or entry[1] == group:
+                    return
+                self._remove(key, entry[0])
+            reference = weakref.ref(surface, lambda reference, key=key: self._remove(key, reference))
+            size = surface.get_pitch() * surface.get_height()
+            self.entries[key] = (reference, group, size)
+            self.group_bytes[group] += size
+            self._check(group)
+
+    def _remove(self, key: int, reference):
+        """Drop an entry, also called by its weak reference once the surface is freed."""
+        with self.lock:
+            entry = self.entries.get(key)
+            # The id may already belong to a newer surface
+            if entry is None or entry[0] is not reference:
+                return
+            del self.entries[key]
+            _, group, size = entry
+            self.group_bytes[group] -= size
+            if self.group_bytes[group] <= self.budgets.get(group, float("inf")):
+                self.over_budget.discard(group)
+
+    def _check(self, group: str):
+        budget = self.budgets.get(group)
+        if budget is None or self.group_bytes[group] <= budget or group in self.over_budget:
+            return
+        self.over_budget.add(group)
+        print(f"Surface memory of {group} is {self.group_bytes[group] / 1024 / 1024:.1f} MB, over its budget of {budget / 1024 / 1024:.1f} MB")
+
+    def totals(self) -> dict:
+        """Bytes held per group, largest first."""
+        with self.lock:
+            return dict(sorted(((group, size) for group, size in self.group_bytes.items() if size), key=lambda item: item[1], reverse=True))
+
+    def total(self) -> int:
+        with self.lock:
+            return sum(self.group_bytes.values())
+
+    def counts(self) -> dict:
+        """Number of surfaces held per group."""
+        counts = defaultdict(int)
+        with self.lock:
+            for _, group, _ in self.entries.values():
+                counts[group] += 1
+        return dict(counts)
+
+    def dump(self) -> str:
+        """Text table of every group with its surfaces, bytes and budget."""
+        totals = self.totals()
+        counts = self.counts()
+        lines = [f"Surface memory, {self.total() / 1024 / 1024:.2f} MB in {sum(counts.values())} surfaces", ""]
+        lines.append(f"{'MB':>8} {'budget':>8} {'surfaces':>9}  group")
+        for group, size in totals.items():
+            budget = self.budgets.get(group)
+            budget_text = f"{budget / 1024 / 1024:8.2f}" if budget is not None else f"{'-':>8}"
+            marker = "  OVER BUDGET" if budget is not None and size > budget else ""
+            lines.append(f"{size / 1024 / 1024:8.2f} {budget_text} {counts.get(group, 0):9d}  {group}{marker}")
+        return "\n".join(lines) + "\n"
+
+
+def accounted(function):
+    """Track the surfaces the decorated loader returns under the current owner."""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        result = function(*args, **kwargs)
+        # load_svgs(load_transforms=True) returns (images, transforms)
+        SurfaceMemory().track(result[0] if isinstance(result, tuple) else result)
+        return result
+    return wrapper
@@ -1,50 +1,160 @@
 import pygame
-import os
+import numpy as np
 import settings
+from scheduler import Scheduler
+from util_functs import Utils
+from preloader import Preloader
+from theme import Theme
+from memory_accounting import SurfaceMemory
 
 class Overlays:
-    def __init__(self, screen):
+    def __init__(self, screen, bake: bool = True):
         self.overlays = []
         self.current_crt_image = 0
-        self.overlay_image = pygame.image.load(settings.CRT_OVERLAY).convert_alpha()
+        self.screen = screen
+        self.overlay_image = Utils.load_tinted(settings.CRT_OVERLAY, tint=None)
         self.overlay_image.set_alpha(80)
-        self.scanline_image = pygame.image.load(settings.SCANLINE_OVERLAY).convert_alpha()
-        self.scanline_image = self._tint_image(self.scanline_image)
-        self.scanline_image.set_alpha(5)
+        self.scanline_source = Utils.load_tinted(settings.SCANLINE_OVERLAY, tint=None)
+        self.scanline_height = self.scanline_source.get_height()
+        self.scanline_y = -self.scanline_height
+        self.crt_static = SurfaceMemory().track(Preloader().take("crt_static", self.load_static_frames), "crt")
+        self.bloom_source = Utils.load_tinted(settings.BLOOM_OVERLAY, tint=None)
 
-        self.scanline_y = -self.scanline_image.get_height()
-        self.scanline_height = self.scanline_image.get_height()
-        self.screen = screen
-        self.crt_static = [
-            pygame.image.load(os.path.join(settings.CRT_STATIC, filename)).convert_alpha()
-            for filename in os.listdir(settings.CRT_STATIC) if filename.endswith(".png")
-        ]
-        
-        self.bloom_overlay = pygame.image.load(settings.BLOOM_OVERLAY).convert_alpha()
-        self.bloom_overlay = self._tint_image(self.bloom_overlay)
+        self.composites = []
+        self.rebuild(bake)
+
+    @staticmethod
+    def load_static_frames():
+        """Load the CRT static frames, safe to run on a preload worker."""
+        return Utils.load_images(settings.CRT_STATIC, tint=None)
+
+    def rebuild(self, bake: bool = True):
+        """
+        Re-tint the layers and re-bake the composites, call whenever the theme changes.
+        Without bake the original layer stack is drawn until composites are set.
+        """
+        # Drawn on the recoloured frame, so in the theme colour
+        color = Theme().shade(settings.PIP_BOY_LIGHT)
+        self.scanline_image = Utils.tint_image(self.scanline_source, color)
+        self.scanline_image.set_alpha(5)
+        self.bloom_overlay = Utils.tint_image(self.bloom_source, color)
         self.bloom_overlay.set_alpha(20)
+        SurfaceMemory().track((self.scanline_image, self.bloom_overlay), "crt")
+
+        self.composites = self.bake_composites() if bake else []
+
+    def bake_composites(self) -> list:
+        """Bake every static frame, does not touch the screen so it can run on a worker."""
+        if not settings.CRT_PRECOMPOSITED:
+            return []
+        return SurfaceMemory().track([self._bake_composite(i) for i in range(len(self.crt_static))], "crt")
+
+    def _render_static_layers(self, surface: pygame.Surface, frame: int, scanline_top: int = None):
+        """
+        The original static layer stack: static noise, overlay and bloom dirt.
+        With scanline_top the scanline is drawn at that height in its original place, after the noise.
+        """
+        surface.blit(self.crt_static[frame], (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        if scanline_top is not None:
+            surface.blit(self.scanline_image, (0, scanline_top))
+        surface.blit(self.overlay_image, (0, 0), special_flags=pygame.BLEND_RGBA_SUB)
+        surface.blit(self.bloom_overlay, (0, 0))
+
+    def _bake_composite(self, frame: int) -> pygame.Surface:
+        """
+        Fit the static layers of one frame into a single premultiplied surface.
 
+        Every pixel of the stack maps a screen value x to roughly P + x * (1 - A),
+        which is exactly what BLEND_PREMULTIPLIED does. P and A are fitted per pixel
+        by least squares over a range of screen values, weighted towards the theme levels.
+        """
+        size = self.screen.get_size()
+        levels = sorted(set(range(0, 256, 16)) | {255, 190, 127, 63})
+        samples = np.empty((len(levels), size[0], size[1], 3), dtype=np.uint8)
+        surface = pygame.Surface(size)
+        for i, level in enumerate(levels):
+            surface.fill((level, level, level))
+            self._render_static_layers(surface, frame)
+            samples[i] = pygame.surfarray.pixels3d(surface)
 
-    def _tint_image(self, image, color: tuple=settings.PIP_BOY_LIGHT):
-        """Tint image with specified color while preserving alpha"""
-        tinted = image.copy()
-        # Multiply RGB channels with color, preserve original alpha
-        tinted.fill(color[:3] + (0,), special_flags=pygame.BLEND_RGB_MULT)
-        return tinted
-                
+        x = np.array(levels, dtype=np.float32)
+        x_mean = x.mean()
+        slope_weights = (x - x_mean) / ((x - x_mean) ** 2).sum()
+        mean_weights = np.full(len(levels), 1 / len(levels), dtype=np.float32)
+        samples = samples.astype(np.float32)
+        # Premultiplied alpha is shared by all channels
+        slope = np.clip(np.tensordot(slope_weights, samples, axes=1).mean(axis=-1), 0, 1)
+        offset = np.clip(np.tensordot(mean_weights, samples, axes=1) - slope[..., None] * x_mean, 0, 255)
 
-    def run(self):
-        """CRT effect thread."""
-        while True:
-            self.scanline_y = (self.scanline_y + 5) % (settings.SCREEN_HEIGHT + self.scanline_height)
-            self.current_crt_image = (self.current_crt_image + 1) % len(self.crt_static)
-            pygame.time.wait(settings.SPEED * 75)
+        composite = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.surfarray.pixels3d(composite)[:] = np.round(offset).astype(np.uint8)
+        # Alpha 0 is skipped by the blitter, so keep at least 1 to still apply the offset
+        pygame.surfarray.pixels_alpha(composite)[:] = np.clip(np.round((1 - slope) * 255), 1, 255).astype(np.uint8)
+        return composite
+
+    def verify(self) -> dict:
+        """
+        Compare the composited path against the original layer stack.
+        Renders a grey ramp and the theme colours through both, with the scanline
+        across the middle of the screen, and returns the per-channel error in 0-255 steps.
+        The error includes the scanline being drawn after the baked layers, see render.
+        """
+        if not self.composites:
+            return {"max_error": 0, "mean_error": 0.0}
+
+        size = self.screen.get_size()
+        reference = pygame.Surface(size)
+        composited = pygame.Surface(size)
+
+        test_screens = []
+        ramp = pygame.Surface(size)
+        ramp_pixels = pygame.surfarray.pixels3d(ramp)
+        ramp_pixels[:] = np.linspace(0, 255, size[0]).astype(np.uint8)[:, None, None]
+        del ramp_pixels
+        test_screens.append(ramp)
+        for colour in (settings.PIP_BOY_LIGHT, settings.PIP_BOY_MIDDLE, settings.PIP_BOY_DARKER, settings.PIP_BOY_DARK, settings.BACKGROUND):
+            screen = pygame.Surface(size)
+            screen.fill(colour)
+            test_screens.append(screen)
+
+        scanline_top = (size[1] - self.scanline_height) // 2
+        max_error = 0
+        total_error = 0.0
+        count = 0
+        for frame in range(len(self.crt_static)):
+            for test_screen in test_screens:
+                reference.blit(test_screen, (0, 0))
+                self._render_static_layers(reference, frame, scanline_top)
+                composited.blit(test_screen, (0, 0))
+                composited.blit(self.composites[frame], (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+                composited.blit(self.scanline_image, (0, scanline_top))
+
+                error = np.abs(pygame.surfarray.array3d(reference).astype(np.int16) - pygame.surfarray.array3d(composited))
+                max_error = max(max_error, int(error.max()))
+                total_error += float(error.mean())
+                count += 1
+        return {"max_error": max_error, "mean_error": total_error / count}
+
+
+    def start(self):
+        """Register the CRT animation with the frame clock."""
+        self.task = Scheduler().every(settings.SPEED * 75, self.update)
+
+    def update(self):
+        """Advance the scanline and static frame."""
+        self.scanline_y = (self.scanline_y + 5) % (settings.SCREEN_HEIGHT + self.scanline_height)
+        self.current_crt_image = (self.current_crt_image + 1) % len(self.crt_static)
 
 
     def render(self):
-        
+        if self.composites:
+            self.screen.blit(self.composites[self.current_crt_image], (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+            # The moving scanline can't be baked, so it comes after the overlay and bloom dirt
+            # instead of before them. At alpha 5 the difference is within the error verify() reports.
+            self.screen.blit(self.scanline_image, (0, (self.scanline_y - self.scanline_height)))
+            return
+
         self.screen.blit(self.crt_static[self.current_crt_image], (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
         self.screen.blit(self.scanline_image, (0, (self.scanline_y - self.scanline_height)))
         self.screen.blit(self.overlay_image, (0, 0), special_flags=pygame.BLEND_RGBA_SUB)
         self.screen.blit(self.bloom_overlay, (0, 0))
-        
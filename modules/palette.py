@@ -0,0 +1,163 @@
+import weakref
+from threading import Lock
+import numpy as np
+import pygame
+import settings
+from atlas import Atlas
+from memory_accounting import SurfaceMemory
+
+
+class Palette:
+    """
+    Shared palette of the 8-bit render mode, see PALETTE_MODE.
+
+    Indexed surfaces hold one byte per pixel. Index 0 is the colour key,
+    indices 1 to 255 step evenly from BACKGROUND to PIP_BOY_LIGHT. The
+    framebuffer and every indexed surface carry the same palette, so blits
+    between them are plain byte copies, and colours are looked up once per
+    frame when the presenter copies the framebuffer to the display.
+    fill and pygame.draw still take theme colours, SDL maps them to the
+    nearest index.
+
+    Converted surfaces are indexed by the brightness of the theme colour's
+    strongest channel, through one lookup table per theme. Their alpha is
+    premultiplied against the background and cut to the colour key, which is
+    exact on the dark background the UI is drawn on.
+    """
+
+    TRANSPARENT = 0
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures every indexed surface is built against the same colours."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.enabled = settings.PALETTE_MODE
+            cls._instance.dark = settings.BACKGROUND
+            cls._instance.light = settings.PIP_BOY_LIGHT
+            cls._instance.colors = cls.ramp(settings.BACKGROUND, settings.PIP_BOY_LIGHT)
+            cls._instance.surfaces = weakref.WeakSet()  # Every indexed surface handed out
+            cls._instance.converted = weakref.WeakKeyDictionary()  # Source surface -> indexed copy
+            cls._instance.table = None  # See _table
+            # Atlases are converted on the preload workers
+            cls._instance.lock = Lock()
+        return cls._instance
+
+    @staticmethod
+    def ramp(dark, light) -> list:
+        """The colour key, then 255 colours from dark to light."""
+        steps = np.linspace(dark[:3], light[:3], 255).round().astype(np.uint8)
+        return [tuple(dark[:3])] + [tuple(int(c) for c in color) for color in steps]
+
+    def framebuffer(self, size: tuple) -> pygame.Surface:
+        """The surface everything is drawn on: indexed in palette mode, else in the display format."""
+        if not self.enabled:
+            return pygame.Surface(size).convert()
+        return self.surface(size, transparent=False)
+
+    def surface(self, size: tuple, transparent: bool = True) -> pygame.Surface:
+        """A cleared surface to draw on: indexed in palette mode, else with per-pixel alpha."""
+        if not self.enabled:
+            return SurfaceMemory().track(pygame.Surface(size, pygame.SRCALPHA))
+        surface = pygame.Surface(size, 0, 8)
+        surface.set_palette(self.colors)
+        surface.fill(self.TRANSPARENT)
+        if transparent:
+            surface.set_colorkey(self.TRANSPARENT)
+        self.surfaces.add(surface)
+        return SurfaceMemory().track(surface)
+
+    def fill(self, surface: pygame.Surface, color, rect=None):
+        """surface.fill, through NumPy on indexed surfaces where SDL's 8-bit fill is slow."""
+        if surface.get_bitsize() != 8:
+            surface.fill(color, rect)
+            return
+        area = pygame.Rect(rect).clip(surface.get_rect()) if rect is not None else surface.get_rect()
+        pixels = pygame.surfarray.pixels2d(surface)
+        pixels[area.left:area.right, area.top:area.bottom] = surface.map_rgb(color)
+        del pixels
+
+    def indexed(self, images, rle: bool = True):
+        """
+        Indexed copies of a surface, an Atlas, or a list or dict of surfaces.
+        Returns images unchanged when palette mode is off. Converted surfaces
+        are remembered, so only pass surfaces that are not drawn on any more.
+        rle run-length encodes the colour key, skip it for surfaces that are updated.
+        """
+        if not self.enabled or images is None:
+            return SurfaceMemory().track(images)
+        if isinstance(images, Atlas):
+            return Atlas(self.indexed(images.surface, rle), images.rects)
+        if isinstance(images, dict):
+            return {key: self.indexed(image, rle) for key, image in images.items()}
+        if isinstance(images, (list, tuple)):
+            return [self.indexed(image, rle) for image in images]
+        with self.lock:
+            if images in self.surfaces:
+                return images
+            surface = self.converted.get(images)
+        if surface is None:
+            surface = self.convert(images, rle)
+            with self.lock:
+                self.converted[images] = surface
+                self.surfaces.add(surface)
+        return SurfaceMemory().track(surface)
+
+    def convert(self, surface: pygame.Surface, rle: bool = True) -> pygame.Surface:
+        """Indexed copy of surface, by the brightness of every pixel between dark and light."""
+        channel, table = self._table()
+        if surface.get_bitsize() == 8:
+            # e.g. text rendered with a background, map its palette instead of every pixel
+            values = np.array([color[channel] for color in surface.get_palette()], dtype=np.uint8)
+            pixels = pygame.surfarray.pixels2d(surface)
+            value = values[pixels]
+            alpha = np.full(pixels.shape, 255, dtype=np.uint8)
+            key = surface.get_colorkey()
+            if key is not None:
+                alpha[pixels == surface.map_rgb(key)] = 0
+            del pixels
+        else:
+            value = pygame.surfarray.pixels3d(surface)[..., channel]
+            if surface.get_flags() & pygame.SRCALPHA:
+                alpha = pygame.surfarray.pixels_alpha(surface)
+            else:
+                alpha = np.full(value.shape, 255, dtype=np.uint8)
+                key = surface.get_colorkey()
+                if key is not None:
+                    pixels = pygame.surfarray.pixels2d(surface)
+                    alpha[pixels == surface.map_rgb(key)] = 0
+                    del pixels
+        if surface.get_alpha() is not None and surface.get_alpha() < 255:
+            alpha = (alpha.astype(np.uint16) * surface.get_alpha() // 255).astype(np.uint8)
+        indices = table[(alpha.astype(np.uint16) << 8) | value]
+        del value, alpha
+
+        indexed = pygame.Surface(surface.get_size(), 0, 8)
+        indexed.set_palette(self.colors)
+        pixels = pygame.surfarray.pixels2d(indexed)
+        pixels[...] = indices
+        del pixels
+        # Opaque surfaces, like the map, blit fastest as a plain copy
+        if (indices == self.TRANSPARENT).any():
+            indexed.set_colorkey(self.TRANSPARENT, pygame.RLEACCEL if rle else 0)
+        return indexed
+
+    def _table(self) -> tuple:
+        """
+        The channel brightness is read from, and the index of every (alpha, value) pair of it.
+        The strongest channel of the theme colour, exact for anything tinted with it.
+        """
+        if self.table is None:
+            dark = np.array(self.dark[:3], dtype=np.int32)
+            direction = np.array(self.light[:3], dtype=np.int32) - dark
+            channel = int(np.argmax(np.abs(direction)))
+            values = np.arange(256, dtype=np.int32)
+            levels = np.clip((values - dark[channel]) * 255 // (direction[channel] or 1), 0, 255)
+            # Premultiplied against the background, fully dark pixels under half alpha become the key
+            alpha = np.arange(256, dtype=np.int32)[:, None]
+            premultiplied = levels[None, :] * alpha // 255
+            indices = 1 + (premultiplied * 254 + 127) // 255
+            indices[(premultiplied == 0) & (alpha < 128)] = self.TRANSPARENT
+            self.table = channel, indices.astype(np.uint8).ravel()
+        return self.table
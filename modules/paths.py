@@ -77,12 +77,29 @@ ROTARY_VERTICAL_2 = "../sounds/pipboy/RotaryVertical/UI_PipBoy_RotaryVertical_02
 OK_SOUND = "../sounds/pipboy/UI_PipBoy_OK.ogg"
 SPECIAL_SOUNDS = "../sounds/pipboy/PerkMenu/SPECIAL"
 
+# Sound files and folders decoded into memory during the boot sequence
+UI_SFX = [
+    ROTARY_HORIZONTAL_1,
+    ROTARY_HORIZONTAL_2,
+    ROTARY_VERTICAL_1,
+    ROTARY_VERTICAL_2,
+    BUZZ_SOUND_BASE_FOLDER,
+    RADIO_STATIC_BURSTS_BASE_FOLDER,
+    RADIO_TURN_OFF_SOUND,
+    SPECIAL_SOUNDS,
+    BACKGROUND_HUM,
+]
+
 
 
 # Misc
 MAP_CACHE = "../cache/maps"
 MAP_PLACES_CACHE = "../cache/places"
 MAP_RENDERED_CACHE = "../cache/rendered_maps"
+RASTER_CACHE_FOLDER = "../cache/rasters"
+ASSET_BUNDLE_FILE = "../cache/assets.bundle"
+SVG_BASE_FOLDER = "../images/svgs"
+SVG_MANIFEST = "../cache/svg_manifest.json"
 STAT_TAB_OFFSET_INI = "positions.ini"
 
 
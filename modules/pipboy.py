@@ -1,49 +1,124 @@
-import pygame
 from boot import Boot
-import threading
 import settings
 import overlays
+from bloom import Bloom
 from tab_manager import TabManager
+from dirty_rects import DirtyRects
+from profiler import FrameProfiler
+from presenter import Presenter
+from scheduler import Scheduler
 import random  
+import time
+from threading import Thread
+from preloader import Preloader
+from command_queue import CommandQueue
+from startup_trace import StartupTrace
+from sound_bank import SoundBank
+from asset_bundle import AssetBundle
+from palette import Palette
+from theme import Theme
+from memory_accounting import SurfaceMemory
 
 class PipBoy:
-    def __init__(self, screen, clock, input_manager):
+    def __init__(self, screen, clock, input_manager, presenter: Presenter = None):
         """
         Initialize the PipBoy object.
+        screen is the framebuffer everything is drawn on, the presenter scales it to the display.
+        Post effects draw on the presenter's output, which is the framebuffer unless it is indexed.
         """
+        self.start_time = time.perf_counter()
+        self.time_to_interactive_ms = None
         self.screen = screen
+        self.presenter = presenter or Presenter(screen)
+        self.effects_screen = self.presenter.output
         self.clock = clock
         self.states = iter(["boot", "main"])
         self.current_sequence = "main"   
+
+        # Before anything loads, so every cached raster can come from the bundle
+        AssetBundle().open()
         
-        self.tab_manager = TabManager(self.screen)
+        with SurfaceMemory().owner("chrome"):
+            self.tab_manager = TabManager(self.screen, self.effects_screen)
         
         self.input_manager = input_manager        
-        
+        self.dirty_rects = DirtyRects()
+        self.profiler = FrameProfiler()
+        self.palette = Palette()
+        self.overlay_instance = None
+        Theme().listen(self._apply_theme)
+
+        # Heavy assets load while the boot sequence plays, the tabs are built once they are in
+        self.preloader = Preloader()
+        tab_jobs = self.tab_manager.preload(self.preloader)
+        self.preloader.add("tabs", after=tab_jobs, finish=self._build_tabs)
+        if settings.SOUND_ON:
+            self.preloader.add("sfx", SoundBank().load)
+        if settings.SHOW_CRT:
+            self.preloader.add("crt_static", overlays.Overlays.load_static_frames)
+            self.preloader.add("overlays", after=("crt_static",), finish=self._build_overlays)
+            self.preloader.add("crt_composites", lambda: self.overlay_instance.bake_composites(), after=("overlays",), finish=self._set_crt_composites)
 
         if settings.BOOT_SCREEN:
             self.current_sequence = "boot"
-            self.boot_instance = Boot(self.screen)
-            self.boot_thread = threading.Thread(target=self.boot_instance.run, daemon=True)
-            self.boot_thread.start()
+            with SurfaceMemory().owner("boot"):
+                self.boot_instance = Boot(self.screen, self.preloader)
+            self.boot_instance.start()
+            self.preloader.start()
+        else:
+            self.preloader.start(background=False)
 
 
-        if settings.SHOW_CRT:
-            self.overlay_instance = overlays.Overlays(self.screen)
-            threading.Thread(target=self.overlay_instance.run, daemon=True).start()
+        if settings.BLOOM_EFFECT:
+            self.bloom = Bloom(self.effects_screen)
 
         self.done = False
 
+    def _build_tabs(self, _):
+        self.tab_manager.build_tabs()
+        self.input_manager.bind(self.tab_manager)
+
+    def _build_overlays(self, _):
+        # The composites are baked by their own job
+        with SurfaceMemory().owner("crt"):
+            self.overlay_instance = overlays.Overlays(self.effects_screen, bake=False)
+        self.overlay_instance.start()
+
+    def _set_crt_composites(self, composites: list):
+        if composites:
+            self.overlay_instance.composites = composites
+
+    def _apply_theme(self):
+        """Re-tint the post effects, the frame itself is recoloured by the presenter."""
+        if settings.BLOOM_EFFECT:
+            self.bloom.retint()
+        if self.overlay_instance:
+            # The layer stack shows the new colour right away, composites follow from a worker
+            self.overlay_instance.rebuild(bake=False)
+            if settings.CRT_PRECOMPOSITED:
+                Thread(target=self._bake_crt_composites, args=(self.overlay_instance,), daemon=True).start()
+        self.dirty_rects.mark_full()
+
+    def _bake_crt_composites(self, overlay_instance):
+        composites = overlay_instance.bake_composites()
+        CommandQueue().post(self._set_theme_composites, overlay_instance, composites, Theme().color)
+
+    def _set_theme_composites(self, overlay_instance, composites: list, color: tuple):
+        # Dropped if the theme changed again while baking
+        if color == Theme().color and overlay_instance is self.overlay_instance:
+            self._set_crt_composites(composites)
+
 
 
     def play_hum(self, sound: str, volume: float, loops: int):
-        sound = pygame.mixer.Sound(sound)
-        sound.set_volume(volume)
-        sound.play(loops)
+        SoundBank().play(sound, volume, SoundBank.HIGH, loops)
 
     
     def render(self):
-        self.screen.fill(settings.BACKGROUND)
+        self.profiler.begin_frame()
+        if self.current_sequence == "main":
+            self.tab_manager.begin_frame()
+        self.palette.fill(self.screen, settings.BACKGROUND)
         
         match self.current_sequence:
             case "boot":
@@ -52,43 +127,74 @@ class PipBoy:
                 self.tab_manager.render()
             case _:
                 pass
+
+        if self.effects_screen is not self.screen or not Theme().identity:
+            # Effects below need RGB in the theme colour, the frame is coloured here once
+            with self.profiler.stage("palette_lookup"):
+                self.presenter.lookup()
+        if self.current_sequence == "main":
+            self.tab_manager.render_transition()
         
-        # Bloom effect implementation
         if settings.BLOOM_EFFECT:
-            green_tint = pygame.Surface((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
-            green_tint.fill(settings.PIP_BOY_LIGHT)
-            green_tint.set_alpha(10)
-            
-            # Blend the blurred image with additive blending
-            self.screen.blit(green_tint, (0, 0))
+            with self.profiler.stage("bloom"):
+                self.bloom.render()
         
         # Render CRT overlay
-        if settings.SHOW_CRT:
-            self.overlay_instance.render()
+        if settings.SHOW_CRT and self.overlay_instance:
+            with self.profiler.stage("overlays"):
+                self.overlay_instance.render()
         
-        pygame.display.flip()
-
-    def run(self):
-        # Main loop
-        while True:   
-            self.input_manager.handle_input(self.tab_manager)
-            self.input_manager.run()
-            
-            if not self.done:
-                match self.current_sequence:
-                    case "boot":
-                        self.boot_instance.start()
-                        self.boot_thread.join()
-                        self.current_sequence = next(self.states)
-                    case "main":
-                        self.boot_instance = None
-                        if settings.SOUND_ON:
-                            self.play_hum(settings.BACKGROUND_HUM, settings.VOLUME / 10, -1)
-                        self.done = True
-                    case _:
-                        pass
-
-            pygame.time.wait(settings.SPEED)
+        self.profiler.render(self.effects_screen)
+        with self.profiler.stage("display"):
+            self.present()
+        self.profiler.end_frame()
+
+    def is_idle(self) -> bool:
+        """Nothing animates and there was no input for a while, so the frame rate can drop."""
+        if self.current_sequence != "main" or not self.done:
+            return False
+        transition = self.tab_manager.transition
+        if transition.active or transition.pending or Scheduler().is_animating():
+            return False
+        return self.input_manager.idle_ms() >= settings.IDLE_TIMEOUT
+
+    def needs_render(self) -> bool:
+        """Whether an idle frame would change anything on the display."""
+        return not settings.DIRTY_RECT_UPDATES or self.dirty_rects.pending()
+
+    def needs_full_flip(self) -> bool:
+        """The animated CRT overlay and the boot sequence change the whole screen every frame."""
+        return not settings.DIRTY_RECT_UPDATES or settings.SHOW_CRT or self.current_sequence != "main"
+
+    def present(self):
+        # Glow spreads past the changed regions
+        margin = self.bloom.reach if settings.BLOOM_EFFECT else 0
+        rects = self.dirty_rects.collect(margin)
+        if self.needs_full_flip():
+            rects = None
+        self.presenter.present(rects)
+
+    def update(self):
+        """Advance the boot/main sequence, called once per frame before rendering."""
+        if self.done:
+            return
+        match self.current_sequence:
+            case "boot":
+                # The boot sequence is driven by the scheduler, just wait for it
+                if self.boot_instance.done:
+                    self.current_sequence = next(self.states)
+                    self.dirty_rects.mark_full()
+            case "main":
+                self.boot_instance = None
+                if settings.SOUND_ON:
+                    self.play_hum(settings.BACKGROUND_HUM, settings.VOLUME / 10, -1)
+                self.done = True
+                self.time_to_interactive_ms = (time.perf_counter() - self.start_time) * 1000
+                print(f"Time to interactive: {self.time_to_interactive_ms:.0f} ms, assets preloaded in {self.preloader.elapsed_ms:.0f} ms")
+                StartupTrace().finish()
+                AssetBundle().start_rebaking()
+            case _:
+                pass
 
 
 
@@ -0,0 +1,142 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+import pygame
+import settings
+from asset_cache import RasterCache
+from atlas import Atlas
+from command_queue import CommandQueue
+from startup_trace import StartupTrace
+
+
+class PreloadJob:
+    def __init__(self, name: str, load: Callable = None, after: tuple = (), finish: Callable = None):
+        self.name = name
+        self.load = load  # Runs on a worker thread and returns the loaded assets
+        self.after = tuple(after)  # Jobs that must be done before this one starts
+        self.finish = finish  # Runs on the main thread with the result of load, None if it failed
+        self.state = "waiting"  # waiting, running or done
+
+
+class Preloader:
+    """
+    Loads assets on a worker pool while the boot sequence plays.
+
+    Jobs form a dependency graph: a job starts once every job it comes after is
+    done. load runs on a worker with surface conversion deferred, the main thread
+    then converts the result and either passes it to finish or keeps it until a
+    consumer takes it. Jobs without load only run finish, on the main thread.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures tabs can take the results of the jobs declared for them."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.jobs = {}
+            cls._instance.results = {}
+            cls._instance.pool = None
+            cls._instance.start_time = None
+            cls._instance.elapsed_ms = None
+        return cls._instance
+
+    def add(self, name: str, load: Callable = None, after: tuple = (), finish: Callable = None):
+        """Declare a job, replacing any earlier job with the same name."""
+        self.jobs[name] = PreloadJob(name, load, after, finish)
+
+    @property
+    def completed(self) -> int:
+        return sum(1 for job in self.jobs.values() if job.state == "done")
+
+    @property
+    def progress(self) -> float:
+        """Fraction of jobs done, from 0 to 1."""
+        return self.completed / len(self.jobs) if self.jobs else 1.0
+
+    @property
+    def done(self) -> bool:
+        return all(job.state == "done" for job in self.jobs.values())
+
+    def start(self, background: bool = True):
+        """
+        Start every job whose dependencies are met. In the background the results
+        arrive through the command queue, otherwise all jobs run right here.
+        """
+        for job in self.jobs.values():
+            for dependency in job.after:
+                if dependency not in self.jobs:
+                    raise ValueError(f"Preload job {job.name} comes after unknown job {dependency}")
+
+        self.start_time = time.perf_counter()
+        self.elapsed_ms = None
+        if background:
+            self.pool = ThreadPoolExecutor(max_workers=settings.PRELOAD_WORKERS, thread_name_prefix="preload")
+        self._start_ready()
+
+    def _start_ready(self):
+        for job in self.jobs.values():
+            if job.state != "waiting" or any(self.jobs[name].state != "done" for name in job.after):
+                continue
+            job.state = "running"
+            if self.pool is None:
+                with StartupTrace().span(f"preload {job.name}"):
+                    result = job.load() if job.load else None
+                self._complete(job, result)
+            elif job.load is None:
+                # Main thread only, runs with the other commands of the next frame
+                CommandQueue().post(self._complete, job, None)
+            else:
+                self.pool.submit(self._run, job)
+
+    def _run(self, job: PreloadJob):
+        """Worker side of a job."""
+        try:
+            with RasterCache().deferred_conversion(), StartupTrace().span(f"preload {job.name}"):
+                result = job.load()
+        except Exception as e:
+            # The consumer falls back to loading the asset itself
+            print(f"Preload job {job.name} failed: {e}")
+            result = None
+        CommandQueue().post(self._complete, job, result, True)
+
+    def _complete(self, job: PreloadJob, result, from_worker: bool = False):
+        """Main thread side of a job."""
+        if from_worker and result is not None:
+            result = self.convert(result)
+        if job.finish:
+            with StartupTrace().span(f"preload {job.name} finish"):
+                job.finish(result)
+        elif result is not None:
+            self.results[job.name] = result
+        job.state = "done"
+
+        if self.done:
+            self.elapsed_ms = (time.perf_counter() - self.start_time) * 1000
+            if self.pool:
+                self.pool.shutdown(wait=False)
+                self.pool = None
+        else:
+            self._start_ready()
+
+    def take(self, name: str, load: Callable):
+        """The preloaded result of a job, or load() when it was not preloaded."""
+        if name in self.results:
+            return self.results.pop(name)
+        return load()
+
+    @classmethod
+    def convert(cls, result):
+        """Convert every surface in a job result to the display format."""
+        if isinstance(result, Atlas):
+            return Atlas(cls.convert(result.surface), result.rects)
+        if isinstance(result, pygame.Surface):
+            # Indexed surfaces are already in the framebuffer's format, see Palette
+            return result if result.get_bitsize() == 8 else result.convert_alpha()
+        if isinstance(result, list):
+            return [cls.convert(item) for item in result]
+        if isinstance(result, tuple):
+            return tuple(cls.convert(item) for item in result)
+        if isinstance(result, dict):
+            return {key: cls.convert(value) for key, value in result.items()}
+        return result
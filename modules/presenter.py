@@ -0,0 +1,109 @@
+import pygame
+import settings
+from theme import Theme
+from memory_accounting import SurfaceMemory
+
+
+class Presenter:
+    """
+    Presents the fixed-size internal framebuffer on the active window or panel.
+    Uses integer nearest-neighbour scaling by default, or smooth scaling to fill
+    as much of the display as possible. The scaled target is a cached subsurface
+    of the window, recomputed only when the window size changes.
+
+    An 8-bit framebuffer (PALETTE_MODE) is coloured through its palette into
+    an RGB copy once per frame by lookup(), post effects draw on that copy.
+    lookup() also applies the Theme colour.
+    """
+
+    def __init__(self, framebuffer: pygame.Surface, smooth: bool = None):
+        self.framebuffer = framebuffer
+        # What gets scaled to the window, and what post effects draw on
+        self.output = framebuffer if framebuffer.get_bitsize() != 8 else pygame.Surface(framebuffer.get_size()).convert()
+        # The indexed framebuffer's pixels seen through the theme palette, the framebuffer keeps the ink
+        self.themed = framebuffer.subsurface(framebuffer.get_rect()) if self.output is not framebuffer else None
+        self.theme_colors = None
+        SurfaceMemory().track((framebuffer, self.output), "display")
+        self.smooth = settings.SMOOTH_SCALING if smooth is None else smooth
+        self.window = None
+        self.window_size = None
+        self.target = None
+        self.target_rect = None
+        self.scale = 1
+        self.integer_scale = True
+        self.layout()
+
+    @property
+    def direct(self) -> bool:
+        """Drawing happens straight on the window, nothing to scale."""
+        return self.output is self.window
+
+    def lookup(self) -> pygame.Surface:
+        """Colour the framebuffer in the theme colour into the output, returns the surface post effects draw on."""
+        theme = Theme()
+        if self.themed is None:
+            theme.recolor(self.output)
+            return self.output
+        if self.theme_colors is not theme.colors:
+            self.theme_colors = theme.colors
+            self.themed.set_palette(theme.colors)
+        self.output.blit(self.themed, (0, 0))
+        return self.output
+
+    def layout(self):
+        """Work out where and how big the framebuffer is drawn on the window."""
+        self.window = pygame.display.get_surface()
+        self.window_size = self.window.get_size()
+        if self.direct:
+            return
+
+        width, height = self.output.get_size()
+        fit = min(self.window_size[0] / width, self.window_size[1] / height)
+        # Displays smaller than the framebuffer can only be served with a fractional scale
+        self.integer_scale = not self.smooth and fit >= 1
+        self.scale = int(fit) if self.integer_scale else fit
+
+        size = (max(1, int(width * self.scale)), max(1, int(height * self.scale)))
+        self.target_rect = pygame.Rect((0, 0), size)
+        self.target_rect.center = self.window.get_rect().center
+        self.target = self.window.subsurface(self.target_rect)
+
+        # Clear the borders left around the framebuffer
+        self.window.fill(settings.BACKGROUND)
+
+    def to_window(self, rect: pygame.Rect) -> pygame.Rect:
+        """Map a framebuffer rect to window coordinates."""
+        return pygame.Rect(
+            self.target_rect.x + int(rect.x * self.scale),
+            self.target_rect.y + int(rect.y * self.scale),
+            int(rect.width * self.scale) + 1,
+            int(rect.height * self.scale) + 1,
+        ).clip(self.target_rect)
+
+    def present(self, rects: list = None):
+        """Push the framebuffer to the display, only the given framebuffer rects if any."""
+        if self.window is not pygame.display.get_surface() or self.window_size != self.window.get_size():
+            self.layout()
+            rects = None
+
+        if self.direct:
+            if rects is None:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+            return
+
+        if self.smooth:
+            # Fractional scales do not line up with rect edges, scale the whole frame
+            pygame.transform.smoothscale(self.output, self.target_rect.size, self.target)
+        elif rects is None or not self.integer_scale:
+            pygame.transform.scale(self.output, self.target_rect.size, self.target)
+        else:
+            for rect in rects:
+                scaled = pygame.Rect(rect.x * self.scale, rect.y * self.scale, rect.width * self.scale, rect.height * self.scale)
+                pygame.transform.scale(self.output.subsurface(rect), scaled.size, self.target.subsurface(scaled))
+
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update([self.to_window(rect) for rect in rects])
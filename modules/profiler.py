@@ -0,0 +1,126 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+import pygame
+import settings
+from dirty_rects import DirtyRects
+from text_cache import TextCache
+from theme import Theme
+
+
+class FrameProfiler:
+    """
+    Times the stages of every frame and keeps the results in fixed-size ring buffers.
+    Each stage records its total time per frame (0 if it did not run), so the
+    averages show how much of the frame budget a stage takes.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures every component reports into the same profiler."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._init()
+        return cls._instance
+
+    def _init(self):
+        self.history = settings.PROFILER_HISTORY
+        self.stages = {}  # Stage name -> deque of per-frame ms
+        self.frame_times = deque(maxlen=self.history)
+        self.current = {}  # Stage totals of the frame in progress
+        self.frame_start = None
+        self.visible = settings.SHOW_PROFILER
+        self.font = None
+        self.hud_rect = pygame.Rect(0, 0, 0, 0)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as part of the current frame."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.current[name] = self.current.get(name, 0.0) + elapsed
+
+    def begin_frame(self):
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        self.frame_times.append((time.perf_counter() - self.frame_start) * 1000)
+        for name in self.current:
+            if name not in self.stages:
+                self.stages[name] = deque(maxlen=self.history)
+        for name, samples in self.stages.items():
+            samples.append(self.current.get(name, 0.0))
+        self.frame_start = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        # The HUD is drawn over everything, so the hidden state needs a clean frame
+        DirtyRects().mark_full()
+
+    def averages(self) -> dict:
+        """Rolling average per stage in ms."""
+        return {name: sum(samples) / len(samples) for name, samples in self.stages.items() if samples}
+
+    def snapshot(self) -> dict:
+        """All current statistics, meant for logging."""
+        frames = list(self.frame_times)
+        return {
+            "frames": len(frames),
+            "frame_avg_ms": sum(frames) / len(frames) if frames else 0.0,
+            "frame_max_ms": max(frames) if frames else 0.0,
+            "frame_budget_ms": 1000 / settings.FPS,
+            "stages": {
+                name: {"avg_ms": sum(samples) / len(samples), "max_ms": max(samples)}
+                for name, samples in self.stages.items() if samples
+            },
+            "text_cache": TextCache().stats(),
+        }
+
+    def render(self, screen: pygame.Surface):
+        """Draw the HUD with rolling averages and a frame time graph."""
+        if not self.visible:
+            return
+        if self.font is None:
+            self.font = TextCache().font(settings.ROBOTO_CONDENSED_PATH, 9)
+
+        line_height = self.font.get_linesize()
+        averages = sorted(self.averages().items(), key=lambda stage: stage[1], reverse=True)
+        frames = list(self.frame_times)
+        frame_avg = sum(frames) / len(frames) if frames else 0.0
+        lines = [f"frame {frame_avg:5.2f} ms"] + [f"{name} {avg:5.2f}" for name, avg in averages]
+        lines.append(f"text hit {TextCache().hit_rate * 100:3.0f}%")
+
+        graph_height = 20
+        width = 110
+        height = line_height * len(lines) + graph_height + 6
+        # Drawn on the recoloured frame, so in the theme colour
+        theme = Theme()
+        hud = pygame.Surface((width, height))
+        hud.fill(settings.BACKGROUND)
+        hud.set_alpha(200)
+
+        for i, line in enumerate(lines):
+            text = self.font.render(line, True, theme.shade(settings.PIP_BOY_LIGHT))
+            hud.blit(text, (3, 2 + i * line_height))
+
+        # Frame time graph, full height is twice the frame budget
+        graph_top = height - graph_height - 2
+        budget = 1000 / settings.FPS
+        budget_y = graph_top + graph_height // 2
+        pygame.draw.line(hud, theme.shade(settings.PIP_BOY_DARK), (0, budget_y), (width, budget_y))
+        recent = frames[-(width - 6):]
+        for x, frame_time in enumerate(recent):
+            bar = min(graph_height, int(frame_time / (budget * 2) * graph_height))
+            colour = theme.shade(settings.PIP_BOY_LIGHT if frame_time <= budget else settings.PIP_BOY_MIDDLE)
+            pygame.draw.line(hud, colour, (3 + x, graph_top + graph_height), (3 + x, graph_top + graph_height - bar))
+
+        self.hud_rect = hud.get_rect(topleft=(0, 0))
+        screen.blit(hud, self.hud_rect)
+        DirtyRects().mark(self.hud_rect)
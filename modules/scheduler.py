@@ -0,0 +1,99 @@
+from threading import Lock
+from typing import Callable, Optional
+import pygame
+
+
+class ScheduledTask:
+    """A periodic or one-shot callback driven by the Scheduler."""
+
+    def __init__(self, callback: Callable[[], None], period_ms: float, repeat: bool, animating: bool):
+        self.callback = callback
+        self.period_ms = max(1, period_ms)
+        self.repeat = repeat
+        self.animating = animating  # Needs the full frame rate while active
+        self.remaining_ms = self.period_ms
+        self.active = True
+
+    def cancel(self):
+        self.active = False
+
+
+class Scheduler:
+    """
+    Single frame-clock scheduler driven from the main loop.
+    Components register periodic or one-shot tasks with a period in ms;
+    every tick advances all tasks by the real elapsed time of the frame.
+    """
+
+    # Upper bound of catch-up runs per tick, so a long stall does not spin a task
+    MAX_CATCH_UP = 10
+    # Posted when an animation starts, so an idle main loop wakes up instantly
+    WAKE_EVENT = pygame.event.custom_type()
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures only one clock drives all components."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.tasks = []
+            cls._instance.lock = Lock()
+            cls._instance.now_ms = 0
+        return cls._instance
+
+    def every(self, period_ms: float, callback: Callable[[], None], animating: bool = True) -> ScheduledTask:
+        """Run callback every period_ms."""
+        return self._add(ScheduledTask(callback, period_ms, repeat=True, animating=animating))
+
+    def after(self, delay_ms: float, callback: Callable[[], None], animating: bool = False) -> ScheduledTask:
+        """Run callback once after delay_ms."""
+        return self._add(ScheduledTask(callback, delay_ms, repeat=False, animating=animating))
+
+    def cancel(self, task: Optional[ScheduledTask]):
+        if task is not None:
+            task.cancel()
+
+    def _add(self, task: ScheduledTask) -> ScheduledTask:
+        with self.lock:
+            self.tasks.append(task)
+        if task.animating:
+            self.wake()
+        return task
+
+    def wake(self):
+        """Interrupt an idle wait of the main loop."""
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(self.WAKE_EVENT))
+
+    def is_animating(self) -> bool:
+        """True while any active task needs the full frame rate."""
+        with self.lock:
+            return any(task.active and task.animating for task in self.tasks)
+
+    def time_until_next(self) -> Optional[float]:
+        """Time in ms until the next task is due, None without tasks."""
+        with self.lock:
+            remaining = [task.remaining_ms for task in self.tasks if task.active]
+        return max(0, min(remaining)) if remaining else None
+
+    def tick(self, elapsed_ms: float):
+        """Advance the clock and run every task that became due."""
+        self.now_ms += elapsed_ms
+        with self.lock:
+            self.tasks = [task for task in self.tasks if task.active]
+            tasks = list(self.tasks)
+
+        for task in tasks:
+            if not task.active:
+                continue
+            task.remaining_ms -= elapsed_ms
+            runs = 0
+            while task.active and task.remaining_ms <= 0:
+                task.callback()
+                runs += 1
+                if not task.repeat:
+                    task.active = False
+                elif runs >= self.MAX_CATCH_UP:
+                    task.remaining_ms = task.period_ms
+                else:
+                    task.remaining_ms += task.period_ms
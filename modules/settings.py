@@ -33,6 +33,10 @@ RASPI =  False #True if platform.system() == 'Linux' else False
 SPEED = 1
 GAME_ACCURATE_MODE = True
 YEARS_ADDED = 263
+RASTER_CACHE = True # Keep rasterised and tinted images on disk, makes later boots much faster
+PRELOAD_WORKERS = 2 # Threads loading assets while the boot sequence plays
+ASSET_BUNDLE = True # Serve the raster cache from one memory-mapped file, baked again in the background when images or settings change
+TEXT_CACHE_BYTES = 2 * 1024 * 1024 # Rendered text kept in memory, least recently used is dropped first
 
 # ------------------
 # Screen Settings
@@ -40,12 +44,21 @@ YEARS_ADDED = 263
 SCREEN_WIDTH = 320
 SCREEN_HEIGHT = 255
 FPS = 24
+IDLE_FPS = 4 # Frame rate when nothing animates, input or a starting animation wakes it up instantly
+IDLE_TIMEOUT = 3000 # ms without input before dropping to IDLE_FPS
 FULLSCREEN = True if RASPI else False
+DISPLAY_WIDTH = SCREEN_WIDTH # Window size, the UI is always drawn at SCREEN_WIDTH x SCREEN_HEIGHT and scaled to fit
+DISPLAY_HEIGHT = SCREEN_HEIGHT # Fullscreen uses the native size of the display instead
+SMOOTH_SCALING = False # Smooth scaling to fill the display, otherwise integer nearest-neighbour scaling
 BACKGROUND = (0, 0, 0)
-PIP_BOY_LIGHT = (0, 255, 0)
+PIP_BOY_LIGHT = (0, 255, 0) # Ink every asset is drawn and cached in, the UI is shown in THEME_COLOR
 PIP_BOY_MIDDLE = (0, 190, 0)
 PIP_BOY_DARKER = (0, 127, 0)
 PIP_BOY_DARK = (0, 63, 0)
+DIRTY_RECT_UPDATES = True # Only push changed regions to the display when no full-screen effect is active
+PALETTE_MODE = False # Draw in 8-bit shades of PIP_BOY_LIGHT, coloured once per frame when presented, see palette.py
+THEME_COLORS = [PIP_BOY_LIGHT, (255, 191, 0), (0, 127, 255), (255, 255, 255)] # Cycled with T at runtime without reloading assets, see theme.py
+THEME_COLOR = PIP_BOY_LIGHT # Colour the UI is shown in, set it here, in configure.py or in DATA > SETTINGS rather than changing the PIP_BOY_* ink
 
 # ------------------
 # Audio Settings
@@ -54,17 +67,39 @@ SOUND_ON = True
 VOLUME = 1
 MUSIC_VOLUME = 1
 SWITCH_SOUND_CHANCE = 70
+SFX_CHANNELS = 6 # Mixer channels reserved for UI sounds, the lowest priority sound is cut off when all are busy
+SFX_CACHE_BYTES = 16 * 1024 * 1024 # Decoded UI sounds kept in memory, least recently played are dropped first
 
 # ------------------
 # Visual Effects
 # ------------------
 SHOW_CRT = True
+CRT_PRECOMPOSITED = True # Bake the static CRT layers into one blit per frame, False uses the original layer stack
+CRT_COMPOSITE_MAX_ERROR = 24 # Largest per-channel error, in 0-255 steps, benchmark.py --crt accepts from the baked layers, see Overlays.verify
 BLOOM_EFFECT = True
+BLOOM_QUALITY = "MEDIUM" # LOW, MEDIUM or HIGH
+BLOOM_THRESHOLD = 128 # Screen values below this do not glow
+BLOOM_INTENSITY = 0.6
 GLITCH_MOVE_CHANCE = 60
+TAB_TRANSITION_DURATION = 300 # ms the outgoing tab takes to blur and fade out, 0 disables it
 BOOT_SCREEN = True
 RANDOM_GLITCHES = True
 RANDOM_GLITCH_CHANCE = 0.5
 
+# ------------------
+# Profiler Settings
+# ------------------
+SHOW_PROFILER = False # Show the frame profiler HUD on start, toggle with P
+PROFILER_HISTORY = 120 # Frames kept in the profiler ring buffers
+SURFACE_MEMORY_BUDGETS = { # Bytes of surfaces per owner group before a warning is printed, print them all with M, see memory_accounting.py
+    "map": 64 * 1024 * 1024,
+    "crt": 48 * 1024 * 1024,
+    "special": 4 * 1024 * 1024,
+    "lists": 2 * 1024 * 1024,
+    "visualizer": 1024 * 1024,
+    "conditionboy": 512 * 1024,
+}
+
 # ------------------
 # Path Configuration
 # ------------------
@@ -113,7 +148,6 @@ DEFAULT_STATS_ARMOR = [
     IconConfig(STAT_TAB_RADIATION, 10)
 ]
 DEFAULT_SPECIAL_STATS = [2, 3, 2, 7, 3, 1, 0]
-SPECIAL_STATS_BONUS = [0, 0, 0, 0, 0, 0, 0]
 
 _inventory = Inventory()
 _inventory.add_item(items["10mmPistol"], 2)
@@ -132,21 +166,13 @@ _inventory.add_item(items['Mini Nuke'])
 
 
 
-for item in _inventory.get_all_items():
-    for i in range(7):
-        if "special_bonus" in item.__dict__:
-            SPECIAL_STATS_BONUS[i] += item.special_bonus[i]
+# Bonuses of every item carried at start, Inventory().special_bonuses has the current totals
+SPECIAL_STATS_BONUS = [_inventory.special_bonuses.get(stat, 0) for stat in ("STR", "PER", "END", "CHA", "INT", "AGI", "LCK")]
 
 MAX_WEIGHT = 200 + (DEFAULT_SPECIAL_STATS[0] * 10)
 CAPS = 1000
 
-TOTAL_AMMO = {}
-for item in _inventory.get_all_items():
-    if item.category == 'Ammo':
-        if item.name in TOTAL_AMMO:
-            TOTAL_AMMO[item.name] += 1
-        else:
-            TOTAL_AMMO[item.name] = 1
+TOTAL_AMMO = _inventory.ammo # Rounds per ammo type, kept up to date by the inventory
             
 # ------------------
 # Stat Tab Settings
@@ -191,6 +217,7 @@ GRID_BOTTOM_MARGIN = 0
 GRID_RIGHT_MARGIN = 35
 GRID_LEFT_MARGIN = 5
 TURNTABLE_LEFT_MARGIN = 15
+TURNTABLE_CACHE_BYTES = 16 * 1024 * 1024 # Memory budget for cached item turntable frames
 
 # ------------------
 # Radio Tab Settings
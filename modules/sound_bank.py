@@ -0,0 +1,164 @@
+import os
+import random
+import time
+from collections import OrderedDict
+from threading import Lock
+import pygame
+import settings
+
+
+class SoundBank:
+    """
+    Decoded UI sound effects, played through a pool of reserved mixer channels.
+
+    Sounds are decoded once and kept in memory up to SFX_CACHE_BYTES, the least
+    recently played are dropped past that and decoded again when needed. Folders
+    of random variants are indexed once. Each play has a priority: when every
+    channel is busy, the oldest sound of the lowest priority is cut off, unless
+    all of them outrank the new one, which is then dropped.
+    """
+
+    LOW = 0  # Random variety, e.g. static bursts
+    NORMAL = 1  # Direct feedback to input
+    HIGH = 2  # Boot sequence and the background hum
+
+    EXTENSIONS = (".ogg", ".wav")
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures every caller shares the decoded sounds and the channel pool."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.sounds = OrderedDict()  # Path to decoded sound, least recently played first
+            cls._instance.sizes = {}
+            cls._instance.used_bytes = 0
+            cls._instance.budget = settings.SFX_CACHE_BYTES
+            cls._instance.groups = {}  # Folder to the paths of its variants
+            cls._instance.channels = []
+            cls._instance.voices = []  # Per channel: (priority, start time, voice name)
+            cls._instance.lock = Lock()
+        return cls._instance
+
+    def load(self, sources: list = settings.UI_SFX):
+        """Decode every sound file and folder in sources, called by a preload job."""
+        if not pygame.mixer.get_init():
+            return
+        for source in sources:
+            paths = self.variants(source) if os.path.isdir(source) else [source]
+            for path in paths:
+                self.get(path)
+
+    def variants(self, folder: str) -> list:
+        """Paths of the sound files in folder, listed once."""
+        paths = self.groups.get(folder)
+        if paths is None:
+            try:
+                paths = [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.endswith(self.EXTENSIONS)]
+            except FileNotFoundError:
+                print(f"Sound folder not found: {folder}")
+                paths = []
+            self.groups[folder] = paths
+        return paths
+
+    def get(self, path: str):
+        """The decoded sound for path, None if it could not be loaded."""
+        with self.lock:
+            sound = self.sounds.get(path)
+            if sound is not None:
+                self.sounds.move_to_end(path)
+                return sound
+
+        # Decode outside the lock so playing cached sounds never waits on the disk
+        try:
+            sound = pygame.mixer.Sound(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Could not load sound {path}: {e}")
+            return None
+
+        with self.lock:
+            if path not in self.sounds:
+                self.sounds[path] = sound
+                self.sizes[path] = self._byte_size(sound)
+                self.used_bytes += self.sizes[path]
+                self._evict()
+            return self.sounds[path]
+
+    @staticmethod
+    def _byte_size(sound) -> int:
+        frequency, sample_format, channels = pygame.mixer.get_init()
+        return int(sound.get_length() * frequency) * abs(sample_format) // 8 * channels
+
+    def _evict(self):
+        # The newest sound always stays, even if it alone is over budget
+        while self.used_bytes > self.budget and len(self.sounds) > 1:
+            path, _ = self.sounds.popitem(last=False)
+            self.used_bytes -= self.sizes.pop(path)
+
+    def _init_channels(self):
+        count = settings.SFX_CHANNELS
+        if pygame.mixer.get_num_channels() < count:
+            pygame.mixer.set_num_channels(count)
+        # Reserved channels are never picked by Sound.play, only this pool uses them
+        pygame.mixer.set_reserved(count)
+        self.channels = [pygame.mixer.Channel(i) for i in range(count)]
+        self.voices = [None] * count
+
+    def _pick_channel(self, priority: int, voice: str):
+        """Index of the channel to play on, None when every channel plays something more important."""
+        if voice is not None:
+            for i, playing in enumerate(self.voices):
+                if playing and playing[2] == voice and self.channels[i].get_busy():
+                    return i
+
+        victim = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+            playing = self.voices[i]
+            if playing is None:
+                # Started outside the pool, treat it as the least important
+                return i
+            if victim is None or playing[:2] < self.voices[victim][:2]:
+                victim = i
+        if victim is not None and self.voices[victim][0] <= priority:
+            return victim
+        return None
+
+    def play(self, path: str, volume: float = settings.VOLUME, priority: int = NORMAL, loops: int = 0, voice: str = None):
+        """
+        Play a sound file, returns the channel or None if it was dropped.
+        A voice name makes the sound replace whatever still plays under the same name.
+        """
+        if not pygame.mixer.get_init():
+            return None
+        sound = self.get(path)
+        if sound is None:
+            return None
+
+        with self.lock:
+            if not self.channels:
+                self._init_channels()
+            index = self._pick_channel(priority, voice)
+            if index is None:
+                return None
+            channel = self.channels[index]
+            channel.stop()
+            channel.play(sound, loops)
+            channel.set_volume(volume)
+            self.voices[index] = (priority, time.perf_counter(), voice)
+            return channel
+
+    def play_random(self, folder: str, volume: float = settings.VOLUME, priority: int = LOW):
+        """Play a random variant from folder."""
+        paths = self.variants(folder)
+        if paths:
+            return self.play(random.choice(paths), volume, priority)
+        return None
+
+    def clear(self):
+        """Drop every decoded sound, they are loaded again when played."""
+        with self.lock:
+            self.sounds.clear()
+            self.sizes.clear()
+            self.used_bytes = 0
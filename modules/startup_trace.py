@@ -0,0 +1,178 @@
+import os
+import sys
+import json
+import time
+import builtins
+import functools
+import threading
+from contextlib import contextmanager
+
+# Imported before anything else in main.py, so this module must not import settings or pygame
+
+
+class StartupTrace:
+    """
+    Opt-in startup timeline. Records nested wall-clock spans for imports,
+    initialisation steps and asset loads, per thread, and writes them as a
+    JSON timeline plus a text summary sorted by cost.
+
+    Enable with `main.py --trace-startup [path]` or PIPBOY_TRACE_STARTUP=path.
+    """
+
+    ENV_VAR = "PIPBOY_TRACE_STARTUP"
+    FLAG = "--trace-startup"
+    DEFAULT_PATH = "../startup_trace"
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures every instrumented call records into the same timeline."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.enabled = False
+            cls._instance.path = cls.DEFAULT_PATH
+            cls._instance.origin = time.perf_counter()
+            cls._instance.spans = []  # Root spans of every thread
+            cls._instance.lock = threading.Lock()
+            cls._instance.local = threading.local()
+            cls._instance.original_import = None
+        return cls._instance
+
+    def configure(self, argv: list):
+        """Enable tracing from the command line flag or the environment variable."""
+        path = os.environ.get(self.ENV_VAR)
+        if self.FLAG in argv:
+            index = argv.index(self.FLAG)
+            argv.pop(index)
+            # Optional output path after the flag
+            path = argv.pop(index) if index < len(argv) and not argv[index].startswith("-") else ""
+        if path is not None:
+            self.enable(path if path and path != "1" else self.DEFAULT_PATH)
+
+    def enable(self, path: str = None):
+        """Start recording, output goes to path.json and path.txt."""
+        self.enabled = True
+        self.path = os.path.splitext(path)[0] if path else self.DEFAULT_PATH
+        self.origin = time.perf_counter()
+        if self.original_import is None:
+            self.original_import = builtins.__import__
+            builtins.__import__ = self._traced_import
+
+    def _traced_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only first imports cost anything, later ones are a dictionary lookup
+        if level == 0 and name in sys.modules:
+            return self.original_import(name, globals, locals, fromlist, level)
+        label = name
+        if level:
+            # Relative import, name it after the package it resolves to
+            package = (globals or {}).get("__package__") or ""
+            base = package.rsplit(".", level - 1)[0] if level > 1 else package
+            label = f"{base}.{name or ','.join(fromlist or ())}"
+        with self.span(f"import {label}", kind="import"):
+            return self.original_import(name, globals, locals, fromlist, level)
+
+    @contextmanager
+    def span(self, name: str, **info):
+        """Record the enclosed block, nested under the span that is open on this thread."""
+        if not self.enabled:
+            yield info
+            return
+
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        span = {
+            "name": name,
+            "thread": threading.current_thread().name,
+            "start_ms": (time.perf_counter() - self.origin) * 1000,
+            "duration_ms": None,
+            "info": info,
+            "children": [],
+        }
+        if stack:
+            stack[-1]["children"].append(span)
+        else:
+            with self.lock:
+                self.spans.append(span)
+        stack.append(span)
+        try:
+            yield info
+        finally:
+            stack.pop()
+            span["duration_ms"] = (time.perf_counter() - self.origin) * 1000 - span["start_ms"]
+
+    def finish(self):
+        """Stop recording and write the timeline, called once the Pip-Boy is interactive."""
+        if not self.enabled:
+            return
+        self.enabled = False
+        if self.original_import is not None:
+            builtins.__import__ = self.original_import
+            self.original_import = None
+
+        total_ms = (time.perf_counter() - self.origin) * 1000
+        with self.lock:
+            spans = sorted(self.spans, key=lambda span: span["start_ms"])
+        try:
+            with open(f"{self.path}.json", "w") as f:
+                json.dump({"total_ms": total_ms, "spans": spans}, f, indent=1, default=str)
+            with open(f"{self.path}.txt", "w") as f:
+                f.write(self.summary(spans, total_ms))
+            print(f"Startup trace written to {self.path}.json and {self.path}.txt")
+        except OSError as e:
+            print(f"Could not write startup trace: {e}")
+
+    @staticmethod
+    def summary(spans: list, total_ms: float) -> str:
+        """Text summary: spans grouped by name, sorted by total time."""
+        groups = {}
+
+        def visit(span):
+            # Unfinished spans (e.g. background loads still running) count up to now
+            duration = span["duration_ms"] if span["duration_ms"] is not None else total_ms - span["start_ms"]
+            child_time = sum(child["duration_ms"] or 0 for child in span["children"])
+            group = groups.setdefault(span["name"], {"calls": 0, "total": 0.0, "self": 0.0, "assets": 0})
+            group["calls"] += 1
+            group["total"] += duration
+            group["self"] += max(0.0, duration - child_time)
+            group["assets"] += span["info"].get("assets", 0)
+            for child in span["children"]:
+                visit(child)
+
+        for span in spans:
+            visit(span)
+
+        lines = [f"Startup trace, {total_ms:.0f} ms until interactive", ""]
+        lines.append(f"{'total ms':>10} {'self ms':>10} {'calls':>6} {'assets':>7}  name")
+        for name, group in sorted(groups.items(), key=lambda item: item[1]["total"], reverse=True):
+            lines.append(f"{group['total']:10.1f} {group['self']:10.1f} {group['calls']:6d} {group['assets']:7d}  {name}")
+        return "\n".join(lines) + "\n"
+
+
+def count_assets(result) -> int:
+    """Number of images in a loader result: a surface, a list, atlas or dict of them, or (images, transforms)."""
+    if result is None:
+        return 0
+    if isinstance(result, tuple):
+        return count_assets(result[0]) if result else 0
+    if hasattr(result, "__len__") and not hasattr(result, "get_size"):
+        return len(result)
+    return 1
+
+
+def traced(name: str, count=None):
+    """Record every call of the decorated function as a span, with the asset count if count is given."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            trace = StartupTrace()
+            if not trace.enabled:
+                return function(*args, **kwargs)
+            paths = [arg for arg in args if isinstance(arg, str)]
+            with trace.span(name, **({"path": paths[0]} if paths else {})) as info:
+                result = function(*args, **kwargs)
+                if count:
+                    info["assets"] = count(result)
+                return result
+        return wrapper
+    return decorator
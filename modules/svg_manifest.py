@@ -0,0 +1,167 @@
+import os
+import re
+import json
+import xml.etree.ElementTree as ET
+from threading import Lock
+import settings
+
+
+class SvgManifest:
+    """
+    Index of SVG metadata: viewBox size and the first non-zero translate or
+    matrix transform of every file under SVG_BASE_FOLDER, so the loaders can
+    size and place SVGs without parsing the XML.
+
+    The index is stored as JSON next to the raster cache. On first use the
+    tree is walked once, only files whose mtime or size changed are parsed
+    again, and the index is rewritten if anything changed. Files outside the
+    tree are parsed on demand and not stored.
+
+    Run this module to rebuild the index from scratch.
+    """
+
+    VERSION = 1  # Bump when the parsing below changes
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures the index is read and validated once per run."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.root = os.path.abspath(settings.SVG_BASE_FOLDER)
+            cls._instance.path = settings.SVG_MANIFEST
+            cls._instance.entries = None  # Relative path -> [mtime_ns, size, width, height, tx, ty]
+            # The loaders run on the preload workers
+            cls._instance.lock = Lock()
+        return cls._instance
+
+    def get(self, path: str) -> tuple:
+        """(width, height, tx, ty) of an SVG."""
+        with self.lock:
+            if self.entries is None:
+                self.entries = self._refresh(self._read())
+            key = os.path.relpath(os.path.abspath(path), self.root)
+            entry = self.entries.get(key)
+        if entry is not None:
+            return tuple(entry[2:])
+        return self.parse(path)
+
+    def dimensions(self, path: str) -> tuple:
+        """(width, height) from the viewBox, or the width/height attributes."""
+        return self.get(path)[:2]
+
+    def transform(self, path: str) -> tuple:
+        """(tx, ty) of the first non-zero transform."""
+        return self.get(path)[2:]
+
+    def rebuild(self):
+        """Parse every SVG again and rewrite the index."""
+        with self.lock:
+            self.entries = self._refresh({})
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != self.VERSION:
+            return {}
+        return manifest.get("files", {})
+
+    def _refresh(self, entries: dict) -> dict:
+        """Walk the tree, reparse new and modified files, write the index if it changed."""
+        refreshed = {}
+        changed = False
+        for folder, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if not filename.endswith(".svg"):
+                    continue
+                path = os.path.join(folder, filename)
+                key = os.path.relpath(path, self.root)
+                stat = os.stat(path)
+                entry = entries.get(key)
+                if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+                    entry = [stat.st_mtime_ns, stat.st_size, *self.parse(path)]
+                    changed = True
+                refreshed[key] = entry
+
+        if changed or len(refreshed) != len(entries):
+            self._write(refreshed)
+        return refreshed
+
+    def _write(self, entries: dict):
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(temp_path, "w") as f:
+                json.dump({"version": self.VERSION, "files": entries}, f, separators=(",", ":"))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Could not write SVG manifest {self.path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @classmethod
+    def parse(cls, path: str) -> tuple:
+        """Read (width, height, tx, ty) from the SVG itself, zeros if it cannot be parsed."""
+        try:
+            root = ET.parse(path).getroot()
+        except (ET.ParseError, OSError):
+            return 0.0, 0.0, 0.0, 0.0
+        return (*cls._dimensions(root), *cls._transform(root))
+
+    @staticmethod
+    def _dimensions(root) -> tuple:
+        """Width/height from viewBox (preferred) or width/height attributes."""
+        try:
+            viewbox = root.get('viewBox')
+            if viewbox:
+                parts = viewbox.strip().split()
+                if len(parts) >= 4:
+                    # Clean non-numeric characters
+                    vb_width = re.sub(r'[^\d.]', '', parts[2]) or '0'
+                    vb_height = re.sub(r'[^\d.]', '', parts[3]) or '0'
+                    return float(vb_width), float(vb_height)
+            # Fallback to width/height attributes
+            width = re.sub(r'[^\d.]', '', root.get('width', '0'))
+            height = re.sub(r'[^\d.]', '', root.get('height', '0'))
+            return float(width or 0), float(height or 0)
+        except ValueError:
+            return 0.0, 0.0
+
+    @classmethod
+    def _transform(cls, root) -> tuple:
+        """tx/ty of the root transform, or of the first element with a non-zero one."""
+        try:
+            tx, ty = cls._parse_transform(root.get('transform', ''))
+            # Search children if root has no transform
+            if tx == 0 and ty == 0:
+                for elem in root.iter():
+                    if elem is root:
+                        continue
+                    elem_tx, elem_ty = cls._parse_transform(elem.get('transform', ''))
+                    if elem_tx != 0 or elem_ty != 0:
+                        return elem_tx, elem_ty
+            return tx, ty
+        except ValueError:
+            return 0.0, 0.0
+
+    @staticmethod
+    def _parse_transform(transform_str: str) -> tuple:
+        """Extract tx and ty from a transform string."""
+        if not transform_str:
+            return 0.0, 0.0
+        translate_match = re.match(r'translate\(\s*([-\d.]+)(?:\s*,\s*|\s+)([-\d.]+)\s*\)', transform_str)
+        if translate_match:
+            return float(translate_match.group(1)), float(translate_match.group(2))
+        matrix_match = re.match(r'matrix\(\s*([-\d.]+)[,\s]+([-\d.]+)[,\s]+([-\d.]+)[,\s]+([-\d.]+)[,\s]+([-\d.]+)[,\s]+([-\d.]+)\s*\)', transform_str)
+        if matrix_match:
+            return float(matrix_match.group(5)), float(matrix_match.group(6))
+        return 0.0, 0.0
+
+
+if __name__ == "__main__":
+    manifest = SvgManifest()
+    manifest.rebuild()
+    print(f"Indexed {len(manifest.entries)} SVGs into {manifest.path}")
@@ -2,7 +2,9 @@ import datetime
 import os
 import pygame
 import settings
-from threading import Thread
+from dirty_rects import DirtyRects
+from text_cache import TextCache
+from palette import Palette
 from typing import Callable, Dict, Optional
 
 class ThreadHandler:
@@ -11,18 +13,23 @@ class ThreadHandler:
     associated thread functions, as well as tracking the current and previous
     tab indices. When the tab index is updated, the previous index is stored
     internally, and you can start threads for both tabs accordingly.
+    The handlers run on the main thread, slow work has to be handed off by the tab itself.
     """
-    def __init__(self, tab_map: Dict[int, Callable[[bool], None]], initial_tab_index: Optional[int] = None):
+    def __init__(self, tab_map: Dict[int, Callable[[bool], None]], initial_tab_index: Optional[int] = None, start_current: bool = True):
         """
         :param tab_map: A dictionary mapping tab indices to a callable
                         that takes a boolean flag.
         :param initial_tab_index: Optionally, set an initial current tab index.
+        :param start_current: Start the current tab right away. Sub tab handlers
+                              wait until their parent tab is shown.
         """
         self.tab_map = tab_map
         self.current_tab_index = initial_tab_index
         self.previous_tab_index = None
+        self.active = start_current
         
-        self.handle_current_tab()
+        if self.active:
+            self.handle_current_tab()
 
     def update_tab_index(self, new_index: int):
         """
@@ -33,10 +40,20 @@ class ThreadHandler:
         self.previous_tab_index = self.current_tab_index
         self.current_tab_index = new_index
 
-        if self.current_tab_index != self.previous_tab_index:
+        if self.active and self.current_tab_index != self.previous_tab_index:
             self.handle_current_tab()
             self.handle_previous_tab()        
 
+    def set_active(self, active: bool):
+        """
+        Start or stop the current tab, used when the parent tab is shown or hidden.
+        
+        :param active: Whether the parent tab is shown.
+        """
+        if active != self.active:
+            self.active = active
+            self._start_thread(self.current_tab_index, active)
+
     def _start_thread(self, tab_index: int, flag: bool) -> None:
         """
         Internal method to start a thread for the tab associated with tab_index.
@@ -49,7 +66,7 @@ class ThreadHandler:
         if tab:
             func = getattr(tab, f"handle_threads", None)  # Get the start or stop method dynamically
             if func and callable(func):
-                Thread(target=func, args=(flag,)).start()            
+                func(flag)
 
     def handle_current_tab(self) -> None:
         """
@@ -69,7 +86,7 @@ class ThreadHandler:
 
 class Tab:
     def __init__(self, screen):
-            self.footer_font = pygame.font.Font(settings.ROBOTO_CONDENSED_BOLD_PATH, 12)
+            self.footer_font = TextCache().font(settings.ROBOTO_CONDENSED_BOLD_PATH, 12)
             self.screen = screen
             
             now = datetime.datetime.now()
@@ -104,8 +121,8 @@ class Tab:
             )
             
             
-        # Store the surface in the dictionary
-        self.tab_footers[key] = footer_surface
+        # Store the surface in the dictionary, indexed in palette mode so it is drawn as a byte copy
+        self.tab_footers[key] = Palette().indexed(footer_surface, rle=False)
         
         
     # Update footer and only the part of the footer that needs to be updated    
@@ -118,6 +135,7 @@ class Tab:
             text_surface,
             (destination)
         )
+        DirtyRects().mark((0, settings.SCREEN_HEIGHT - settings.BOTTOM_BAR_HEIGHT, settings.SCREEN_WIDTH, settings.BOTTOM_BAR_HEIGHT))
 
         
     def render_footer(self, object):
@@ -1,21 +1,29 @@
-import os
 import settings
 import pygame
 import random
 import math
-from threading import Thread, Lock
 from util_functs import Utils
+from text_cache import TextCache
+from palette import Palette
 from tabs.radio_tab.radio_tab import RadioTab
 from tabs.stat_tab.stat_tab import StatTab
 from tabs.inv_tab.inv_tab import InvTab
 from tabs.data_tab.data_tab import DataTab
 from tabs.map_tab.map_tab import MapTab
 from tab import Tab, ThreadHandler
+from dirty_rects import DirtyRects
+from scheduler import Scheduler
+from profiler import FrameProfiler
+from transition import TabTransition
+from startup_trace import StartupTrace
+from memory_accounting import SurfaceMemory
+from sound_bank import SoundBank
 
 class TabManager:
-    def __init__(self, screen):
+    def __init__(self, screen, effects_screen=None):
+        """effects_screen is the RGB surface the tab transition draws on, the screen itself unless it is indexed."""
         self.screen = screen
-        self.main_tab_font = pygame.font.Font(settings.MAIN_FONT_PATH, 14)
+        self.main_tab_font = TextCache().font(settings.MAIN_FONT_PATH, 14)
         self.tab_font_height = self.main_tab_font.get_height()
         self.tabs = settings.TABS
         self.current_tab_index = 0
@@ -25,9 +33,12 @@ class TabManager:
         self.previous_sub_tab_index = [0] * len(self.tabs)
 
         self.tab_x_offset = []
-        self.glitch_thread = None
-        self.render_blur = False
-        self.switch_lock = Lock()
+        self.glitch_task = None
+        self.glitch_steps = 0
+        self.glitch_offset = 0
+        self.transition = TabTransition(effects_screen or self.screen)
+        self.dirty_rects = DirtyRects()
+        self.profiler = FrameProfiler()
 
         # Pre-render header elements
         self.subtab_bar_surfaces = {}
@@ -45,12 +56,39 @@ class TabManager:
                             settings.BOTTOM_BAR_HEIGHT + settings.BOTTOM_BAR_MARGIN)
         self.map_draw_space = pygame.Rect(settings.MAP_EDGES_OFFSET, map_draw_space[0], settings.SCREEN_WIDTH - settings.MAP_EDGES_OFFSET * 2, settings.SCREEN_HEIGHT - map_draw_space[1] - map_draw_space[0])
         
-        self.tab_base = Tab(self.screen)
-        self.radio_tab = RadioTab(self.screen, self.tab_base, self.draw_space)
-        self.stat_tab = StatTab(self.screen, self.tab_base, self.draw_space)
-        self.inv_tab = InvTab(self.screen, self.tab_base, self.draw_space)
-        self.data_tab = DataTab(self.screen, self.tab_base, self.draw_space)
-        self.map_tab = MapTab(self.screen, self.tab_base, self.map_draw_space)
+        # Everything below the header: tab content and footer
+        content_top = self.tab_font_height + settings.TAB_SCREEN_EDGE_LENGTH
+        self.content_rect = pygame.Rect(0, content_top, settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT - content_top)
+
+        # Pre-render subtab elements
+        self.init_subtab_data()
+
+        self.ready = False
+
+    def preload(self, preloader) -> list:
+        """Declare the asset jobs of every tab, returns their names."""
+        return (RadioTab.preload(preloader)
+                + StatTab.preload(preloader, self.draw_space)
+                + InvTab.preload(preloader)
+                + DataTab.preload(preloader)
+                + MapTab.preload(preloader, self.map_draw_space))
+
+    def build_tabs(self):
+        """Create the tabs, call once their preload jobs are done."""
+        trace = StartupTrace()
+        memory = SurfaceMemory()
+        with memory.owner("chrome"):
+            self.tab_base = Tab(self.screen)
+        with trace.span("RadioTab"), memory.owner("radio"):
+            self.radio_tab = RadioTab(self.screen, self.tab_base, self.draw_space)
+        with trace.span("StatTab"), memory.owner("stat"):
+            self.stat_tab = StatTab(self.screen, self.tab_base, self.draw_space)
+        with trace.span("InvTab"), memory.owner("inv"):
+            self.inv_tab = InvTab(self.screen, self.tab_base, self.draw_space)
+        with trace.span("DataTab"), memory.owner("data"):
+            self.data_tab = DataTab(self.screen, self.tab_base, self.draw_space)
+        with trace.span("MapTab"), memory.owner("map"):
+            self.map_tab = MapTab(self.screen, self.tab_base, self.map_draw_space)
         
         tab_map = {
             0: self.stat_tab,
@@ -60,28 +98,25 @@ class TabManager:
             4: self.radio_tab,
         }
 
-        # Pre-render subtab elements
-        self.init_subtab_data()
-        
         self.tab_thread_handler = ThreadHandler(tab_map, self.current_tab_index)
+        self.ready = True
                 
             
     def switch_tab_sound(self):
         if settings.SOUND_ON:
             if self.current_tab_index > self.previous_tab_index:
-                Utils.play_sfx(os.path.join(settings.ROTARY_VERTICAL_1), settings.VOLUME / 5)
+                Utils.play_sfx(settings.ROTARY_VERTICAL_1, settings.VOLUME / 5)
             else:
-                Utils.play_sfx(os.path.join(settings.ROTARY_VERTICAL_2), settings.VOLUME / 5)
+                Utils.play_sfx(settings.ROTARY_VERTICAL_2, settings.VOLUME / 5)
             if random.randrange(100) < settings.SWITCH_SOUND_CHANCE:
-                sound = random.choice(os.listdir(settings.BUZZ_SOUND_BASE_FOLDER))      
-                Utils.play_sfx(os.path.join(settings.BUZZ_SOUND_BASE_FOLDER, sound), settings.VOLUME / 3)       
+                SoundBank().play_random(settings.BUZZ_SOUND_BASE_FOLDER, settings.VOLUME / 3)
                 
     def switch_sub_tab_sound(self):
         if settings.SOUND_ON:
             if self.current_sub_tab_index > self.previous_sub_tab_index:
-                Utils.play_sfx(os.path.join(settings.ROTARY_HORIZONTAL_1), settings.VOLUME / 5)
+                Utils.play_sfx(settings.ROTARY_HORIZONTAL_1, settings.VOLUME / 5)
             else:
-                Utils.play_sfx(os.path.join(settings.ROTARY_HORIZONTAL_2), settings.VOLUME / 5)
+                Utils.play_sfx(settings.ROTARY_HORIZONTAL_2, settings.VOLUME / 5)
 
     def init_header_surfaces(self):
         """Pre-render static header elements and tab highlights"""
@@ -108,6 +143,7 @@ class TabManager:
         pygame.draw.line(self.header_background, settings.PIP_BOY_LIGHT,
                         (settings.SCREEN_WIDTH-1, self.tab_font_height + settings.TAB_SCREEN_EDGE_LENGTH), 
                         (settings.SCREEN_WIDTH-1, self.tab_font_height ), 1)
+        self.header_background = Palette().indexed(self.header_background)
         
         # Create tab highlight surfaces
         for i, tab in enumerate(self.tabs):
@@ -131,7 +167,7 @@ class TabManager:
             pygame.draw.line(surface, settings.PIP_BOY_LIGHT,
                             (x_end, self.tab_font_height - settings.TAB_VERTICAL_LINE_OFFSET),
                             (x_end - settings.TAB_SCREEN_EDGE_LENGTH, self.tab_font_height - settings.TAB_VERTICAL_LINE_OFFSET), 1)
-            self.tab_highlight_surfaces.append(surface)
+            self.tab_highlight_surfaces.append(Palette().indexed(surface))
 
     def init_subtab_data(self):
         """Pre-render all possible subtab states"""
@@ -175,7 +211,7 @@ class TabManager:
                     surface.blit(text_surf, (current_x, settings.SUBTAB_VERTICAL_OFFSET))
                     current_x += text_surf.get_width() + settings.SUBTAB_SPACING
 
-                self.subtab_bar_surfaces[tab_name].append(surface)
+                self.subtab_bar_surfaces[tab_name].append(Palette().indexed(surface))
                 
                 
     def init_tab_text(self):
@@ -189,33 +225,35 @@ class TabManager:
             self.tab_x_offset.append((self.main_tab_font.size(tab)[0] + tab_spacing) + self.tab_x_offset[i])
 
     def tab_switch_glitch(self):
-        for _ in range(20):
-            time = pygame.time.get_ticks()
-            jump_offset = int(20 * math.sin(time))
-            self.screen.blit(self.screen, (0, -jump_offset))
-            pygame.time.wait(settings.SPEED * 100)
+        """Scheduler task picking the next vertical jump of the glitch."""
+        if self.glitch_steps <= 0:
+            self.glitch_offset = 0
+            Scheduler().cancel(self.glitch_task)
+            self.dirty_rects.mark_full()
+            return
+        self.glitch_steps -= 1
+        time = pygame.time.get_ticks()
+        self.glitch_offset = int(20 * math.sin(time))
+        self.dirty_rects.mark_full()
+
+    def apply_switch_glitch(self):
+        self.screen.blit(self.screen, (0, -self.glitch_offset))
+        self.dirty_rects.mark_full()
 
-    def tab_blur(self):
-        screen_copy = self.screen.copy()
-        for i in range(1, 18, 6):
-            blur = pygame.transform.box_blur(screen_copy, i)
-            blur.set_alpha(180)
-            self.screen.blit(blur, (0, 0), special_flags=pygame.BLEND_ADD)        
-            self.render_blur = False     
-  
     def switch_tab(self, direction: bool):
-        with self.switch_lock:
-            # Switch tab index
-            self.previous_tab_index = self.current_tab_index
-            self.current_tab_index = max(0, min((self.current_tab_index + (1 if direction else -1)) % len(self.tabs), len(self.tabs) - 1))
+        # Switch tab index
+        self.previous_tab_index = self.current_tab_index
+        self.current_tab_index = max(0, min((self.current_tab_index + (1 if direction else -1)) % len(self.tabs), len(self.tabs) - 1))
         
-        if random.randrange(100) < settings.GLITCH_MOVE_CHANCE and (self.glitch_thread == None or not self.glitch_thread.is_alive()):
-            self.glitch_thread = Thread(target=self.tab_switch_glitch, args=())            
-            self.glitch_thread.start()
+        if random.randrange(100) < settings.GLITCH_MOVE_CHANCE and (self.glitch_task is None or not self.glitch_task.active):
+            self.glitch_steps = 20
+            self.tab_switch_glitch()
+            self.glitch_task = Scheduler().every(settings.SPEED * 100, self.tab_switch_glitch)
         else:
-            self.render_blur = True
+            self.transition.start()
         
         self.tab_thread_handler.update_tab_index(self.current_tab_index)
+        self.dirty_rects.mark_full()
         self.switch_tab_sound()
 
 
@@ -232,6 +270,7 @@ class TabManager:
         self.current_sub_tab_index[current_main_index] = new_index
         
         if new_index != current_sub_index:
+            self.dirty_rects.mark_full()
             self.switch_sub_tab_sound()
             match self.current_tab_index:
                 case 0: # STAT
@@ -248,6 +287,7 @@ class TabManager:
                     pass
                 
     def scroll_tab(self, direction: bool):
+        self.dirty_rects.mark(self.content_rect)
         match self.current_tab_index:
             case 0: # STAT
                 self.stat_tab.scroll(direction)
@@ -263,6 +303,7 @@ class TabManager:
                 pass
 
     def select_item(self):
+        self.dirty_rects.mark(self.content_rect)
         match self.current_tab_index:
             case 0: # STAT
                 pass
@@ -279,6 +320,7 @@ class TabManager:
             
             
     def navigate(self, direction: int):
+        self.dirty_rects.mark(self.content_rect)
         match self.current_tab_index:
             case 0: # STAT
                 pass
@@ -354,16 +396,33 @@ class TabManager:
                 (x + random.randint(-2, 2), y + random.randint(-2, 2)),
                 1
             )
+        self.dirty_rects.mark_full()
+
+    def begin_frame(self):
+        """Called before the screen is cleared for the next frame."""
+        if self.transition.pending:
+            with self.profiler.stage("tab_transition"):
+                self.transition.capture()
 
     def render(self):
-        self.render_header()
-        self.render_sub_tabs()
-        self.render_tab()  
-                    
-        if self.render_blur:
-            self.tab_blur()
-            self.render_blur = False
+        with self.profiler.stage("render_header"):
+            self.render_header()
+        with self.profiler.stage("render_sub_tabs"):
+            self.render_sub_tabs()
+        with self.profiler.stage(f"render_tab:{self.tabs[self.current_tab_index]}"):
+            self.render_tab()  
+
+        if self.glitch_offset:
+            with self.profiler.stage("tab_switch_glitch"):
+                self.apply_switch_glitch()
 
         # Occasionally apply a CRT glitch effect (roughly 0.5% chance per frame)
         if settings.RANDOM_GLITCHES and random.random() < settings.RANDOM_GLITCH_CHANCE / 100:
-            self.crt_glitch_effect()
+            with self.profiler.stage("crt_glitch_effect"):
+                self.crt_glitch_effect()
+
+    def render_transition(self):
+        """Draw the tab transition, called once the frame is on the effects screen."""
+        if self.transition.active:
+            with self.profiler.stage("tab_transition"):
+                self.transition.render()
@@ -8,6 +8,12 @@ import settings
 
 
 class DataTab:
+    @staticmethod
+    def preload(preloader) -> list:
+        """Declare the asset jobs of the data tab, returns their names."""
+        preloader.add("data_icons", SettingsTab.load_icons)
+        return ["data_icons"]
+
     def __init__(self, screen, tab_instance, draw_space: pygame.Rect):
         self.screen = screen
         self.tab_instance = tab_instance
@@ -37,7 +43,7 @@ class DataTab:
             3: self.settings_tab
         }
         
-        self.sub_tab_thread_handler = ThreadHandler(sub_tab_map, self.current_sub_tab_index)
+        self.sub_tab_thread_handler = ThreadHandler(sub_tab_map, self.current_sub_tab_index, start_current=False)
 
 
     def _init_footer_text(self):
@@ -84,7 +90,7 @@ class DataTab:
                 pass
 
     def handle_threads(self, tab_selected: bool):
-        self.sub_tab_thread_handler.update_tab_index(self.current_sub_tab_index)
+        self.sub_tab_thread_handler.set_active(tab_selected)
 
     def render(self):
         self.tab_instance.render_footer(self)
@@ -6,6 +6,10 @@ from ui import GenericList
 from items import Inventory
 import settings
 from util_functs import Utils
+from text_cache import TextCache
+from preloader import Preloader
+from memory_accounting import SurfaceMemory
+from theme import Theme
 
 class SettingsTab:
     def __init__(self, screen, tab_instance, draw_space: pygame.Rect):
@@ -14,7 +18,7 @@ class SettingsTab:
         self.draw_space = draw_space
         self.category = "Settings"
         
-        self.inv_font = pygame.font.Font(settings.ROBOTO_BOLD_PATH, 10)
+        self.inv_font = TextCache().font(settings.ROBOTO_BOLD_PATH, 10)
         self.footer_font = tab_instance.footer_font
         self.config_path = 'user_config.py'
         
@@ -22,9 +26,16 @@ class SettingsTab:
         self._load_settings()
         self._init_list()
         
+    @staticmethod
+    def load_icons():
+        """Load the save icon and open the list font, safe to run on a preload worker."""
+        TextCache().font(settings.ROBOTO_BOLD_PATH, 10)
+        big_icon_size = settings.BOTTOM_BAR_HEIGHT - (settings.BOTTOM_BAR_HEIGHT // 4)
+        return Utils.load_svg(big_icon_size, settings.GUN_ICON)
+
     def _init_icons(self):
         self.big_icon_size = settings.BOTTOM_BAR_HEIGHT - (settings.BOTTOM_BAR_HEIGHT // 4)
-        self.save_icon = Utils.load_svg(self.big_icon_size, settings.GUN_ICON)
+        self.save_icon = SurfaceMemory().track(Preloader().take("data_icons", self.load_icons))
         
     def _load_settings(self):
         self.settings = []
@@ -49,6 +60,17 @@ class SettingsTab:
                     'type': type(ast.literal_eval(raw_value)),
                     'comment': value.split('#')[1].strip() if '#' in value else ''
                 })
+
+        if not any(s['var_name'] == 'THEME_COLOR' for s in self.settings):
+            # Offered before it was ever saved, save_settings adds the line
+            self.settings.append({
+                'section': current_section,
+                'var_name': 'THEME_COLOR',
+                'display_name': 'Theme Color',
+                'value': tuple(settings.THEME_COLOR),
+                'type': tuple,
+                'comment': ''
+            })
                 
     def _init_list(self):
         self.list_draw_space = pygame.Rect(
@@ -67,7 +89,9 @@ class SettingsTab:
         
     def select_item(self):
         current_setting = self.settings[self.settings_list.selected_index]
-        if current_setting['type'] == bool:
+        if current_setting['var_name'] == 'THEME_COLOR':
+            self.next_theme(current_setting)
+        elif current_setting['type'] == bool:
             current_setting['value'] = not current_setting['value']
         elif current_setting['type'] in (int, float):
             # Will be handled via increment/decrement in adjust_setting
@@ -80,11 +104,19 @@ class SettingsTab:
         elif current['type'] == float:
             current['value'] = round(max(0.0, current['value'] + (0.1 if increment else -0.1)), 1)
 
+    def next_theme(self, setting: dict):
+        """Show the UI in the next THEME_COLORS colour right away and keep it for the next boot."""
+        theme = Theme()
+        theme.cycle()
+        setting['value'] = theme.color
+        Thread(target=self.save_settings, daemon=True).start()
+
     def scroll(self, direction: bool):
         pass
         
     def save_settings(self):
         output = []
+        written = set()
         current_section = None
         with open(self.config_path, 'r') as f:
             lines = f.readlines()
@@ -98,6 +130,7 @@ class SettingsTab:
                 var_name = stripped.split(' = ')[0].strip()
                 setting = next((s for s in self.settings if s['var_name'] == var_name), None)
                 if setting:
+                    written.add(var_name)
                     comment = f'  # {setting["comment"]}' if setting["comment"] else ''
                     new_line = f"{var_name} = {repr(setting['value'])}{comment}\n"
                     output.append(new_line)
@@ -106,6 +139,14 @@ class SettingsTab:
             else:
                 output.append(line)
 
+        # Settings offered by the tab that the file does not have yet, e.g. THEME_COLOR
+        for setting in self.settings:
+            if setting['var_name'] not in written:
+                if output and not output[-1].endswith('\n'):
+                    output[-1] += '\n'
+                comment = f'  # {setting["comment"]}' if setting["comment"] else ''
+                output.append(f"{setting['var_name']} = {repr(setting['value'])}{comment}\n")
+
         with open(self.config_path, 'w') as f:
             f.writelines(output)
 
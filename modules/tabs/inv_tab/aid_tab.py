@@ -2,7 +2,6 @@ import pygame
 import settings
 from .inv_base import InvBase
 from ui import ItemGrid
-from util_functs import Utils
 
 class AidTab(InvBase):
     def __init__(self, screen, tab_instance, draw_space):
@@ -18,7 +17,7 @@ class AidTab(InvBase):
         
         # Load time icon.
         
-        self.time_icon = Utils.load_svg(self.small_icon_size, settings.TIME_ICON)
+        self.time_icon = self.icons["time"]
               
         # Initialize the item grid.
         self.item_grid = ItemGrid(
@@ -28,8 +27,7 @@ class AidTab(InvBase):
         )
         
         # Prepare and update grid entries for the initially selected aid item.
-        entries = self.get_grid_entries(self.inv_items[self.inv_list.selected_index])
-        self.item_grid.update(entries)
+        self.update_grid()
         
     def init_footer_text(self):
         """
@@ -125,16 +123,6 @@ class AidTab(InvBase):
         return entries
 
 
-    def scroll(self, direction: bool):
-        """
-        Scroll through the list of aid items and update the grid entries.
-        """
-        prev_index = self.inv_list.selected_index
-        super().scroll(direction)
-        if prev_index != self.inv_list.selected_index:
-            entries = self.get_grid_entries(self.unique_items[self.inv_list.selected_index])
-            self.item_grid.update(entries)
-
     def render(self):
         """
         Render the aid tab components.
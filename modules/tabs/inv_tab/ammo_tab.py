@@ -13,9 +13,6 @@ class AmmoTab(InvBase):
             self.init_footer_text()
         )
         
-        if self.no_items:
-            return
-            
         # Initialize the item grid
         self.item_grid = ItemGrid(
             draw_space=self.calculate_grid_space(),
@@ -24,8 +21,7 @@ class AmmoTab(InvBase):
         )
         
         # Prepare grid entries for initially selected ammo item
-        entries = self.get_grid_entries(self.inv_items[self.inv_list.selected_index])
-        self.item_grid.update(entries)
+        self.update_grid()
         
     def init_footer_text(self):
         """Combine weight and capacity info into footer surface"""
@@ -63,15 +59,6 @@ class AmmoTab(InvBase):
             
         return entries
 
-    def scroll(self, direction: bool):
-        """Update grid when scrolling through ammo items"""
-        if self.no_items:
-            return
-        prev_index = self.inv_list.selected_index
-        super().scroll(direction)
-        if prev_index != self.inv_list.selected_index:
-            entries = self.get_grid_entries(self.unique_items[self.inv_list.selected_index])
-            self.item_grid.update(entries)
 
     def render(self):
         """Draw ammo tab components"""
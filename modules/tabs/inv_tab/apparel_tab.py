@@ -2,7 +2,6 @@ import pygame
 import settings
 from .inv_base import InvBase
 from ui import ItemGrid
-from util_functs import Utils
 
 class ApparelTab(InvBase):
     def __init__(self, screen, tab_instance, draw_space):
@@ -13,8 +12,8 @@ class ApparelTab(InvBase):
         self.tab_instance.init_footer(self, (settings.SCREEN_WIDTH // 4, settings.SCREEN_WIDTH // 4), self.init_footer_text())
         
         # Load icons specific to apparel.
-        self.armor_icon = Utils.load_svg(self.big_icon_size, settings.ARMOR_ICON)
-        self.defense_icon = Utils.load_svg(self.small_icon_size, settings.DEFENSE_ICON)
+        self.armor_icon = self.icons["armor"]
+        self.defense_icon = self.icons["defense"]
         
         # (Assuming self.defense_icons is set elsewhere, e.g., in the parent or during tab initialization)
         
@@ -26,8 +25,7 @@ class ApparelTab(InvBase):
         )
         
         # Prepare and update grid entries for the initially selected item.
-        entries = self.get_grid_entries(self.inv_items[self.inv_list.selected_index])
-        self.item_grid.update(entries)
+        self.update_grid()
         
     def init_footer_text(self):
         """
@@ -191,22 +189,6 @@ class ApparelTab(InvBase):
         
         return entries
 
-    def select_item(self):
-        """
-        Update the footer when a new apparel item is selected.
-        """
-        super().select_item()
-        self.tab_instance.init_footer(self, (settings.SCREEN_WIDTH // 4, settings.SCREEN_WIDTH // 4), self.init_footer_text())
-
-    def scroll(self, direction: bool):
-        """
-        Scroll through the list of apparel items and update the grid entries.
-        """
-        prev_index = self.inv_list.selected_index
-        super().scroll(direction)
-        if prev_index != self.inv_list.selected_index:
-            entries = self.get_grid_entries(self.unique_items[self.inv_list.selected_index])
-            self.item_grid.update(entries)
 
     def render(self):
         """
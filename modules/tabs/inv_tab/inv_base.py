@@ -1,38 +1,45 @@
-from threading import Thread, Lock
 import pygame
 import settings
 from ui import GenericList, AnimatedImage
 from items import Inventory
 from util_functs import Utils
+from dirty_rects import DirtyRects
+from palette import Palette
+from preloader import Preloader
+from memory_accounting import SurfaceMemory
+from text_cache import TextCache
+from turntable_cache import TurntableCache
             
             
 class InvBase:
+    BIG_ICON_SIZE = settings.BOTTOM_BAR_HEIGHT - (settings.BOTTOM_BAR_HEIGHT // 4)
+    SMALL_ICON_SIZE = settings.BOTTOM_BAR_HEIGHT - (settings.BOTTOM_BAR_HEIGHT // 2)
+
+    icons = None  # Shared by the sub-tabs, set by InvTab, see load_icons
+
     def __init__(self, screen, tab_instance, draw_space: pygame.Rect, category: str, enable_turntable: bool = True, enable_dot: bool = False):
         self.screen = screen
         self.tab_instance = tab_instance
         self.draw_space = draw_space
+        self.category = category
         self.enable_turntable = enable_turntable
+        self.enable_dot = enable_dot
+        self.tab_active = False
         
-        self.inv_font = pygame.font.Font(settings.ROBOTO_BOLD_PATH, 10)
+        self.inv_font = TextCache().font(settings.ROBOTO_BOLD_PATH, 10)
         self.footer_font = tab_instance.footer_font               
         inventory = Inventory()
-        self.inv_items = inventory.get_all_items(category)
-        self.weight = sum(item.weight for item in inventory.get_all_items())
+        self.weight = inventory.total_weight
         self._init_icons()
         
-        self.no_items = True if not self.inv_items else False
-        if self.no_items:
-            return
-                
         self.item_selected = False
         self.active_item_index = None
         self.previous_item_index = None
+        self.item_grid = None  # Set by the subclasses, see update_grid
+        self.unique_items = []
+        self.inv_list = None
+        inventory.listen(self._on_inventory_change)
         
-        self.unique_items = inventory.get_unique_items(category)
-        
-        item_names = inventory.get_item_names(category)
-
-           
         self.list_draw_space = pygame.Rect(
             self.draw_space.left,
             self.draw_space.top + 2 * settings.LIST_TOP_MARGIN,
@@ -40,11 +47,27 @@ class InvBase:
             self.draw_space.height - 2 * settings.LIST_TOP_MARGIN
         )
         
+        self.no_items = inventory.count(category) == 0
+        if self.no_items:
+            return
+        self._init_list()
+
+    def _init_list(self):
+        inventory = Inventory()
+        self.unique_items = inventory.get_unique_items(self.category)
+        for index, item in enumerate(self.unique_items):
+            if inventory.is_equipped(item.name):
+                self.active_item_index = index
+                self.item_selected = True
+        
+        item_names = inventory.get_item_names(self.category)
+
+           
         self.inv_list = GenericList(
             draw_space=self.list_draw_space,
             font=self.inv_font,
             items=item_names,
-            enable_dot=enable_dot,
+            enable_dot=self.enable_dot,
         )
         
         if self.enable_turntable:
@@ -59,33 +82,53 @@ class InvBase:
             self.list_draw_space.height // 2
         )
         
-        self.turntable_lock = Lock
         self.item_turntable = None
+        self.turntable_cache = TurntableCache()
 
     
+    @staticmethod
+    def load_icons() -> dict:
+        """Load the icons of every inventory sub-tab and open the list font, safe to run on a preload worker."""
+        big_icon_size = InvBase.BIG_ICON_SIZE
+        small_icon_size = InvBase.SMALL_ICON_SIZE
+        TextCache().font(settings.ROBOTO_BOLD_PATH, 10)
+        return {
+            "weight": Utils.load_svg(big_icon_size, settings.WEIGHT_ICON),
+            "caps": Utils.load_svg(big_icon_size, settings.CAPS_ICON),
+            "gun": Utils.load_svg(big_icon_size, settings.GUN_ICON),
+            "armor": Utils.load_svg(big_icon_size, settings.ARMOR_ICON),
+            "ammo": Utils.load_svg(small_icon_size, settings.AMMO_ICON),
+            "defense": Utils.load_svg(small_icon_size, settings.DEFENSE_ICON),
+            "time": Utils.load_svg(small_icon_size, settings.TIME_ICON),
+            "damage": {
+                dtype: Utils.load_svg(small_icon_size, path)
+                for dtype, path in settings.DAMAGE_TYPES_ICONS.items()
+            },
+        }
+
     def _init_icons(self):
-        self.big_icon_size = settings.BOTTOM_BAR_HEIGHT - (settings.BOTTOM_BAR_HEIGHT // 4)
-        self.small_icon_size = settings.BOTTOM_BAR_HEIGHT - (settings.BOTTOM_BAR_HEIGHT // 2)
+        self.big_icon_size = self.BIG_ICON_SIZE
+        self.small_icon_size = self.SMALL_ICON_SIZE
         
-        self.weight_icon = Utils.load_svg(self.big_icon_size, settings.WEIGHT_ICON)
-        self.caps_icon = Utils.load_svg(self.big_icon_size, settings.CAPS_ICON)
+        if InvBase.icons is None:
+            InvBase.icons = SurfaceMemory().track(Preloader().take("inv_icons", self.load_icons))
+        self.weight_icon = self.icons["weight"]
+        self.caps_icon = self.icons["caps"]
         
         
-        self.damage_icons = {
-            dtype: Utils.load_svg(self.small_icon_size, path)
-            for dtype, path in settings.DAMAGE_TYPES_ICONS.items()
-        }        
+        self.damage_icons = self.icons["damage"]
         
 
     def select_item(self):    
         if self.no_items:
             return
         
-        if self.inv_list.selected_index == self.active_item_index:
-            self.item_selected = not self.item_selected
-        else:
-            self.item_selected = True  # Set to True for new selections
-        self.active_item_index = self.inv_list.selected_index
+        inventory = Inventory()
+        selected = self.unique_items[self.inv_list.selected_index]
+        if self.item_selected and self.active_item_index != self.inv_list.selected_index:
+            # One item per tab is equipped at a time
+            inventory.equip(self.unique_items[self.active_item_index].name, False)
+        inventory.equip(selected.name, not inventory.is_equipped(selected.name))
         
 
 
@@ -94,9 +137,96 @@ class InvBase:
             return
         prev_index = self.inv_list.change_selection(direction)
 
-        if self.enable_turntable and self.inv_list.selected_index != prev_index:
-            Thread(target=self.start_item_animation).start() 
-        
+        if self.inv_list.selected_index != prev_index:
+            self.update_grid()
+            if self.enable_turntable:
+                self.start_item_animation()
+
+
+    def update_grid(self):
+        """Show the stats of the selected item in the item grid."""
+        if self.no_items or self.item_grid is None:
+            return
+        self.item_grid.update(self.get_grid_entries(self.unique_items[self.inv_list.selected_index]))
+        DirtyRects().mark(self.item_grid.draw_space)
+
+
+    def refresh_footer(self):
+        self.weight = Inventory().total_weight
+        self.tab_instance.init_footer(self, (settings.SCREEN_WIDTH // 4, settings.SCREEN_WIDTH // 4), self.init_footer_text())
+
+
+    def update_footer_weight(self):
+        """Draw the new carry weight over the old one, leaving the rest of the footer as it is."""
+        weight = Inventory().total_weight
+        if weight == self.weight or self not in self.tab_instance.tab_footers:
+            return
+        self.weight = weight
+        weight_surface = self.footer_font.render(f"{self.weight}/{settings.MAX_CARRY_WEIGHT}", True, settings.PIP_BOY_LIGHT)
+        x = self.weight_icon.get_width() + settings.BOTTOM_BAR_MARGIN
+        # Cleared up to the divider, a shorter text must not leave digits of the longer one behind
+        slot = pygame.Surface((settings.SCREEN_WIDTH // 4 - settings.BOTTOM_BAR_VERTICAL_MARGINS - x, weight_surface.get_height()))
+        # Drawn on the footer colour, so it is indexed the same as the footer it patches
+        slot.fill(settings.PIP_BOY_DARK)
+        slot.blit(weight_surface, (0, 0))
+        self.tab_instance.update_footer(self, Palette().indexed(slot, rle=False), (x, 2))
+
+
+    def _on_inventory_change(self, event):
+        """Patch the list row, grid and footer an inventory change touched."""
+        if event.kind in (Inventory.ADDED, Inventory.REMOVED, Inventory.QUANTITY_CHANGED):
+            self.update_footer_weight()
+        if event.item.category != self.category:
+            return
+
+        if event.kind in (Inventory.EQUIPPED, Inventory.UNEQUIPPED):
+            if event.kind == Inventory.EQUIPPED:
+                self.active_item_index = event.index
+                self.item_selected = True
+            elif event.index == self.active_item_index:
+                self.item_selected = False
+            self.refresh_footer()
+            DirtyRects().mark(self.list_draw_space)
+            return
+
+        shown = self.unique_items[self.inv_list.selected_index] if not self.no_items else None
+        label = Inventory.item_name(event.item, event.quantity)
+        if event.kind == Inventory.ADDED:
+            if self.inv_list is None:
+                self._init_list()
+            else:
+                self.unique_items.insert(event.index, event.item)
+                self.inv_list.insert_item(event.index, label)
+                if self.active_item_index is not None and event.index <= self.active_item_index:
+                    self.active_item_index += 1
+        elif event.kind == Inventory.REMOVED:
+            del self.unique_items[event.index]
+            self.inv_list.remove_item(event.index)
+            if event.index == self.active_item_index:
+                self.active_item_index = None
+                self.item_selected = False
+                self.refresh_footer()
+            elif self.active_item_index is not None and event.index < self.active_item_index:
+                self.active_item_index -= 1
+        else:
+            self.inv_list.set_item(event.index, label)
+
+        self.no_items = not self.unique_items
+        if self.no_items:
+            if self.enable_turntable and self.item_turntable:
+                self.item_turntable.stop()
+                self.item_turntable = None
+            if self.item_grid is not None:
+                self.item_grid.update([])
+            DirtyRects().mark(self.draw_space)
+            return
+        selected = self.unique_items[self.inv_list.selected_index]
+        if selected is not shown:
+            self.update_grid()
+            if self.enable_turntable and self.tab_active:
+                self.start_item_animation()
+        elif event.index == self.inv_list.selected_index:
+            self.update_grid()
     
     
     def init_footer_weight(self):
@@ -137,16 +267,33 @@ class InvBase:
         if self.item_turntable:
             self.item_turntable.stop()
             self.item_turntable = None
-        selected_item = self.unique_items[self.inv_list.selected_index]   
-        if not selected_item.icons: 
-            return  
-        folder = f"{settings.ITEMS_BASE_FOLDER}/{selected_item.icons}"
-        icons = Utils.load_images(folder) 
+        selected_index = self.inv_list.selected_index
+        height = self.turntable_draw_space.height
+        folder = self._turntable_folder(selected_index)
+        if folder:
+            self.turntable_cache.request(folder, height, lambda icons: self._show_turntable(selected_index, icons))
+
+        # Warm up the neighbours so scrolling one step shows them instantly
+        for index in (selected_index - 1, selected_index + 1):
+            folder = self._turntable_folder(index)
+            if folder:
+                self.turntable_cache.prefetch(folder, height)
+
+    def _turntable_folder(self, index: int):
+        if not 0 <= index < len(self.unique_items):
+            return None
+        icons = self.unique_items[index].icons
+        return f"{settings.ITEMS_BASE_FOLDER}/{icons}" if icons else None
+
+    def _show_turntable(self, selected_index: int, icons: list):
         if not icons:
             return
-        
-        icons = [Utils.scale_image_abs(image, height=self.turntable_draw_space.height) for image in icons]
-     
+        if not self.tab_active or selected_index != self.inv_list.selected_index:
+            # Tab was left or the selection moved on while the frames were loading
+            return
+
+        if self.item_turntable:
+            self.item_turntable.stop()
         self.item_turntable = AnimatedImage(
             self.screen,
             icons,
@@ -159,10 +306,11 @@ class InvBase:
 
     def handle_threads(self, tab_selected: bool):
         """ Handle the threads"""
+        self.tab_active = tab_selected
         if self.no_items:
             return
         if tab_selected and self.enable_turntable:
-            Thread(target=self.start_item_animation).start()
+            self.start_item_animation()
         elif not tab_selected and self.enable_turntable and self.item_turntable :
             self.item_turntable.stop()
             self.item_turntable = None
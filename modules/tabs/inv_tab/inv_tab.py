@@ -5,10 +5,19 @@ from .aid_tab import AidTab
 from .junk_tab import JunkTab
 from .misc_tab import MiscTab
 from .ammo_tab import AmmoTab
+from .inv_base import InvBase
 from tab import ThreadHandler
+from preloader import Preloader
+from memory_accounting import SurfaceMemory
 
 
 class InvTab:
+    @staticmethod
+    def preload(preloader) -> list:
+        """Declare the asset jobs of the inventory tab, returns their names."""
+        preloader.add("inv_icons", InvBase.load_icons)
+        return ["inv_icons"]
+
     def __init__(self, screen, tab_instance, draw_space: pygame.Rect):
         self.screen = screen
         self.tab_instance = tab_instance
@@ -18,6 +27,9 @@ class InvTab:
         
         self.footer_font = tab_instance.footer_font
         
+        # Taken again on every build, the icons are only ever blitted by the sub-tabs
+        InvBase.icons = SurfaceMemory().track(Preloader().take("inv_icons", InvBase.load_icons))
+        
         self.weapons_tab = WeaponsTab(self.screen, self.tab_instance, self.draw_space)
         self.apparel_tab = ApparelTab(self.screen, self.tab_instance, self.draw_space)
         self.aid_tab = AidTab(self.screen, self.tab_instance, self.draw_space)
@@ -37,7 +49,7 @@ class InvTab:
             6: self.ammo_tab
         }
         
-        self.sub_tab_thread_handler = ThreadHandler(sub_tab_map, self.current_sub_tab_index)
+        self.sub_tab_thread_handler = ThreadHandler(sub_tab_map, self.current_sub_tab_index, start_current=False)
 
 
 
@@ -89,7 +101,7 @@ class InvTab:
                 
         
     def handle_threads(self, tab_selected: bool):
-        self.sub_tab_thread_handler.update_tab_index(self.current_sub_tab_index)
+        self.sub_tab_thread_handler.set_active(tab_selected)
     
 
 
@@ -24,8 +24,7 @@ class JunkTab(InvBase):
         )
         
         # Prepare and update grid entries for the initially selected junk item.
-        entries = self.get_grid_entries(self.inv_items[self.inv_list.selected_index])
-        self.item_grid.update(entries)
+        self.update_grid()
         
     def init_footer_text(self):
         """
@@ -70,16 +69,6 @@ class JunkTab(InvBase):
         return entries
 
 
-    def scroll(self, direction: bool):
-        """
-        Scroll through the list of junk items and update the grid entries.
-        """
-        prev_index = self.inv_list.selected_index
-        super().scroll(direction)
-        if prev_index != self.inv_list.selected_index:
-            entries = self.get_grid_entries(self.unique_items[self.inv_list.selected_index])
-            self.item_grid.update(entries)
-
     def render(self):
         """
         Render the junk tab components.
@@ -13,9 +13,6 @@ class MiscTab(InvBase):
             self.init_footer_text()
         )
         
-        if self.no_items:
-            return
-            
         # Initialize the item grid.
         self.item_grid = ItemGrid(
             draw_space=self.calculate_grid_space(),
@@ -25,8 +22,7 @@ class MiscTab(InvBase):
         
         
         # Prepare and update grid entries for the initially selected junk item.
-        entries = self.get_grid_entries(self.inv_items[self.inv_list.selected_index])
-        self.item_grid.update(entries)
+        self.update_grid()
         
     def init_footer_text(self):
         """
@@ -68,16 +64,6 @@ class MiscTab(InvBase):
         return entries
 
 
-    def scroll(self, direction: bool):
-        if self.no_items:
-            return
-        prev_index = self.inv_list.selected_index
-        super().scroll(direction)
-        if prev_index != self.inv_list.selected_index:
-            entries = self.get_grid_entries(self.unique_items[self.inv_list.selected_index])
-            self.item_grid.update(entries)
-            
-
     def render(self):
         super().render()
         if self.no_items:
@@ -1,8 +1,8 @@
 import pygame
 import settings
 from .inv_base import InvBase
+from items import Inventory
 from ui import ItemGrid
-from util_functs import Utils
 
 
 class WeaponsTab(InvBase):
@@ -10,16 +10,15 @@ class WeaponsTab(InvBase):
         super().__init__(screen, tab_instance, draw_space, category='Weapon', enable_dot=True)
         self.tab_instance.init_footer(self, (settings.SCREEN_WIDTH // 4, settings.SCREEN_WIDTH // 4), self.init_footer_text())
         
-        self.ammo_icon = Utils.load_svg(self.small_icon_size, settings.AMMO_ICON)
-        self.gun_icon = Utils.load_svg(self.big_icon_size, settings.GUN_ICON)
+        self.ammo_icon = self.icons["ammo"]
+        self.gun_icon = self.icons["gun"]
         self.item_grid = ItemGrid(
             draw_space=self.calculate_grid_space(),
             font=self.inv_font,
             padding=1
         )
         
-        entries = self.get_grid_entries(self.inv_items[self.inv_list.selected_index])
-        self.item_grid.update(entries)       
+        self.update_grid()
                 
     def init_footer_text(self):
         weight_surface = self.init_footer_weight()
@@ -178,7 +177,7 @@ class WeaponsTab(InvBase):
         })
 
         # Ammo entry
-        ammo = settings.TOTAL_AMMO.get(item.ammo_type, 0)
+        ammo = Inventory().quantity(item.ammo_type)
         ammo_type_name = settings.items[item.ammo_type].name
         entries.append({
             "label": ammo_type_name,
@@ -200,19 +199,13 @@ class WeaponsTab(InvBase):
             entries.append({"label": label, "value": value})
 
         return entries
-        
-    
-    def select_item(self):
-        super().select_item()
-        self.tab_instance.init_footer(self, (settings.SCREEN_WIDTH // 4, settings.SCREEN_WIDTH // 4), self.init_footer_text())
 
 
-    def scroll(self, direction: bool):
-        prev_index = self.inv_list.selected_index
-        super().scroll(direction)
-        if prev_index != self.inv_list.selected_index:
-            entries = self.get_grid_entries(self.unique_items[self.inv_list.selected_index])
-            self.item_grid.update(entries)
+    def _on_inventory_change(self, event):
+        super()._on_inventory_change(event)
+        # The grid shows the rounds carried for the selected weapon
+        if event.item.category == 'Ammo' and not self.no_items and self.unique_items[self.inv_list.selected_index].ammo_type == event.item.name:
+            self.update_grid()
 
 
     def render(self):
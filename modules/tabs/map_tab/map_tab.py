@@ -1,11 +1,12 @@
 import os
-from threading import Thread, Lock
+from scheduler import Scheduler
 import pygame
 import settings
 from tab import ThreadHandler
 from .world_tab import WorldMap, RealMap
 from datetime import datetime
 from util_functs import Utils
+from text_cache import TextCache
 
 
 
@@ -13,6 +14,16 @@ from util_functs import Utils
 
 
 class MapTab:
+    @staticmethod
+    def preload(preloader, draw_space: pygame.Rect) -> list:
+        """Declare the asset jobs of the map tab, returns their names."""
+        if not settings.GAME_ACCURATE_MODE:
+            # The real map itself loads in the background, only its markers are needed up front
+            preloader.add("map_icons", RealMap.load_icons)
+            return ["map_icons"]
+        preloader.add("world_map", lambda: WorldMap.load_map(draw_space.size))
+        return ["world_map"]
+
     def __init__(self, screen, tab_instance, draw_space: pygame.Rect):
         self.screen = screen
         self.tab_instance = tab_instance
@@ -39,17 +50,15 @@ class MapTab:
             0: self.world_map_subtab
         }
         
-        self.footer_time_thread = Thread(target=self.update_footer_time, daemon=True)
-        self.sub_tab_thread_handler = ThreadHandler(sub_tab_map, self.current_sub_tab_index)
+        self.sub_tab_thread_handler = ThreadHandler(sub_tab_map, self.current_sub_tab_index, start_current=False)
         
  
-        self.datetime_lock = Lock
-        self.footer_time_thread.start()
+        self.update_footer_time()
 
 
 
     def _blit_footer_time(self):
-        time_surface = self.footer_font.render(self.time, True, settings.PIP_BOY_LIGHT)
+        time_surface = TextCache().render(self.footer_font, self.time, settings.PIP_BOY_LIGHT)
         self.tab_instance.update_footer(self, time_surface,(settings.SCREEN_WIDTH // 4 + 4, 2))
 
         
@@ -78,19 +87,18 @@ class MapTab:
             self.world_map_subtab.zoom(direction)
 
     def update_footer_time(self):
-        while True:
-            self.time = Utils.get_time()
-            self._blit_footer_time()
-            now = datetime.now()
-            wait_time = 60 - now.second
-            pygame.time.wait(wait_time * 1000)
+        self.time = Utils.get_time()
+        self._blit_footer_time()
+        # Wake up again at the start of the next minute
+        wait_time = 60 - datetime.now().second
+        Scheduler().after(wait_time * 1000, self.update_footer_time)
             
     def navigate(self, direction: int):
         if self.world_map_subtab.is_initialized:
             self.world_map_subtab.navigate(direction)
 
     def handle_threads(self, tab_selected: bool):
-        self.sub_tab_thread_handler.update_tab_index(self.current_sub_tab_index)
+        self.sub_tab_thread_handler.set_active(tab_selected)
 
 
     def render(self):
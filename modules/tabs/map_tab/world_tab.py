@@ -4,7 +4,7 @@ import json
 import math
 import os
 import random
-from threading import Lock, Thread
+from threading import Thread
 import requests
 import pygame
 from typing import Tuple, List, Dict, Optional
@@ -13,25 +13,34 @@ from PIL import Image
 
 import settings
 from util_functs import Utils
+from dirty_rects import DirtyRects
+from command_queue import CommandQueue
+from preloader import Preloader
+from palette import Palette
+from memory_accounting import SurfaceMemory
+from startup_trace import traced
 
 
 
 
 class BaseMap:
     def __init__(self, screen: pygame.Surface, draw_space: pygame.Rect, 
-                 map_image: pygame.Surface):
+                 map_image: pygame.Surface, zoomed_map: pygame.Surface = None):
+        """zoomed_map is map_image already at the initial zoom, see scale_map. The map is then owned and not copied."""
         self.screen = screen
         self.draw_space = draw_space
-        self.map_image = map_image
-        self.map_surface = map_image.copy()
+        self.map_surface = SurfaceMemory().track(map_image if zoomed_map else map_image.copy(), "map")
 
         # Zoom configuration
         self.min_zoom = self._calculate_min_zoom()
         self.max_zoom = settings.MIN_MAP_ZOOM
-        self.map_zoom = max(min(settings.INITIAL_MAP_ZOOM, self.max_zoom), self.min_zoom)
+        self.map_zoom = self.initial_zoom(self.map_surface.get_size(), self.draw_space.size)
 
         # Navigation state
-        self.zoomed_map_surface = self._update_zoomed_surface()
+        if zoomed_map:
+            self.zoomed_map_surface = SurfaceMemory().track(zoomed_map, "map")
+        else:
+            self.zoomed_map_surface = self._update_zoomed_surface()
         self.map_offset = Vector2(self._calculate_initial_offset())
         self.directions = [
             (settings.MAP_MOVE_SPEED, 0),   # Right
@@ -50,15 +59,27 @@ class BaseMap:
         )
 
     def _update_zoomed_surface(self) -> pygame.Surface:
-        """Update zoomed surface using smooth scaling."""
-        new_size = Vector2(self.map_surface.get_size()) * self.map_zoom
-        return pygame.transform.smoothscale(self.map_surface, new_size.xy)
+        """Update zoomed surface using smooth scaling, indexed in palette mode."""
+        return SurfaceMemory().track(self.scale_map(self.map_surface, self.map_zoom), "map")
+
+    @staticmethod
+    def scale_map(map_image: pygame.Surface, zoom: float) -> pygame.Surface:
+        """Smooth scale the map by zoom, indexed in palette mode. Safe to run on a preload worker."""
+        new_size = Vector2(map_image.get_size()) * zoom
+        return Palette().indexed(pygame.transform.smoothscale(map_image, new_size.xy))
+
+    @staticmethod
+    def min_zoom_for(image_size: tuple, draw_size: tuple) -> float:
+        """Zoom at which an image of image_size just covers draw_size."""
+        return max(draw_size[0] / image_size[0], draw_size[1] / image_size[1])
+
+    @staticmethod
+    def initial_zoom(image_size: tuple, draw_size: tuple) -> float:
+        return max(min(settings.INITIAL_MAP_ZOOM, settings.MIN_MAP_ZOOM), BaseMap.min_zoom_for(image_size, draw_size))
 
     def _calculate_min_zoom(self) -> float:
         """Calculate minimum zoom to fit image within draw space."""
-        img_size = Vector2(self.map_surface.get_size())
-        draw_size = Vector2(self.draw_space.size)
-        return max(draw_size.x / img_size.x, draw_size.y / img_size.y)
+        return self.min_zoom_for(self.map_surface.get_size(), self.draw_space.size)
 
     def clamp_offset(self):
         """Keep map offset within valid bounds."""
@@ -120,10 +141,22 @@ class BaseMap:
 class WorldMap(BaseMap):
     """World map with toggleable markers."""
     def __init__(self, screen: pygame.Surface, draw_space: pygame.Rect):
+        map_image, zoomed_map = Preloader().take("world_map", lambda: self.load_map(draw_space.size))
+        super().__init__(screen, draw_space, map_image, zoomed_map)
+
+    @staticmethod
+    def load_map_image() -> pygame.Surface:
+        """Load and tint the map image, safe to run on a preload worker."""
         map_path = (settings.COMMONWEALTH_MAP_MARKERS if settings.SHOW_ALL_MARKERS 
                     else settings.COMMONWEALTH_MAP)
-        map_image = Utils.tint_image(pygame.image.load(map_path).convert_alpha())
-        super().__init__(screen, draw_space, map_image)
+        return Utils.load_tinted(map_path)
+
+    @staticmethod
+    def load_map(draw_size: tuple) -> tuple:
+        """Own copy of the map image and its scale at the initial zoom, safe to run on a preload worker."""
+        map_image = WorldMap.load_map_image().copy()
+        zoom = BaseMap.initial_zoom(map_image.get_size(), draw_size)
+        return map_image, BaseMap.scale_map(map_image, zoom)
 
 
 class RealMap(BaseMap):
@@ -136,21 +169,28 @@ class RealMap(BaseMap):
         self.lat, self.lon = settings.LATITUDE, settings.LONGITUDE
         self.api_zoom = api_zoom
         self.draw_space = draw_space
-        self.icons = Utils.load_svgs_dict(settings.MAP_ICONS_BASE_FOLDER, settings.MAP_ICON_SIZE)
+        self.icons = SurfaceMemory().track(Preloader().take("map_icons", self.load_icons))
 
-        self._cache_lock = Lock()
-        self._places_cache_lock = Lock()
-        self.rendered_map_lock = Lock()
-        
         self.is_initialized = False
         Thread(target=self.init_map, daemon=True).start()
 
 
+    @staticmethod
+    def load_icons() -> dict:
+        """Load the place markers, safe to run on a preload worker."""
+        return Utils.load_svgs_dict(settings.MAP_ICONS_BASE_FOLDER, settings.MAP_ICON_SIZE)
+
+    @traced("RealMap.init_map")
     def init_map(self):
         image = self._fetch_map_image()
         places = self._fetch_places(image)
         rendered_map = self._draw_markers(image, places)
+        CommandQueue().post(self._finish_init, rendered_map)
+
+    def _finish_init(self, rendered_map: pygame.Surface):
+        """Swap the finished map in on the main thread."""
         super().__init__(self.screen, self.draw_space, rendered_map)
+        DirtyRects().mark(self.draw_space)
 
 
     def _fetch_map_image(self) -> pygame.Surface:
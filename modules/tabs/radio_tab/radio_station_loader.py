@@ -4,6 +4,7 @@ import configparser
 import time
 from concurrent.futures import ThreadPoolExecutor
 from tinytag import TinyTag
+from startup_trace import traced
 
 class RadioStationLoader:
     def __init__(self, base_folder, intermissions_base_folder):
@@ -44,6 +45,7 @@ class RadioStationLoader:
 
         return intermissions
 
+    @traced("RadioStationLoader.load_radio_stations")
     def load_radio_stations(self):
         def load_single_station(entry):
             if not entry.is_dir():
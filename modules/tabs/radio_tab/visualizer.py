@@ -3,7 +3,10 @@ import random
 import numpy as np
 import pygame
 import settings
-from threading import Thread, Lock
+from dirty_rects import DirtyRects
+from scheduler import Scheduler
+from palette import Palette
+from memory_accounting import SurfaceMemory
 
 class Visualizer:
     def __init__(self, draw_space: pygame.Rect, screen, radio_tab_instance):
@@ -17,9 +20,10 @@ class Visualizer:
         self.vis_x = self.draw_space.centerx + settings.RADIO_WAVE_VISUALIZER_SIZE_OFFSET // 2
         self.vis_y = self.draw_space.top
         self.midpoint_y = self.vis_y + self.visualizer_size // 2
+        self.wave_rect = pygame.Rect(self.vis_x, self.vis_y, self.visualizer_size + 1, self.visualizer_size + 1)
+        self.dirty_rects = DirtyRects()
 
         self.wave_points = np.zeros(64, dtype=np.float32)
-        self.wave_point_lock = Lock()
         self.x_positions = np.linspace(0, self.visualizer_size, 64, dtype=np.int32)
 
         self.waves = np.array([
@@ -34,16 +38,14 @@ class Visualizer:
             'changing': np.array([[8.0, 20.0], [0.1, 0.6]], dtype=np.float32)
         }
 
-        self.visualizer_thread = None
-        self.visualizer_thread_running = False
+        self.scheduler = Scheduler()
+        self.visualizer_task = None
         self.change_station_wave_counter = 0
 
-        self.wave_surface = pygame.Surface(
-            (self.draw_space.width, self.draw_space.height),
-            pygame.SRCALPHA
-        ).convert_alpha()
+        memory = SurfaceMemory()
+        self.wave_surface = memory.track(Palette().surface((self.draw_space.width, self.draw_space.height)), "visualizer")
         
-        self.grid_surface = self._prepare_grid()
+        self.grid_surface = memory.track(self._prepare_grid(), "visualizer")
         
         self.change_visualizer_wave(64)
 
@@ -72,7 +74,7 @@ class Visualizer:
             y = self.vis_y + i * (self.visualizer_size // settings.RADIO_WAVE_VISUALIZER_GRID_LINES)
             pygame.draw.line(grid_surface, settings.PIP_BOY_LIGHT, (self.vis_x + self.visualizer_size, y), (self.vis_x - line_size + self.visualizer_size, y), 1)
             
-        return grid_surface
+        return Palette().indexed(grid_surface)
 
     def _prepare_wave_pattern(self, pattern_name: str):
         pattern = self.wave_patterns[pattern_name]
@@ -110,37 +112,26 @@ class Visualizer:
             new_samples.append(total_wave)
 
         # Update wave_points with new batch
-        with self.wave_point_lock:
-            # Efficiently shift and update the wave points
-            self.wave_points[:-batch_size] = self.wave_points[batch_size:]
-            self.wave_points[-batch_size:] = new_samples
+        # Efficiently shift and update the wave points
+        self.wave_points[:-batch_size] = self.wave_points[batch_size:]
+        self.wave_points[-batch_size:] = new_samples
+        self.dirty_rects.mark(self.wave_rect)
 
     def update_visualiser(self):
-        batch_size = settings.RADIO_WAVE_BATCH_SIZE
-        while self.visualizer_thread_running:
-            self.change_visualizer_wave(batch_size)
-            # Adjust wait time to maintain the same sample rate
-            pygame.time.wait(settings.SPEED * 50)
+        self.change_visualizer_wave(settings.RADIO_WAVE_BATCH_SIZE)
 
     def start(self):
-        if not self.visualizer_thread or not self.visualizer_thread.is_alive():
-            self.visualizer_thread_running = True
-            self.visualizer_thread = Thread(
-                target=self.update_visualiser,
-                daemon=True
-            )
-            self.visualizer_thread.start()
+        if not self.visualizer_task or not self.visualizer_task.active:
+            # Period keeps the same sample rate as the batch size
+            self.visualizer_task = self.scheduler.every(settings.SPEED * 50, self.update_visualiser)
 
     def stop(self):
-        if self.visualizer_thread and self.visualizer_thread.is_alive():
-            self.visualizer_thread_running = False
-            self.visualizer_thread.join()
-            self.visualizer_thread = None
+        self.scheduler.cancel(self.visualizer_task)
+        self.visualizer_task = None
 
     def render_waves(self):
-        with self.wave_point_lock:
-            points = self.wave_points.copy()
-        self.wave_surface.fill((0, 0, 0, 0))
+        points = self.wave_points
+        Palette().fill(self.wave_surface, (0, 0, 0, 0))
         x_coords = self.vis_x + self.x_positions
         y_coords = self.midpoint_y + (points * (self.visualizer_size // 2)).astype(int)
         points_array = np.column_stack((x_coords, y_coords))
@@ -4,6 +4,10 @@ import settings
 from threading import Thread
 from ui import GenericList, AnimatedImage
 from util_functs import Utils
+from text_cache import TextCache
+from palette import Palette
+from preloader import Preloader
+from memory_accounting import SurfaceMemory
 
 
 
@@ -13,8 +17,8 @@ class SpecialTab:
         self.tab_instance = tab_instance
         self.draw_space = draw_space
         
-        self.special_font = pygame.font.Font(settings.ROBOTO_BOLD_PATH, 12)
-        self.description_font = pygame.font.Font(settings.ROBOTO_BOLD_PATH, 9) 
+        self.special_font = TextCache().font(settings.ROBOTO_BOLD_PATH, 12)
+        self.description_font = TextCache().font(settings.ROBOTO_BOLD_PATH, 9) 
         
         list_draw_space = pygame.Rect(
             self.draw_space.left,
@@ -36,7 +40,8 @@ class SpecialTab:
         
         self.special_text = self._init_special_text()
         
-        self.special_images, self.frame_orders = self._init_images()
+        self.special_images, self.frame_orders = Preloader().take("special_images", self.load_images)
+        SurfaceMemory().track(self.special_images, "special")
         
         
         self.animated_images = {}
@@ -91,12 +96,14 @@ class SpecialTab:
             surface = pygame.surface.Surface((self.draw_space.centerx, text.get_height()))
             surface.blit(text, (0, 0))
             
-            special_discriptions[description.split(" ")[0]] = surface
+            special_discriptions[description.split(" ")[0]] = Palette().indexed(surface)
             
         return special_discriptions
             
     
-    def _init_images(self):
+    @staticmethod
+    def load_images():
+        """Load the SPECIAL animations and their frame orders, safe to run on a preload worker."""
         special_images = {}
         frame_orders = {}
         for i, special in enumerate(settings.SPECIAL):
@@ -104,15 +111,7 @@ class SpecialTab:
             path = f"{settings.SPECIAL_BASE_FOLDER}/{special.lower()}"
             
 
-            images = []
-            for file in os.listdir(path):
-                if file.endswith(".png"):
-                    images.append(Utils.scale_image(
-                        Utils.tint_image(
-                            pygame.image.load(os.path.join(path, file)).convert_alpha()
-                        ),
-                        settings.SPECIAL_IMAGE_SCALE
-                    ))
+            images = Utils.load_images(path, scale=settings.SPECIAL_IMAGE_SCALE)
                     
             if os.path.exists(os.path.join(path, "frameorder.ini")):
                 with open(os.path.join(path, "frameorder.ini"), "r") as f:
@@ -3,8 +3,25 @@ import settings
 from .status_tab import StatusTab
 from .special_tab import SpecialTab
 from tab import ThreadHandler
+from text_cache import TextCache
 
 class StatTab:
+    @staticmethod
+    def preload(preloader, draw_space: pygame.Rect) -> list:
+        """Declare the asset jobs of the stat tab, returns their names."""
+        preloader.add("special_images", SpecialTab.load_images)
+        preloader.add("conditionboy", lambda: StatusTab.load_conditionboy(draw_space.height))
+        preloader.add("stat_fonts", StatTab.load_fonts)
+        return ["special_images", "conditionboy", "stat_fonts"]
+
+    @staticmethod
+    def load_fonts():
+        """Open the fonts of the sub-tabs ahead of them, safe to run on a preload worker."""
+        text_cache = TextCache()
+        text_cache.font(settings.ROBOTO_CONDENSED_BOLD_PATH, 12)
+        text_cache.font(settings.ROBOTO_BOLD_PATH, 12)
+        text_cache.font(settings.ROBOTO_BOLD_PATH, 9)
+
     def __init__(self, screen, tab_instance, draw_space: pygame.Rect):
         self.screen = screen
         self.tab_instance = tab_instance
@@ -32,7 +49,7 @@ class StatTab:
             1: self.special_tab
         }
         
-        self.sub_tab_thread_handler = ThreadHandler(sub_tab_map, self.current_sub_tab_index)
+        self.sub_tab_thread_handler = ThreadHandler(sub_tab_map, self.current_sub_tab_index, start_current=False)
         
 
     
@@ -78,7 +95,7 @@ class StatTab:
 
 
     def handle_threads(self, tab_selected: bool):
-        self.sub_tab_thread_handler.update_tab_index(self.current_sub_tab_index)
+        self.sub_tab_thread_handler.set_active(tab_selected)
     
 
         
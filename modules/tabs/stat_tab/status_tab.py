@@ -1,10 +1,15 @@
 import os
 import pygame
 import settings
-from threading import Thread
 from data_models import IconConfig  # Changed import
 from typing import Dict, List
 from util_functs import Utils
+from text_cache import TextCache
+from palette import Palette
+from memory_accounting import SurfaceMemory
+from dirty_rects import DirtyRects
+from scheduler import Scheduler
+from preloader import Preloader
 
 
 class StatusTab:    
@@ -13,13 +18,12 @@ class StatusTab:
         self.screen = screen
         self.tab_instance = tab_instance
         self.draw_space = draw_space
-        self.conditionboy_thread = None
-        self.conditionboy_thread_running = False
-        self.small_font = pygame.font.Font(settings.ROBOTO_CONDENSED_BOLD_PATH, 12)
+        self.conditionboy_task = None
+        self.small_font = TextCache().font(settings.ROBOTO_CONDENSED_BOLD_PATH, 12)
         
         # Initialize components
         self._init_conditionboy()
-        self.player_surface = self.small_font.render(settings.PLAYER_NAME, True, settings.PIP_BOY_LIGHT)
+        self.player_surface = Palette().indexed(self.small_font.render(settings.PLAYER_NAME, True, settings.PIP_BOY_LIGHT))
         
         self.setup_limb_damage(settings.DEFAULT_LIMB_DAMAGE)
 
@@ -27,29 +31,34 @@ class StatusTab:
 
 
 
+    @staticmethod
+    def load_conditionboy(draw_height: int):
+        """Load the conditionboy legs, their transforms and the head, safe to run on a preload worker."""
+        conditionboy_scale = draw_height / settings.CONDITIONBOY_SCALE
+        legs_index = StatusTab._get_legs_index()
+        legs, transforms = Utils.load_svgs(os.path.join(settings.STAT_TAB_BODY_SVG_BASE_FOLDER, f"legs{legs_index}"), conditionboy_scale, load_transforms=True)
+        head = Palette().indexed(Utils.load_svg(conditionboy_scale / 2, StatusTab._get_head_path()))
+        return legs, transforms, head
+
     def _init_conditionboy(self):
         """Initialize vault boy animation components"""
         
-        conditionboy_scale = self.draw_space.height / settings.CONDITIONBOY_SCALE
-        
-        self.extra_head_x = 0
+        # Crippled legs shift the body, the head follows
+        self.extra_head_x = 3 if min(settings.DEFAULT_LIMB_DAMAGE[4:6]) <= settings.CRIPPLED_THRESHOLD else 0
         legs_index = self._get_legs_index()
         
         
         # Load conditionboy legs svgs
-        self.conditionboy_legs, self.conditionboy_transforms = Utils.load_svgs(os.path.join(settings.STAT_TAB_BODY_SVG_BASE_FOLDER, f"legs{legs_index}"), conditionboy_scale, load_transforms=True)
-        head_scale = conditionboy_scale / 2
-        self.conditionboy_head = Utils.load_svg(head_scale, self._get_head_path())
+        self.conditionboy_legs, self.conditionboy_transforms, self.conditionboy_head = SurfaceMemory().track(
+            Preloader().take("conditionboy", lambda: self.load_conditionboy(self.draw_space.height))
+        )
     
         self.conditionboy_legs_centerx = self.conditionboy_legs[0].get_width() // 2 
         self.conditionboy_legs_centery = self.conditionboy_legs[0].get_height() // 2
         
         self.conditionboy_head_offsets = self._load_conditionboy_offsets(legs_index)
         
-        self.conditionboy_surface = pygame.Surface(
-            (self.draw_space.width, self.draw_space.height),
-            pygame.SRCALPHA
-        )
+        self.conditionboy_surface = SurfaceMemory().track(Palette().surface((self.draw_space.width, self.draw_space.height)), "conditionboy")
         
         self.conditionboy_screen_position = self.conditionboy_surface.get_rect(
             center=(self.draw_space.x + self.draw_space.width // 2,
@@ -60,7 +69,8 @@ class StatusTab:
         self.conditionboy_heads_index = 0
 
 
-    def _get_legs_index(self) -> str:
+    @staticmethod
+    def _get_legs_index() -> int:
         """Get the path of the legs image to use based on current limb damage."""
         # Assume that limb HP is stored in self.stats.limb_hp and that
         # settings.DEFAULT_LIMB_DAMAGE follows the order:
@@ -81,10 +91,8 @@ class StatusTab:
         if right_arm_damaged:
             state += 2       # weight 2
         if left_leg_damaged:
-            self.extra_head_x = 3
             state += 4       # weight 4
         if right_leg_damaged:
-            self.extra_head_x = 3
             state += 8       # weight 8
 
         # Optionally, if head damage is also considered (index 0)
@@ -97,7 +105,8 @@ class StatusTab:
         return state
 
  
-    def _get_head_path(self) -> str:
+    @staticmethod
+    def _get_head_path() -> str:
         """Get the path of the head image to use"""
         head_hp = settings.DEFAULT_LIMB_DAMAGE[0]
         
@@ -173,12 +182,7 @@ class StatusTab:
             nonlocal margin
             
             # Render big icon
-            big_icon = Utils.scale_image(
-                pygame.image.load(icons[icon_type]['big']).convert_alpha(),
-                settings.DAMAGE_ARMOUR_ICON_BIG_SIZE
-            )
-            
-            big_icon = Utils.tint_image(big_icon)
+            big_icon = Utils.load_tinted(icons[icon_type]['big'], scale=settings.DAMAGE_ARMOUR_ICON_BIG_SIZE)
             
             # Draw background rectangle
             pygame.draw.rect(
@@ -200,12 +204,7 @@ class StatusTab:
                 margin += settings.DAMAGE_ARMOUR_MARGIN_SMALL
                 
                 # Scale and load small icon
-                small_icon = Utils.scale_image(
-                    pygame.image.load(small_icon_path).convert_alpha(),
-                    settings.DAMAGE_ARMOUR_ICON_SMALL_SIZE
-                )
-                
-                small_icon = Utils.tint_image(small_icon)
+                small_icon = Utils.load_tinted(small_icon_path, scale=settings.DAMAGE_ARMOUR_ICON_SMALL_SIZE)
                 
                 # Draw background rectangle
                 pygame.draw.rect(
@@ -270,6 +269,7 @@ class StatusTab:
             
             # Draw outline
             pygame.draw.rect(self.limb_damage_surface, settings.PIP_BOY_LIGHT, rect, 1)
+        self.limb_damage_surface = Palette().indexed(self.limb_damage_surface)
 
     def setup_stats_display(self, damage_icons: List[IconConfig], armor_icons: List[IconConfig]):
         """Setup damage and armor statistics display"""
@@ -302,43 +302,42 @@ class StatusTab:
         
         self.stats_surface = pygame.Surface((total_width, big_rect_size), pygame.SRCALPHA).convert_alpha()
         self._render_stats_icons(icons, big_rect_size, small_rect_size)
+        self.stats_surface = Palette().indexed(self.stats_surface)
 
 
 
 
     def update_conditionboy(self):
         """Update vault boy animation frame"""
-        while self.conditionboy_thread_running:
-            self.conditionboy_surface.fill((0, 0, 0, 0))
-            x_offset_body = self.draw_space.centerx - (self.conditionboy_transforms[self.conditionboy_index][0]) - self.conditionboy_legs_centerx
-            y_offset_body = self.draw_space.centery / 2 - (self.conditionboy_transforms[self.conditionboy_index][1]) - self.conditionboy_legs_centery / 2 + 10
-            
-                        
-            self.conditionboy_surface.blit(
-                self.conditionboy_legs[self.conditionboy_index],
-                (x_offset_body, y_offset_body))
-            
-            x_offset_head = self.conditionboy_head_offsets[self.conditionboy_index][0] + self.draw_space.centerx - self.conditionboy_head.get_width() / 2 - self.extra_head_x
-            y_offset_head = self.conditionboy_head_offsets[self.conditionboy_index][1] + self.conditionboy_head.get_height()
-                        
-            self.conditionboy_surface.blit(
-                self.conditionboy_head,
-                (x_offset_head, y_offset_head)
-            )
-            
-            self.conditionboy_index = (self.conditionboy_index + 1) % len(self.conditionboy_legs)
-            
-            pygame.time.wait(settings.SPEED * 150)
+        self.conditionboy_surface.fill((0, 0, 0, 0))
+        x_offset_body = self.draw_space.centerx - (self.conditionboy_transforms[self.conditionboy_index][0]) - self.conditionboy_legs_centerx
+        y_offset_body = self.draw_space.centery / 2 - (self.conditionboy_transforms[self.conditionboy_index][1]) - self.conditionboy_legs_centery / 2 + 10
+        
+                    
+        self.conditionboy_surface.blit(
+            self.conditionboy_legs[self.conditionboy_index],
+            (x_offset_body, y_offset_body))
+        
+        x_offset_head = self.conditionboy_head_offsets[self.conditionboy_index][0] + self.draw_space.centerx - self.conditionboy_head.get_width() / 2 - self.extra_head_x
+        y_offset_head = self.conditionboy_head_offsets[self.conditionboy_index][1] + self.conditionboy_head.get_height()
+                    
+        self.conditionboy_surface.blit(
+            self.conditionboy_head,
+            (x_offset_head, y_offset_head)
+        )
+        
+        self.conditionboy_index = (self.conditionboy_index + 1) % len(self.conditionboy_legs)
+        DirtyRects().mark(self.conditionboy_screen_position)
+        
     
     def handle_threads(self, tab_selected: bool):
-        """ Handle the threads"""
-        if tab_selected and not self.conditionboy_thread_running:
-            self.conditionboy_thread_running = True
-            self.conditionboy_thread = Thread(target=self.update_conditionboy, daemon=True)
-            self.conditionboy_thread.start()
-        elif not tab_selected and self.conditionboy_thread_running:
-            self.conditionboy_thread_running = False
-            self.conditionboy_thread.join()
+        """ Handle the animation tasks"""
+        if tab_selected and self.conditionboy_task is None:
+            self.update_conditionboy()
+            self.conditionboy_task = Scheduler().every(settings.SPEED * 150, self.update_conditionboy)
+        elif not tab_selected and self.conditionboy_task is not None:
+            Scheduler().cancel(self.conditionboy_task)
+            self.conditionboy_task = None
             
 
     def render(self):
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from threading import Lock
+import pygame
+import settings
+from palette import Palette
+from memory_accounting import SurfaceMemory
+
+
+class TextCache:
+    """
+    Font registry and shared cache of rendered text.
+
+    font() hands out one Font per path and size, so every tab using the same
+    typeface shares it. render() keeps rendered text surfaces keyed by font,
+    text, colour, antialias and wrap length, dropping the least recently used
+    once they take more than TEXT_CACHE_BYTES. The returned surfaces are
+    shared, callers must not draw on them. In palette mode they are indexed.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures every tab shares the same fonts and rendered text."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.fonts = {}
+            cls._instance.surfaces = OrderedDict()
+            cls._instance.used_bytes = 0
+            cls._instance.budget = settings.TEXT_CACHE_BYTES
+            cls._instance.hits = 0
+            cls._instance.misses = 0
+            # The preload workers open fonts while the main thread renders, see Preloader
+            cls._instance.lock = Lock()
+        return cls._instance
+
+    def font(self, path: str, size: int) -> pygame.font.Font:
+        """The shared Font for path at size."""
+        key = (path, size)
+        with self.lock:
+            font = self.fonts.get(key)
+            if font is None:
+                font = self.fonts[key] = pygame.font.Font(path, size)
+            return font
+
+    def render(self, font: pygame.font.Font, text: str, color, antialias: bool = True, wraplength: int = 0) -> pygame.Surface:
+        """font.render(text, antialias, color), from the cache when it was rendered before."""
+        key = (font, text, tuple(color), antialias, wraplength)
+        with self.lock:
+            surface = self.surfaces.get(key)
+            if surface is not None:
+                self.surfaces.move_to_end(key)
+                self.hits += 1
+                return surface
+
+            surface = SurfaceMemory().track(Palette().indexed(font.render(text, antialias, color, wraplength=wraplength)), "text")
+            self.misses += 1
+            self.surfaces[key] = surface
+            self.used_bytes += self._byte_size(surface)
+            # The newest surface always stays, even if it alone is over budget
+            while self.used_bytes > self.budget and len(self.surfaces) > 1:
+                _, evicted = self.surfaces.popitem(last=False)
+                self.used_bytes -= self._byte_size(evicted)
+            return surface
+
+    @staticmethod
+    def _byte_size(surface: pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of renders served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.surfaces),
+            "bytes": self.used_bytes,
+            "fonts": len(self.fonts),
+        }
+
+    def clear(self):
+        """Drop every rendered surface, e.g. after the text colours changed."""
+        with self.lock:
+            self.surfaces.clear()
+            self.used_bytes = 0
@@ -0,0 +1,72 @@
+from typing import Callable
+import settings
+from palette import Palette
+from util_functs import Utils
+
+
+class Theme:
+    """
+    Colour the UI is shown in, changeable at runtime without reloading assets.
+
+    Everything is drawn with the PIP_BOY_* colours from settings, the ink.
+    Assets, cached text and pre-rendered surfaces stay in the ink, and the
+    theme maps its brightness onto the theme colour as the last step of a
+    frame, see Presenter.lookup: in palette mode by swapping the palette
+    the framebuffer is looked up through, otherwise with one palette_images
+    pass over the frame. Post effects draw after that and take their colours
+    from shade(), listeners are told when to re-tint them. The theme starts
+    in THEME_COLOR.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures the presenter and the post effects agree on the colour."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.ink = tuple(settings.PIP_BOY_LIGHT[:3])
+            cls._instance.color = tuple(settings.THEME_COLOR[:3])
+            cls._instance.colors = Palette.ramp(settings.BACKGROUND, cls._instance.color)
+            cls._instance.listeners = []
+        return cls._instance
+
+    @property
+    def identity(self) -> bool:
+        """The theme colour is the ink, frames are shown as drawn."""
+        return self.color == self.ink
+
+    def listen(self, callback: Callable):
+        """Call callback() after every theme change, on the main thread."""
+        self.listeners.append(callback)
+
+    def apply(self, color):
+        """Show the UI in color from the next frame on."""
+        color = tuple(color[:3])
+        if color == self.color:
+            return
+        self.color = color
+        # The palette every indexed frame is looked up through
+        self.colors = Palette.ramp(settings.BACKGROUND, color)
+        for callback in self.listeners:
+            callback()
+
+    def cycle(self):
+        """Switch to the next colour in THEME_COLORS."""
+        colors = [tuple(color[:3]) for color in settings.THEME_COLORS]
+        index = colors.index(self.color) + 1 if self.color in colors else 0
+        self.apply(colors[index % len(colors)])
+
+    def shade(self, color) -> tuple:
+        """The theme colour of an ink colour, for drawing after the frame was recoloured."""
+        if self.identity:
+            return color
+        # Ink colours are shades of PIP_BOY_LIGHT, measured on its strongest channel
+        channel = max(range(3), key=lambda i: abs(self.ink[i] - settings.BACKGROUND[i]))
+        span = self.ink[channel] - settings.BACKGROUND[channel]
+        level = min(1.0, max(0.0, (color[channel] - settings.BACKGROUND[channel]) / span)) if span else 1.0
+        return tuple(round(dark + (light - dark) * level) for dark, light in zip(settings.BACKGROUND[:3], self.color))
+
+    def recolor(self, surface):
+        """Map an RGB frame drawn in the ink onto the theme colour, in place."""
+        if not self.identity:
+            Utils.palette_images([surface], [settings.BACKGROUND, self.color], source=self.ink, in_place=True)
@@ -0,0 +1,66 @@
+import pygame
+import settings
+from scheduler import Scheduler
+from dirty_rects import DirtyRects
+from memory_accounting import SurfaceMemory
+
+
+class TabTransition:
+    """
+    Tab switch transition: the outgoing frame is captured once at quarter
+    resolution and pre-blurred into a few levels. While the transition runs,
+    each frame only fades and upscales one of the prepared levels and adds it
+    over the new tab, so no heavy blur ever runs inside a frame.
+    """
+
+    SCALE = 4
+    BLUR_RADII = (1, 2, 3)  # Quarter resolution, roughly 4, 8 and 12 px on screen
+
+    def __init__(self, screen: pygame.Surface, duration: int = None):
+        self.screen = screen
+        self.duration = settings.TAB_TRANSITION_DURATION if duration is None else duration
+        self.scheduler = Scheduler()
+        self.pending = False
+        self.active = False
+        self.start_ms = 0
+
+        width, height = screen.get_size()
+        small_size = (max(1, width // self.SCALE), max(1, height // self.SCALE))
+        self.capture_buffer = pygame.Surface(small_size, 0, screen)
+        self.levels = [pygame.Surface(small_size, 0, screen) for _ in self.BLUR_RADII]
+        self.faded = pygame.Surface(small_size, 0, screen)
+        self.upscaled = pygame.Surface((width, height), 0, screen)
+        SurfaceMemory().track([self.capture_buffer, *self.levels, self.faded, self.upscaled], "effects")
+
+    def start(self):
+        """Request a transition, the outgoing frame is captured before the next frame is drawn."""
+        if self.duration > 0:
+            self.pending = True
+
+    def capture(self):
+        """Grab the outgoing frame and prepare the blur levels."""
+        if not self.pending:
+            return
+        self.pending = False
+        pygame.transform.smoothscale(self.screen, self.capture_buffer.get_size(), self.capture_buffer)
+        for radius, level in zip(self.BLUR_RADII, self.levels):
+            pygame.transform.box_blur(self.capture_buffer, radius, dest_surface=level)
+        self.start_ms = self.scheduler.now_ms
+        self.active = True
+
+    def render(self):
+        if not self.active:
+            return
+        DirtyRects().mark_full()
+        progress = (self.scheduler.now_ms - self.start_ms) / self.duration
+        if progress >= 1:
+            self.active = False
+            return
+
+        # Blur grows while the outgoing frame fades out
+        level = self.levels[min(len(self.levels) - 1, int(progress * len(self.levels)))]
+        fade = int(180 * (1 - progress))
+        self.faded.blit(level, (0, 0))
+        self.faded.fill((fade, fade, fade), special_flags=pygame.BLEND_RGB_MULT)
+        pygame.transform.smoothscale(self.faded, self.upscaled.get_size(), self.upscaled)
+        self.screen.blit(self.upscaled, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
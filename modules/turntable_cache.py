@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from threading import Thread
+from typing import Callable
+import pygame
+import settings
+from util_functs import Utils
+from atlas import Atlas
+from command_queue import CommandQueue
+from memory_accounting import SurfaceMemory
+
+
+class TurntableCache:
+    """
+    Shared cache of scaled and tinted item turntable frames, keyed by the
+    item's icon folder and the target height. Frames are loaded on worker
+    threads and stored on the main thread. The least recently used items
+    are evicted once the cache grows past its memory budget.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """Ensures every inventory sub tab shares the same frames and budget."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.frames = OrderedDict()
+            cls._instance.sizes = {}
+            cls._instance.used_bytes = 0
+            cls._instance.budget = settings.TURNTABLE_CACHE_BYTES
+            # Keys being loaded, mapped to the callbacks waiting for them
+            cls._instance.loading = {}
+        return cls._instance
+
+    def get(self, folder: str, height: int):
+        """Cached frames for the folder, or None. Counts as a use."""
+        key = (folder, height)
+        frames = self.frames.get(key)
+        if frames is not None:
+            self.frames.move_to_end(key)
+        return frames
+
+    def request(self, folder: str, height: int, callback: Callable[[list], None] = None):
+        """
+        Call callback(frames) on the main thread as soon as the frames are available,
+        straight away when they are already cached.
+        """
+        frames = self.get(folder, height)
+        if frames is not None:
+            if callback:
+                callback(frames)
+            return
+
+        key = (folder, height)
+        if key in self.loading:
+            if callback:
+                self.loading[key].append(callback)
+            return
+        self.loading[key] = [callback] if callback else []
+        Thread(target=self._load, args=(key,), daemon=True).start()
+
+    def prefetch(self, folder: str, height: int):
+        """Load the frames in the background without waiting for them."""
+        self.request(folder, height)
+
+    def _load(self, key: tuple):
+        folder, height = key
+        try:
+            frames = Utils.load_images(folder, height=height)
+        except (pygame.error, OSError, ValueError) as e:
+            print(f"Could not load turntable {folder}: {e}")
+            CommandQueue().post(self._failed, key)
+            return
+        CommandQueue().post(self._store, key, frames)
+
+    def _store(self, key: tuple, frames: Atlas):
+        self.frames[key] = SurfaceMemory().track(frames, "turntables")
+        self.sizes[key] = frames.byte_size
+        self.used_bytes += self.sizes[key]
+        self._evict()
+
+        for callback in self.loading.pop(key, []):
+            callback(frames)
+
+    def _failed(self, key: tuple):
+        """Let a later request try again, the waiting callbacks get no frames."""
+        for callback in self.loading.pop(key, []):
+            callback([])
+
+    def _evict(self):
+        # The newest entry always stays, even if it alone is over budget
+        while self.used_bytes > self.budget and len(self.frames) > 1:
+            key, _ = self.frames.popitem(last=False)
+            self.used_bytes -= self.sizes.pop(key)
+
+    def clear(self):
+        """Drop every cached frame, e.g. after the tint changed."""
+        self.frames.clear()
+        self.sizes.clear()
+        self.used_bytes = 0
@@ -1,8 +1,12 @@
 # generic_list.py
-from threading import Thread, Event, Lock
 import pygame
 import settings
 from util_functs import Utils
+from dirty_rects import DirtyRects
+from scheduler import Scheduler
+from text_cache import TextCache
+from palette import Palette
+from memory_accounting import SurfaceMemory
 
 ###############################################
 # Generic UI elements for the Pip-OS project #
@@ -57,7 +61,7 @@ class GenericList:
         self.selected_text = None
         self.selected_stat = None
         
-        self.view_surface = pygame.Surface((self.draw_space.width, self.draw_space.height), pygame.SRCALPHA)
+        self.view_surface = SurfaceMemory().track(Palette().surface((self.draw_space.width, self.draw_space.height)), "lists")
 
         self._init_selection_rect()
            
@@ -76,30 +80,106 @@ class GenericList:
 
     def _prepare_list_surface(self):
         if not self.items:
-            self.list_surface = pygame.Surface((self.draw_space.width, 0), pygame.SRCALPHA)
+            self.list_surface = SurfaceMemory().track(Palette().surface((self.draw_space.width, 0)), "lists")
             return
         height = self.font_height * len(self.items)
-        self.list_surface = pygame.Surface((self.draw_space.width, height), pygame.SRCALPHA)
-        
+        self.list_surface = SurfaceMemory().track(Palette().surface((self.draw_space.width, height)), "lists")
+        for i in range(len(self.items)):
+            self._render_row(i)
+        self.update_list()
+
+    def _render_row(self, i):
+        """Draw the label, and the stat if enabled, of row i onto the cleared list surface."""
+        text_cache = TextCache()
+        text_surface = text_cache.render(self.font, self.items[i], self.text_color)
+        self.list_surface.blit(text_surface, (self.text_margin, i * self.font_height))
         if self.stats is not None:
             stats_column_center_x = self.selection_rect_width - self.max_stat_width
-        for i, item in enumerate(self.items):
-            # Render item label
-            text_surface = self.font.render(item, True, self.text_color)
-            self.list_surface.blit(text_surface, (self.text_margin, i * self.font_height))
-            # Render stat if enabled
-            if self.stats is not None:
-                stat = str(self.stats[i])
-                stat_surface = self.font.render(stat, True, self.stats_color)
-                stat_x = stats_column_center_x - (stat_surface.get_width() // 2)
-                self.list_surface.blit(stat_surface, (stat_x, i * self.font_height))
+            stat_surface = text_cache.render(self.font, str(self.stats[i]), self.stats_color)
+            stat_x = stats_column_center_x - (stat_surface.get_width() // 2)
+            self.list_surface.blit(stat_surface, (stat_x, i * self.font_height))
+
+    def _shift_rows(self, index, shift):
+        """
+        Move the rows from index on one row down (shift 1) or up (shift -1) as pixels,
+        so only an inserted row has to be rendered. A full surface grows by half
+        its rows, the spare rows at the bottom stay transparent.
+        """
+        width = self.draw_space.width
+        height = self.font_height * len(self.items)
+        if height > self.list_surface.get_height():
+            old_surface = self.list_surface
+            self.list_surface = SurfaceMemory().track(Palette().surface((width, height + height // 2)), "lists")
+            self.list_surface.blit(old_surface, (0, 0))
+        top = index * self.font_height
+        rows = height if shift > 0 else height + self.font_height
+        if rows > top:
+            self.list_surface.subsurface((0, top, width, rows - top)).scroll(0, shift * self.font_height)
+        self._clear_row(index if shift > 0 else len(self.items))
+
+    def _clear_row(self, index):
+        row = pygame.Rect(0, index * self.font_height, self.draw_space.width, self.font_height)
+        self.list_surface.fill(Palette.TRANSPARENT if self.list_surface.get_bitsize() == 8 else (0, 0, 0, 0), row)
+
+    def _widen_stats(self, stat):
+        """Widen the stats column to fit stat, True if it moved and every row has to be rendered again."""
+        width = self.font.size(str(stat))[0]
+        if width <= self.max_stat_width:
+            return False
+        self.max_stat_width = width
+        return True
+
+    def _mark_rows(self, index, count=None):
+        """Mark count rows from index, or every row from index on, as dirty."""
+        top = self.draw_space.y + index * self.font_height
+        bottom = self.draw_space.bottom if count is None else top + count * self.font_height
+        DirtyRects().mark(pygame.Rect(self.draw_space.x, top, self.draw_space.width, bottom - top).clip(self.draw_space))
+
+    def set_item(self, index, item, stat=None):
+        """Change the label, and stat, of one row and render only that row."""
+        self.items[index] = item
+        if self.stats is not None:
+            self.stats[index] = stat
+            if self._widen_stats(stat):
+                self.set_items(self.items, self.stats)
+                return
+        self._clear_row(index)
+        self._render_row(index)
+        if index == self.selected_index:
+            self.update_list()
+        self._mark_rows(index, 1)
+
+    def insert_item(self, index, item, stat=None):
+        """Insert a row before index, the selection stays on the item it was on."""
+        self.items.insert(index, item)
+        if index <= self.selected_index and len(self.items) > 1:
+            self.selected_index += 1
+        if self.stats is not None:
+            self.stats.insert(index, stat)
+            if self._widen_stats(stat):
+                self.set_items(self.items, self.stats)
+                return
+        self._shift_rows(index, 1)
+        self._render_row(index)
         self.update_list()
+        self._mark_rows(index)
+
+    def remove_item(self, index):
+        """Remove a row, the selection stays on its item, or on the row taking its place if it was removed."""
+        del self.items[index]
+        if self.stats is not None:
+            del self.stats[index]
+        self._shift_rows(index, -1)
+        if index < self.selected_index or self.selected_index >= len(self.items):
+            self.selected_index = max(0, self.selected_index - 1)
+        self.update_list()
+        self._mark_rows(index)
 
     def _create_dots(self):
         """Initialize dot surfaces only if enabled"""
-        self.dot = pygame.Surface((self.dot_size, self.dot_size), pygame.SRCALPHA)
+        self.dot = SurfaceMemory().track(Palette().surface((self.dot_size, self.dot_size)), "lists")
         self.dot.fill(self.dot_color)
-        self.dot_darker = pygame.Surface((self.dot_size, self.dot_size), pygame.SRCALPHA)
+        self.dot_darker = SurfaceMemory().track(Palette().surface((self.dot_size, self.dot_size)), "lists")
         self.dot_darker.fill(self.dot_darker_color)
 
     def _init_selection_rect(self):
@@ -118,6 +198,7 @@ class GenericList:
         if self.selected_index >= len(self.items):
             self.selected_index = max(0, len(self.items) - 1)
         self._prepare_list_surface()
+        DirtyRects().mark(self.draw_space)
         
 
     def update_list(self):
@@ -126,10 +207,11 @@ class GenericList:
             return
         self.selection_rect.y = self.selected_index * self.font_height
         selected_item = self.items[self.selected_index]
-        self.selected_text = self.font.render(selected_item, True, self.selected_text_color)
+        text_cache = TextCache()
+        self.selected_text = text_cache.render(self.font, selected_item, self.selected_text_color)
         if self.stats is not None:
             stat = str(self.stats[self.selected_index])
-            self.selected_stat = self.font.render(stat, True, self.selected_stats_color)
+            self.selected_stat = text_cache.render(self.font, stat, self.selected_stats_color)
 
 
     def change_selection(self, direction: bool):
@@ -145,7 +227,7 @@ class GenericList:
         if not self.list_surface or not self.selected_text:
             return
 
-        self.view_surface.fill(settings.BACKGROUND)
+        Palette().fill(self.view_surface, settings.BACKGROUND)
         self.view_surface.blit(self.list_surface, (0, 0))
 
         # Draw selection rectangle
@@ -187,15 +269,11 @@ class ItemGrid:
         self.precomputed_divider = None  # Only one divider per grid
         self.top_margin = text_margin
         self.bottom_margin = text_margin * 2
-        self.text_cache = {}  # New surface cache
         
 
 
     def _get_rendered_text(self, text, color):
-        key = (text, color)
-        if key not in self.text_cache:
-            self.text_cache[key] = self.font.render(text, True, color)
-        return self.text_cache[key]
+        return TextCache().render(self.font, text, color)
 
 
     def update(self, entries):
@@ -232,7 +310,7 @@ class ItemGrid:
             value_x = self.draw_space.right - self.padding
             
             if entry.get("icon_front") and "icon" in entry:
-                icon_surface = entry["icon"]
+                icon_surface = Palette().indexed(entry["icon"])
                 entry_lines.append(("icon", icon_surface, (icon_x, label_y + 1)))
                 # Move label to the right of the icon
                 icon_front_x += icon_surface.get_width() + self.padding
@@ -251,19 +329,20 @@ class ItemGrid:
                     components = []
                     line_width = 0
 
-                    if "icon" in line:
-                        icon_x = value_x - (line["icon"].get_width() // 2)
-                        components.append(line["icon"])
-                        line_width += line["icon"].get_width() + self.padding
+                    line_icon = Palette().indexed(line.get("icon"))
+                    if line_icon is not None:
+                        icon_x = value_x - (line_icon.get_width() // 2)
+                        components.append(line_icon)
+                        line_width += line_icon.get_width() + self.padding
 
-                    text_surface = self.font.render(str(line["value"]), True, settings.PIP_BOY_LIGHT)
+                    text_surface = self._get_rendered_text(str(line["value"]), settings.PIP_BOY_LIGHT)
                     components.append(text_surface)
                     line_width += text_surface.get_width()
 
                     # Right-align components
                     current_x = value_x - line_width
                     for component in components:
-                        y_pos = value_y + (1 if component == line.get("icon") else 0)
+                        y_pos = value_y + (1 if component is line_icon else 0)
                         entry_lines.append(("component", component, (current_x, y_pos)))
                         icon_x -= component.get_width()
                         current_x += component.get_width() + self.padding
@@ -276,7 +355,7 @@ class ItemGrid:
                 entry_lines.append(("value", text_surface, (value_x - text_width, value_y)))
                 
             if not entry.get("icon_front") and "icon" in entry:
-                icon_surface = entry["icon"]
+                icon_surface = Palette().indexed(entry["icon"])
                 icon_x = value_x - icon_surface.get_width() - text_width - (self.padding * 2)
                 entry_lines.append(("icon", icon_surface, (icon_x, value_y + 1)))
 
@@ -338,65 +417,69 @@ class ItemGrid:
 
         
 class AnimatedImage:
+    """Plays a sequence of frames, a list of surfaces or an Atlas, on the frame clock."""
+
     def __init__(self, screen, images, position: tuple, frame_duration: int, frame_order: list=None, loop: bool = True, sound_path: str = None):
         self.screen = screen
         self.images = images
         self.position = position
-        self.frame_duration = frame_duration / 1000  # Convert to seconds
+        self.frame_duration = frame_duration  # In ms
         self.frame_order = frame_order or list(range(len(images)))
         self.loop = loop
         self.sound_path = sound_path
 
         self.current_frame_index = 0
         self.done = False
-        self.running = False  # Flag for controlling the thread
-        self.stop_event = Event()  # Event to stop the thread
-        self.lock = Lock()  # Lock to prevent race conditions in render()
-        self.thread = None  # The update thread
-
-    def _update_loop(self):
-        """Thread function for updating frames."""
-        while not self.stop_event.is_set() and not self.done:
-            with self.lock:  # Ensure thread safety for frame updates
-                if self.done:
-                    break
-
-                self.current_frame_index += 1
-                if self.current_frame_index >= len(self.frame_order):
-                    if self.loop:
-                        self.current_frame_index = 0
-                        self.play_sound()
-                    else:
-                        self.done = True
-                        break
-
-            # Instead of sleep, wait with the option to interrupt instantly
-            self.stop_event.wait(timeout=self.frame_duration)
+        self.dirty_rects = DirtyRects()
+        self.scheduler = Scheduler()
+        self.task = None  # The scheduled frame update
+
+    def _update_frame(self):
+        """Scheduler task for advancing to the next frame."""
+        if self.done:
+            return
 
+        self.mark_dirty()  # Frames may differ in size, clear the outgoing one too
+        self.current_frame_index += 1
+        if self.current_frame_index >= len(self.frame_order):
+            if self.loop:
+                self.current_frame_index = 0
+                self.play_sound()
+            else:
+                # Hold the last frame
+                self.current_frame_index = len(self.frame_order) - 1
+                self.done = True
+                self.scheduler.cancel(self.task)
+                return
+        self.mark_dirty()
+
+
+    def mark_dirty(self):
+        """Report the area of the current frame as changed."""
+        self.dirty_rects.mark_surface(self.images[self.frame_order[self.current_frame_index]], self.position)
 
     def play_sound(self):
         """Play the sound effect if provided."""
         if self.sound_path:
-            Utils.play_sfx(self.sound_path, settings.VOLUME / 8, channel=5)
+            Utils.play_sfx(self.sound_path, settings.VOLUME / 8, voice="animation")
 
     def start(self):
-        """Start the animation thread."""
-        if self.thread is None or not self.thread.is_alive():
+        """Start the animation."""
+        if self.task is None or not self.task.active:
             self.done = False
-            self.stop_event.clear()
-            self.thread = Thread(target=self._update_loop, daemon=True)
             self.play_sound()
-            self.thread.start()
+            self.mark_dirty()
+            self.task = self.scheduler.every(self.frame_duration, self._update_frame)
 
     def stop(self):
         """Stop the animation instantly."""
-        self.stop_event.set()  # Signal thread to exit
-        self.thread = None  # Allow restarting without blocking
+        self.scheduler.cancel(self.task)
+        self.task = None  # Allow restarting
+        self.mark_dirty()
 
     def render(self):
-        """Render the current frame (thread-safe)."""
-        with self.lock:
-            self.screen.blit(self.images[self.frame_order[self.current_frame_index]], self.position)
+        """Render the current frame."""
+        self.screen.blit(self.images[self.frame_order[self.current_frame_index]], self.position)
 
     def reset(self):
         """Reset the animation and restart it."""
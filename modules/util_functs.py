@@ -1,9 +1,15 @@
 import datetime
+import numpy as np
 import pygame
 import settings
 import os
-import xml.etree.ElementTree as ET
-import re
+from asset_cache import RasterCache
+from atlas import Atlas
+from palette import Palette
+from sound_bank import SoundBank
+from svg_manifest import SvgManifest
+from startup_trace import traced, count_assets
+from memory_accounting import accounted
 
 class Utils:
          
@@ -14,6 +20,65 @@ class Utils:
         # Multiply RGB channels with color, preserve original alpha
         tinted.fill(color[:3] + (0,), special_flags=pygame.BLEND_RGB_MULT)
         return tinted       
+
+    @staticmethod
+    def tint_images(images, color=settings.PIP_BOY_LIGHT, in_place: bool = False):
+        """
+        Tint a list of surfaces or an Atlas like tint_image, an Atlas with a single fill over its sheet.
+        in_place tints the given surfaces instead of copies. No color leaves them untinted.
+        """
+        if not color:
+            return images
+        # SDL's blend fill is SIMD, far faster than the same multiply in NumPy
+        fill = color[:3] + (0,)
+        if isinstance(images, Atlas):
+            sheet = images.surface if in_place else images.surface.copy()
+            sheet.fill(fill, special_flags=pygame.BLEND_RGB_MULT)
+            return images if in_place else Atlas(sheet, images.rects)
+        tinted = images if in_place else [image.copy() for image in images]
+        for image in tinted:
+            image.fill(fill, special_flags=pygame.BLEND_RGB_MULT)
+        return tinted
+
+    @staticmethod
+    def palette_lut(palette: list) -> np.ndarray:
+        """256 colours blended evenly through the palette, from its first (dark) to its last (light) colour."""
+        stops = np.linspace(0, 255, len(palette))
+        colors = np.array([color[:3] for color in palette], dtype=np.float32)
+        levels = np.arange(256)
+        return np.stack([np.interp(levels, stops, colors[:, i]) for i in range(3)], axis=1).round().astype(np.uint8)
+
+    @staticmethod
+    def palette_images(images, palette: list, source=(255, 255, 255), in_place: bool = False):
+        """
+        Recolour a list of surfaces or an Atlas by luminance: the brightness of every pixel picks its colour
+        from palette, see palette_lut. source is the colour the images are tinted with now, so a theme change
+        can be applied to already tinted surfaces by passing the old colour. Alpha is kept.
+        """
+        lut = Utils.palette_lut(palette)
+        # Luminance weights in 16.16 fixed point, scaled so that source at full brightness maps to 255
+        source_luminance = max(1.0, 0.299 * source[0] + 0.587 * source[1] + 0.114 * source[2])
+        weights = (np.array([0.299, 0.587, 0.114]) * 255 / source_luminance * 65536).astype(np.uint32)
+
+        def recolour(surface):
+            if surface.get_bitsize() != 32:
+                converted = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+                converted.blit(surface, (0, 0))
+                surface = converted
+            shifts = surface.get_shifts()
+            alpha_mask = np.uint32(surface.get_masks()[3])
+            packed_lut = sum(lut[:, i].astype(np.uint32) << shifts[i] for i in range(3))
+            # One pass over the packed pixels, far faster than the strided pixels3d view
+            pixels = pygame.surfarray.pixels2d(surface)
+            luminance = sum(((pixels >> shifts[i]) & 255) * weights[i] for i in range(3)) >> 16
+            pixels[...] = (pixels & alpha_mask) | packed_lut[np.minimum(luminance, 255)]
+            del pixels
+            return surface
+
+        if isinstance(images, Atlas):
+            sheet = recolour(images.surface if in_place else images.surface.copy())
+            return images if in_place and sheet is images.surface else Atlas(sheet, images.rects)
+        return [recolour(image if in_place else image.copy()) for image in images]
     
     @staticmethod
     def scale_image(image, scale: float):
@@ -37,34 +102,68 @@ class Utils:
             image, 
             (int(width), int(height))
         )
+
+    @staticmethod
+    def render_image(path: str, size: tuple = None, tint=settings.PIP_BOY_LIGHT, scale: float = None, height: int = None):
+        """
+        Load an image, rasterising SVGs at the given size, tint it and optionally scale it
+        by a factor or to a height. Bypasses the raster cache, see load_tinted.
+        """
+        if size is None:
+            image = RasterCache().convert(pygame.image.load(path))
+        else:
+            image = RasterCache().convert(pygame.image.load_sized_svg(path, size))
+        if tint:
+            image = Utils.tint_image(image, tint)
+        if scale is not None:
+            image = Utils.scale_image(image, scale)
+        if height is not None:
+            image = Utils.scale_image_abs(image, height=height)
+        return image
+
+    @staticmethod
+    @accounted
+    @traced("Utils.load_tinted", count=count_assets)
+    def load_tinted(path: str, size: tuple = None, tint=settings.PIP_BOY_LIGHT, scale: float = None):
+        """
+        Load an image through render_image, served from the raster cache when possible.
+        """
+        return RasterCache().load(
+            path,
+            lambda: Utils.render_image(path, size, tint, scale),
+            size and tuple(size), tint and tuple(tint), scale
+        )
     
     @staticmethod
-    def load_images(folder: str, tint=settings.PIP_BOY_LIGHT):
+    @accounted
+    @traced("Utils.load_images", count=count_assets)
+    def load_images(folder: str, tint=settings.PIP_BOY_LIGHT, scale: float = None, height: int = None):
         """
-        Load and tint all PNG images in the specified folder.
+        Load, tint and optionally scale all PNG images in the specified folder.
+        Returns an Atlas of the frames in name order, empty if the folder is missing.
+        Tinted frames are indexed in palette mode, untinted ones are effect layers and stay RGB.
         """
-        try:
-            images = [
-                Utils.tint_image(
-                    pygame.image.load(os.path.join(folder, f)).convert_alpha(),
-                    tint
-                ) for f in sorted(os.listdir(folder)) if f.endswith(".png")
-            ]
-            return images
-        except FileNotFoundError:
-            return []
+        images = Atlas.load_folder(
+            folder, ".png",
+            # Tinted after scaling, in one pass over the packed sheet
+            lambda paths: Utils.tint_images(
+                Atlas.pack([Utils.render_image(path, tint=None, scale=scale, height=height) for path in paths]),
+                tint, in_place=True
+            ),
+            tint and tuple(tint), scale, height
+        )
+        return Palette().indexed(images) if tint else images
 
-    @staticmethod        
+    @staticmethod
+    @traced("Utils.load_svgs_dict", count=count_assets)
     def load_svgs_dict(folder: str, scale: int, tint=settings.PIP_BOY_LIGHT):
         """
         Load and tint all SVG images in the specified folder.
         """
         try:
             images = {
-                f: Utils.tint_image(
-                    pygame.image.load_sized_svg(os.path.join(folder, f), (scale, scale)).convert_alpha(),
-                    tint
-                ) for f in sorted(os.listdir(folder)) if f.endswith(".svg")
+                f: Utils.load_tinted(os.path.join(folder, f), (scale, scale), tint)
+                for f in sorted(os.listdir(folder)) if f.endswith(".svg")
             }
             images= {k.replace(".svg", ""): v for k, v in images.items()}
             return images
@@ -74,9 +173,11 @@ class Utils:
         
         
     @staticmethod
+    @accounted
+    @traced("Utils.load_svgs", count=count_assets)
     def load_svgs(folder: str, scale: float, tint=settings.PIP_BOY_LIGHT, load_transforms=False):
         """
-        Load, scale, and tint all SVG images in the specified folder.
+        Load, scale, and tint all SVG images in the specified folder into an Atlas.
         - Maintains aspect ratio using the first SVG's width as the reference.
         - Normalizes transforms (tx, ty) to be relative to the first SVG's position.
         - Scales transforms uniformly to match the target size.
@@ -86,11 +187,10 @@ class Utils:
             if not svg_files:
                 return []
             
-            # Parse first SVG to get reference dimensions
+            # Reference dimensions and transform from the first SVG
             first_svg_path = os.path.join(folder, svg_files[0])
-            first_width, first_height = Utils._get_svg_dimensions(first_svg_path)
-            if load_transforms:
-                first_tx, first_ty = Utils._get_svg_transform(first_svg_path)
+            manifest = SvgManifest()
+            first_width, first_height, first_tx, first_ty = manifest.get(first_svg_path)
             
             if first_width <= 0 or first_height <= 0:
                 # Fallback to avoid division by zero
@@ -99,19 +199,18 @@ class Utils:
                 # Uniform scaling based on first SVG's width to preserve aspect ratio
                 scale_factor = scale / first_width
             
-            images = []
+            target_sizes = []
             transforms = []
             for f in svg_files:
                 svg_path = os.path.join(folder, f)
-                width, height = Utils._get_svg_dimensions(svg_path)
+                width, height, tx, ty = manifest.get(svg_path)
                 
                 # Calculate target size while preserving aspect ratio
                 target_width = int(width * scale_factor)
                 target_height = int(height * scale_factor)
-                target_size = (target_width, target_height)
+                target_sizes.append((target_width, target_height))
                 
                 if load_transforms:
-                    tx, ty = Utils._get_svg_transform(svg_path)
                     # Calculate deltas relative to first SVG's transform
                     delta_tx = tx - first_tx
                     delta_ty = ty - first_ty
@@ -119,11 +218,18 @@ class Utils:
                     scaled_tx = delta_tx * scale_factor
                     scaled_ty = delta_ty * scale_factor
                     transforms.append((scaled_tx, scaled_ty))
-                
-                # Load and scale the SVG
-                img = pygame.image.load_sized_svg(svg_path, target_size).convert_alpha()
-                tinted_img = Utils.tint_image(img, tint)
-                images.append(tinted_img)
+            
+            # Rasterise all frames into one atlas
+            images = Atlas.load_folder(
+                folder, ".svg",
+                lambda paths: Utils.tint_images(
+                    Atlas.pack([Utils.render_image(path, size, None) for path, size in zip(paths, target_sizes)]),
+                    tint, in_place=True
+                ),
+                scale, tint and tuple(tint)
+            )
+            if tint:
+                images = Palette().indexed(images)
             
             return (images, transforms) if load_transforms else images
         except FileNotFoundError:
@@ -131,113 +237,32 @@ class Utils:
     
     
     @staticmethod
-    def _get_svg_dimensions(svg_path):
-        """Parse width/height from viewBox (preferred) or width/height attributes."""
-        try:
-            tree = ET.parse(svg_path)
-            root = tree.getroot()
-            viewbox = root.get('viewBox')
-            if viewbox:
-                parts = viewbox.strip().split()
-                if len(parts) >= 4:
-                    vb_width = parts[2]
-                    vb_height = parts[3]
-                    # Clean non-numeric characters
-                    vb_width = re.sub(r'[^\d.]', '', vb_width) if vb_width else '0'
-                    vb_height = re.sub(r'[^\d.]', '', vb_height) if vb_height else '0'
-                    return float(vb_width), float(vb_height)
-            # Fallback to width/height attributes
-            width = root.get('width', '0')
-            height = root.get('height', '0')
-            width = re.sub(r'[^\d.]', '', width)
-            height = re.sub(r'[^\d.]', '', height)
-            return float(width or 0), float(height or 0)
-        except:
-            return 0.0, 0.0
-    
-    @staticmethod
-    def _get_svg_transform(svg_path):
-        """Parse the transform tx and ty from an SVG file."""
-        try:
-            tree = ET.parse(svg_path)
-            root = tree.getroot()
-            tx, ty = 0.0, 0.0
-            # Check root element's transform first
-            transform_str = root.get('transform', '')
-            if transform_str:
-                tx, ty = Utils._parse_transform(transform_str)
-            # Search children if root has no transform
-            if tx == 0 and ty == 0:
-                for elem in root.iter():
-                    if elem == root:
-                        continue  # Skip root
-                    transform_str = elem.get('transform', '')
-                    if transform_str:
-                        elem_tx, elem_ty = Utils._parse_transform(transform_str)
-                        if elem_tx != 0 or elem_ty != 0:
-                            tx, ty = elem_tx, elem_ty
-                            break
-            return tx, ty
-        except:
-            return 0.0, 0.0
-    
-    @staticmethod
-    def _parse_transform(transform_str):
-        """Extract tx and ty from a transform string."""
-        if not transform_str:
-            return (0.0, 0.0)
-        # Check for translate
-        translate_match = re.match(r'translate\(\s*([-\d.]+)(?:\s*,\s*|\s+)([-\d.]+)\s*\)', transform_str)
-        if translate_match:
-            tx = float(translate_match.group(1))
-            ty = float(translate_match.group(2))
-            return (tx, ty)
-        # Check for matrix
-        matrix_match = re.match(r'matrix\(\s*([-\d.]+)[,\s]+([-\d.]+)[,\s]+([-\d.]+)[,\s]+([-\d.]+)[,\s]+([-\d.]+)[,\s]+([-\d.]+)\s*\)', transform_str)
-        if matrix_match:
-            tx = float(matrix_match.group(5))
-            ty = float(matrix_match.group(6))
-            return (tx, ty)
-        return (0.0, 0.0)
-        
-    
-    @staticmethod
+    @traced("Utils.load_svg", count=count_assets)
     def load_svg(scale: int, path: str, tint=settings.PIP_BOY_LIGHT):
         """
         Load an SVG file, scale it, and apply a tint.
         """
         if path.endswith(".svg"):
-            width, height = Utils._get_svg_dimensions(path)
+            width, height = SvgManifest().dimensions(path)
             scale_factor = scale / width
 
             # Calculate target size while preserving aspect ratio
             target_width = int(width * scale_factor)
             target_height = int(height * scale_factor)
             target_size = (target_width, target_height)
-            # Assuming pygame.image.load_sized_svg exists
-            return Utils.tint_image(
-                pygame.image.load_sized_svg(path, target_size).convert_alpha(),
-                tint
-            )
+            return Utils.load_tinted(path, target_size, tint)
 
 
 
     
     @staticmethod
-    def play_sfx(sound_file, volume=settings.VOLUME, start=0, channel=None):
+    def play_sfx(sound_file, volume=settings.VOLUME, priority=SoundBank.NORMAL, voice=None):
         """
-        Play a sound file.
+        Play a sound file from the sound bank.
+        A voice name stops the previous sound played under the same name.
         """
         if settings.SOUND_ON:
-            sound = pygame.mixer.Sound(sound_file)
-            sound.set_volume(volume)
-            if channel is None:
-                sound.play(start)
-            else:
-                # Get the channel object once and reuse it
-                ch = pygame.mixer.Channel(channel)
-                ch.stop()  # Stops any sound currently on this channel
-                ch.play(sound)
+            SoundBank().play(sound_file, volume, priority, voice=voice)
                 
     @staticmethod
     def lerp(start, end, start_range, end_range, value):